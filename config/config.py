@@ -1,6 +1,7 @@
 import os
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 class Browser(Enum):
     CHROME = "chrome"
@@ -9,17 +10,31 @@ class Browser(Enum):
 class Config:
     """Central configuration for the test framework"""
     
-    # URLs - only what we need
-    BASE_URL = "https://useinsider.com"
+    # URLs - only what we need (BASE_URL can point at a local stand-in of the site)
+    BASE_URL = os.getenv("BASE_URL", "https://useinsider.com").rstrip("/")
     CAREERS_QA_URL = f"{BASE_URL}/careers/quality-assurance/"
+    CAREERS_OPEN_POSITIONS_URL = f"{BASE_URL}/careers/open-positions/"  # All jobs, no filter preselected
     
-    # Browser settings
+    # Default browser settings; each driver carries its own BrowserConfig (see below)
     BROWSER = Browser[os.getenv("BROWSER", "CHROME").upper()]
     HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
     
+    # Remote WebDriver endpoint (Selenium server/grid, or a chromedriver started with --port)
+    REMOTE_URL = os.getenv("SELENIUM_REMOTE_URL")  # Unset: start local drivers via webdriver-manager
+    
+    # HTTP connection pool to the driver endpoint
+    HTTP_KEEP_ALIVE = os.getenv("HTTP_KEEP_ALIVE", "true").lower() == "true"
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "4"))  # Connections kept per driver host
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "120"))  # Seconds per driver command
+    
     # Timeouts
     DEFAULT_TIMEOUT = 30
     PAGE_LOAD_TIMEOUT = 60
+    FALLBACK_TIMEOUT = 5  # Per-alternative wait when a locator has fallback strategies
+    
+    # Locator fallback cache (winning strategy per element, persisted between runs)
+    LOCATOR_CACHE_FILE = os.getenv("LOCATOR_CACHE_FILE", ".locator_cache.json")
+    LOCATOR_CACHE_TTL = int(os.getenv("LOCATOR_CACHE_TTL", str(24 * 3600)))  # Then the primary is tried first again
     
     # Screenshot settings
     SCREENSHOT_ON_FAILURE = True
@@ -28,28 +43,145 @@ class Config:
     # Reporting
     ALLURE_RESULTS_DIR = "reports/allure-results"
     
+    # Step-level retry: a failing allure_step is retried from the last good checkpoint
+    STEP_RETRY_ATTEMPTS = int(os.getenv("STEP_RETRY_ATTEMPTS", "0"))  # 0 disables step retry
+    STEP_RETRY_DELAY = 2  # Base backoff in seconds, doubled per attempt with jitter
+    STEP_RETRY_BUDGET = int(os.getenv("STEP_RETRY_BUDGET", "10"))  # Retries allowed per session
+    
+    # Flight recorder (recent driver commands, written as a trace only when a test fails)
+    FLIGHT_RECORDER = os.getenv("FLIGHT_RECORDER", "true").lower() == "true"
+    FLIGHT_RECORDER_SIZE = int(os.getenv("FLIGHT_RECORDER_SIZE", "500"))
+    TRACE_DIR = "reports/traces"
+    
+    # Pre-warmed browser profile template (cache, consent cookies), copied per driver
+    PROFILE_TEMPLATE = os.getenv("PROFILE_TEMPLATE", "false").lower() == "true"
+    PROFILE_TEMPLATE_DIR = os.getenv("PROFILE_TEMPLATE_DIR", ".profiles")
+    PROFILE_TEMPLATE_MAX_AGE = 7 * 24 * 3600  # Rebuild after a week so consent cookies stay valid
+    PROFILE_TEMPLATE_GRACE = 300  # Seconds a superseded template is kept for copies that may have just started
+    
+    # Launch the next test's browser in the background while the current test runs
+    PREFETCH_DRIVER = os.getenv("PREFETCH_DRIVER", "false").lower() == "true"
+    
+    # Job listings are read from the page in chunks of this many cards; attachments list at most the limit
+    JOB_LISTING_CHUNK_SIZE = int(os.getenv("JOB_LISTING_CHUNK_SIZE", "25"))
+    JOB_LISTING_ATTACHMENT_LIMIT = 50
+    
+    # Filter combinations checked against the job catalog by the data-driven filter test
+    CATALOG_SAMPLE_SIZE = int(os.getenv("CATALOG_SAMPLE_SIZE", "3"))
+    
+    # Visual regression of load-state screenshots (baselines are created on first capture)
+    VISUAL_REGRESSION = os.getenv("VISUAL_REGRESSION", "false").lower() == "true"
+    VISUAL_UPDATE_BASELINES = os.getenv("VISUAL_UPDATE_BASELINES", "false").lower() == "true"
+    VISUAL_BASELINE_DIR = "visual/baselines"
+    VISUAL_DIFF_DIR = "reports/visual-diffs"
+    VISUAL_HASH_DISTANCE = 10  # Max differing perceptual hash bits (of 63)
+    # Tolerated fraction of changed pixels per capture name
+    VISUAL_THRESHOLDS = {
+        "default": 0.01,
+        "home_page_loaded": 0.05,  # Hero animations and rotating logos
+        "careers_page_loaded": 0.03,
+        "lever_application_page": 0.01,
+    }
+    # Regions excluded from comparison per capture: [x, y, width, height] in CSS pixels (scaled by
+    # the device pixel ratio onto the screenshot), or the name of a locator of the capturing page
+    # (its bounding box at capture time)
+    VISUAL_IGNORE_REGIONS = {
+        "home_page_loaded": ["page_title"],  # Rotating hero headline
+    }
+    
+    # Driver/browser process supervision (see utils/process_supervisor.py): per-test CPU and
+    # peak RSS, and reaping of process trees left behind by crashed runs or killed workers
+    PROCESS_SUPERVISOR = os.getenv("PROCESS_SUPERVISOR", "true").lower() == "true"
+    PROCESS_SAMPLE_INTERVAL = 0.5  # Seconds between process tree samples
+    PROCESS_REGISTRY_DIR = os.getenv("PROCESS_REGISTRY_DIR", ".driver-processes")
+    
+    # Network record/replay of the job-filter AJAX calls (see utils/network_replay.py): live, record or replay
+    NETWORK_MODE = os.getenv("NETWORK_MODE", "live").lower()
+    NETWORK_FIXTURE_FILE = os.getenv("NETWORK_FIXTURE_FILE", "network/fixtures/careers.json")
+    NETWORK_REPLAY_DELAY = int(os.getenv("NETWORK_REPLAY_DELAY", "50"))  # Milliseconds before a replayed response
+    # Regular expressions of the intercepted request URLs (job postings API and WordPress AJAX endpoints)
+    NETWORK_URL_PATTERNS = [r"api\.lever\.co/", r"/wp-admin/admin-ajax\.php", r"/wp-json/"]
+    # Cache-buster query/form parameters, ignored when matching a request to a recorded response
+    NETWORK_VOLATILE_PARAMS = ["_", "_t", "t", "ts", "timestamp", "cb", "cachebuster", "nocache", "rand"]
+    
+    # Memoized page-object reads (see utils/read_cache.py), dropped on any page-state change
+    READ_CACHE = os.getenv("READ_CACHE", "true").lower() == "true"
+    READ_CACHE_MAX_AGE = float(os.getenv("READ_CACHE_MAX_AGE", "10"))  # Seconds, bounds staleness from AJAX updates
+    
+    # Startup-time budget: median `pytest --collect-only` seconds (see utils/startup_benchmark.py)
+    STARTUP_BUDGET = float(os.getenv("STARTUP_BUDGET", "1.5"))
+    
+    # Synthetic monitoring daemon (see utils/monitor.py)
+    MONITOR_INTERVAL = float(os.getenv("MONITOR_INTERVAL", "300"))  # Seconds between rounds of journeys
+    MONITOR_WINDOW = int(os.getenv("MONITOR_WINDOW", "100"))  # Runs kept for success ratio and latency quantiles
+    MONITOR_METRICS_FILE = os.getenv("MONITOR_METRICS_FILE", "reports/monitor.prom")
+    MONITOR_JSONL_FILE = os.getenv("MONITOR_JSONL_FILE", "reports/monitor.jsonl")
+    MONITOR_JSONL_MAX_BYTES = 10 * 1024 * 1024
+    
+    # Page fixtures (saved page source used by the locator profiler)
+    PAGE_FIXTURE_DIR = "locators/fixtures"
+    SAVE_PAGE_FIXTURES = os.getenv("SAVE_PAGE_FIXTURES", "false").lower() == "true"
+    
     @classmethod
-    def get_browser_options(cls) -> Dict[str, Any]:
-        """Get browser-specific options"""
-        if cls.BROWSER == Browser.CHROME:
+    def get_browser_options(cls, profile_dir: str = None, browser_config: "BrowserConfig" = None) -> Dict[str, Any]:
+        """Get browser-specific options (profile_dir: user data directory to start from)"""
+        browser_config = browser_config or BrowserConfig()
+        if browser_config.browser == Browser.CHROME:
             from selenium.webdriver.chrome.options import Options
             options = Options()
-            if cls.HEADLESS:
+            if browser_config.headless:
                 options.add_argument("--headless=new")
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
             options.add_argument("--disable-gpu")
             options.add_argument("--window-size=1920,1080")  # Explicit size
             options.add_argument("--start-maximized")        # Start maximized
+            options.add_argument("--no-first-run")           # Skip first-run tasks
+            options.add_argument("--no-default-browser-check")
+            options.add_argument("--disable-search-engine-choice-screen")
+            if profile_dir:
+                options.add_argument(f"--user-data-dir={profile_dir}")
             return options
         
-        elif cls.BROWSER == Browser.FIREFOX:
+        elif browser_config.browser == Browser.FIREFOX:
             from selenium.webdriver.firefox.options import Options
             options = Options()
-            if cls.HEADLESS:
+            if browser_config.headless:
                 options.add_argument("--headless")
             options.add_argument("--width=1920")   # Explicit size
             options.add_argument("--height=1080")
+            if profile_dir:
+                options.add_argument("-profile")
+                options.add_argument(profile_dir)
             return options
         
-        return None
\ No newline at end of file
+        return None
+
+
+@dataclass(frozen=True)
+class BrowserConfig:
+    """Browser settings of one driver; defaults come from Config.BROWSER/Config.HEADLESS"""
+    browser: Browser = field(default_factory=lambda: Config.BROWSER)
+    headless: bool = field(default_factory=lambda: Config.HEADLESS)
+    
+    @property
+    def name(self) -> str:
+        return self.browser.value
+    
+    @classmethod
+    def of(cls, driver) -> "BrowserConfig":
+        """The config a driver was created with (the defaults for drivers not made by create_driver)"""
+        return getattr(driver, "browser_config", None) or cls()
+    
+    @staticmethod
+    def parse_browsers(value: str) -> List[Browser]:
+        """Browsers from a comma-separated option value such as "chrome,firefox" ("all" for every browser)"""
+        if value.strip().lower() == "all":
+            return list(Browser)
+        browsers = []
+        for name in filter(None, (name.strip().upper() for name in value.split(","))):
+            if name not in Browser.__members__:
+                raise ValueError(f"Unsupported browser: {name.lower()}")
+            if Browser[name] not in browsers:
+                browsers.append(Browser[name])
+        return browsers
@@ -1,27 +1,38 @@
+import json
+import os
 import pytest
 import logging
+import threading
 import allure
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
 from datetime import datetime
 from pathlib import Path
-from config.config import Config, Browser
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('test_execution.log'),
-        logging.StreamHandler()
-    ]
-)
+from collections import Counter
+from config.config import Config, Browser, BrowserConfig
+from locators.locator_repository import locator_repo
+from utils.browser_profile import ProfileTemplate
+from utils.checkpoint import retry_budget
+from utils.driver_factory import create_driver
+from utils.driver_prefetch import DriverPrefetcher
+from utils.driver_events import CommandStats, add_listener, get_listener
+from utils.read_cache import read_cache_for
+from utils.flight_recorder import FlightRecorder
 
 logger = logging.getLogger(__name__)
 
+# Profile templates per browser config, built at most once per process
+# (the driver prefetch thread launches browsers too)
+_profile_templates = {}
+_profile_templates_lock = threading.Lock()
+
+# Driver command totals across all tests of this process (and, on the xdist controller, of all workers)
+_session_command_stats = CommandStats()
+
+# Test outcomes per browser (collected on the xdist controller too, from worker reports)
+_browser_results = {}
+
+# Locator heals of the xdist workers (the controller resolves no locators itself)
+_worker_heals = []
+
 
 def pytest_addoption(parser):
     """Add custom command line options"""
@@ -29,7 +40,8 @@ def pytest_addoption(parser):
         "--browser",
         action="store",
         default="chrome",
-        help="Browser to run tests: chrome or firefox"
+        help="Browser to run tests: chrome, firefox, or a matrix such as chrome,firefox (or all) "
+             "that parametrizes every test over the listed browsers"
     )
     parser.addoption(
         "--headless",
@@ -37,45 +49,272 @@ def pytest_addoption(parser):
         default="false",
         help="Run browser in headless mode: true or false"
     )
+    parser.addoption(
+        "--remote-url",
+        action="store",
+        default=None,
+        help="Remote WebDriver URL, e.g. http://localhost:4444 or a chromedriver --port endpoint"
+    )
+    parser.addoption(
+        "--profile-template",
+        action="store",
+        default=None,
+        help="Start browsers from a pre-warmed profile template: true or false"
+    )
+    parser.addoption(
+        "--prefetch-driver",
+        action="store",
+        default=None,
+        help="Launch the next test's browser in the background: true or false (ignored under xdist)"
+    )
+    parser.addoption(
+        "--visual-regression",
+        action="store",
+        default=None,
+        help="Compare load-state screenshots with baselines: true or false"
+    )
+    parser.addoption(
+        "--update-baselines",
+        action="store_true",
+        default=False,
+        help="Replace visual baselines with this run's captures"
+    )
+    parser.addoption(
+        "--network-mode",
+        action="store",
+        default=None,
+        choices=["live", "record", "replay"],
+        help="Job-filter AJAX calls: live, record them to fixtures, or replay them from fixtures (Chrome only)"
+    )
+    parser.addoption(
+        "--step-retries",
+        action="store",
+        type=int,
+        default=None,
+        help="Retry a failing step up to N times from the last good checkpoint (0 disables)"
+    )
+    parser.addoption(
+        "--step-retry-budget",
+        action="store",
+        type=int,
+        default=None,
+        help="Maximum step retries for the whole session"
+    )
+
+
+def pytest_configure(config):
+    """Configure logging and apply command line overrides of driver startup and step retry settings"""
+    # Configured here rather than at import so collection-only runs skip the log file
+    if not config.option.collectonly:
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.FileHandler('test_execution.log'),
+                logging.StreamHandler()
+            ]
+        )
+    
+    try:
+        config._browsers = BrowserConfig.parse_browsers(config.getoption("--browser"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    if not config._browsers:
+        raise pytest.UsageError("--browser needs at least one browser")
+    
+    if config.getoption("--remote-url") is not None:
+        Config.REMOTE_URL = config.getoption("--remote-url")
+    if config.getoption("--profile-template") is not None:
+        Config.PROFILE_TEMPLATE = config.getoption("--profile-template").lower() == "true"
+    if config.getoption("--prefetch-driver") is not None:
+        Config.PREFETCH_DRIVER = config.getoption("--prefetch-driver").lower() == "true"
+    if config.getoption("--visual-regression") is not None:
+        Config.VISUAL_REGRESSION = config.getoption("--visual-regression").lower() == "true"
+    if config.getoption("--update-baselines"):
+        Config.VISUAL_REGRESSION = True
+        Config.VISUAL_UPDATE_BASELINES = True
+    if config.getoption("--network-mode") is not None:
+        Config.NETWORK_MODE = config.getoption("--network-mode")
+    if config.getoption("--step-retries") is not None:
+        Config.STEP_RETRY_ATTEMPTS = config.getoption("--step-retries")
+    if config.getoption("--step-retry-budget") is not None:
+        retry_budget.limit = config.getoption("--step-retry-budget")
+    # xdist worker: count retries in the controller's file, so the budget is session-wide
+    workerinput = getattr(config, "workerinput", {})
+    if "retry_budget_file" in workerinput:
+        retry_budget.share(workerinput["retry_budget_file"])
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """xdist controller: hand every worker the shared step retry budget"""
+    if Config.STEP_RETRY_ATTEMPTS > 0:
+        node.workerinput["retry_budget_file"] = retry_budget.share()
+
+
+def pytest_unconfigure(config):
+    """Remove the shared step retry budget file"""
+    retry_budget.close()
+
+
+def pytest_generate_tests(metafunc):
+    """Matrix mode: parametrize every browser test over the browsers given to --browser"""
+    browsers = metafunc.config._browsers
+    if len(browsers) > 1 and "browser_config" in metafunc.fixturenames:
+        metafunc.parametrize("browser_config", [browser.value for browser in browsers], indirect=True)
+
+
+def _headless(config) -> bool:
+    return config.getoption("--headless").lower() == "true"
+
+
+def _launch_driver(browser_config: BrowserConfig):
+    """Start a driver for browser_config, from a profile template copy when enabled"""
+    profile_dir = None
+    template = None
+    if Config.PROFILE_TEMPLATE:
+        with _profile_templates_lock:
+            if browser_config not in _profile_templates:
+                _profile_templates[browser_config] = ProfileTemplate(browser_config)
+            template = _profile_templates[browser_config]
+        template.ensure()
+        profile_dir = template.copy()
+    
+    driver = create_driver(profile_dir=profile_dir, browser_config=browser_config)
+    if Config.PROCESS_SUPERVISOR:
+        from utils.process_supervisor import supervisor
+        supervisor.track(driver, f"{browser_config.name} driver of pid {os.getpid()}")
+    if template is not None:
+        template.validate(driver)
+    return driver, profile_dir
+
+
+def _close_driver(session):
+    """
+    Quit a driver started by _launch_driver and remove its profile copy
+    Returns the CPU time and peak RSS of the driver's process tree when supervised
+    """
+    driver, profile_dir = session
+    usage = None
+    if Config.PROCESS_SUPERVISOR:
+        from utils.process_supervisor import supervisor
+        supervisor.stop(driver)
+    try:
+        driver.quit()
+    finally:
+        if Config.PROCESS_SUPERVISOR:
+            usage = supervisor.release(driver)
+        if profile_dir:
+            ProfileTemplate.release(profile_dir)
+    return usage
+
+
+def _remote_session_alive(session) -> bool:
+    """
+    Check that a prefetched remote session still answers commands
+    A Grid drops sessions left idle past its session timeout while the current test runs
+    """
+    if not Config.REMOTE_URL:
+        return True
+    driver, _ = session
+    try:
+        driver.current_window_handle
+        return True
+    except Exception as e:
+        logger.debug(f"Prefetched remote session is gone: {e}")
+        return False
+
+
+@pytest.fixture(scope="session")
+def driver_prefetcher(request):
+    """
+    Background launcher of the next test's driver (None unless --prefetch-driver=true)
+    Off under xdist: a worker is handed its next test only as it finishes the current one, so
+    a prefetched browser would mostly be launched for a test that never comes
+    """
+    if not Config.PREFETCH_DRIVER:
+        yield None
+        return
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        logger.info("Driver prefetch is disabled under xdist")
+        yield None
+        return
+    
+    prefetcher = DriverPrefetcher(_launch_driver, _close_driver, alive=_remote_session_alive)
+    request.config._driver_prefetcher = prefetcher
+    yield prefetcher
+    prefetcher.shutdown()
+
+
+@pytest.fixture(scope="session")
+def job_catalog(request):
+    """Complete job list, crawled once per session with a dedicated browser"""
+    from pages.qa_careers_page import QACareersPage
+    
+    # The catalog does not depend on the browser: crawl it with the first one requested
+    logger.info("Crawling job catalog")
+    session = _launch_driver(BrowserConfig(request.config._browsers[0], _headless(request.config)))
+    try:
+        qa_page = QACareersPage(session[0])
+        qa_page.open_all_positions()
+        catalog = qa_page.get_job_catalog()
+    finally:
+        _close_driver(session)
+    
+    assert len(catalog) > 0, "Job catalog is empty"
+    return catalog
+
+
+def _next_browser_config(request, current: BrowserConfig):
+    """Browser config of the test that will follow in this process, or None after the last one"""
+    items = request.session.items
+    if request.node not in items or items.index(request.node) == len(items) - 1:
+        return None
+    next_item = items[items.index(request.node) + 1]
+    callspec = getattr(next_item, "callspec", None)
+    browser = callspec.params.get("browser_config") if callspec else None
+    return BrowserConfig(Browser(browser) if browser else request.config._browsers[0], current.headless)
 
 
 @pytest.fixture(scope="function")
-def driver(request):
+def browser_config(request):
+    """Browser of this test: its matrix parameter, or the single browser given to --browser"""
+    param = getattr(request, "param", None)
+    config = BrowserConfig(Browser(param) if param else request.config._browsers[0], _headless(request.config))
+    # Recorded on the report, so outcomes can be grouped per browser (also across xdist workers)
+    request.node.user_properties.append(("browser", config.name))
+    allure.dynamic.label("browser", config.name)
+    return config
+
+
+@pytest.fixture(scope="function")
+def driver(request, browser_config, driver_prefetcher):
     """
     Fixture to initialize and teardown WebDriver
     Scope: function (new browser instance for each test)
     """
-    # Get command line options
-    browser_name = request.config.getoption("--browser").lower()
-    headless = request.config.getoption("--headless").lower() == "true"
-    
-    # Update config
-    Config.BROWSER = Browser[browser_name.upper()]
-    Config.HEADLESS = headless
-    
+    browser_name = browser_config.name
+    headless = browser_config.headless
     logger.info(f"Initializing {browser_name} browser (headless={headless})")
     
-    # Initialize driver based on browser type
-    if Config.BROWSER == Browser.CHROME:
-        options = Config.get_browser_options()
-        service = ChromeService(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-    elif Config.BROWSER == Browser.FIREFOX:
-        options = Config.get_browser_options()
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=options)
+    # Initialize driver, taking over the one prefetched during the previous test if enabled
+    if driver_prefetcher is not None:
+        session = driver_prefetcher.acquire(browser_config)
+        next_config = _next_browser_config(request, browser_config)
+        if next_config is not None:
+            driver_prefetcher.prefetch(next_config)
     else:
-        raise ValueError(f"Unsupported browser: {browser_name}")
+        session = _launch_driver(browser_config)
+    driver = session[0]
     
-    # Set window size (works in all environments)
-    driver.set_window_size(1920, 1080)
-    
-    # Set page load timeout
-    driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+    # Measure driver round-trips and record recent commands for a failure trace
+    command_stats = add_listener(driver, CommandStats())
+    if Config.FLIGHT_RECORDER:
+        add_listener(driver, FlightRecorder(Config.FLIGHT_RECORDER_SIZE))
     
     # Attach browser info to Allure report
     allure.attach(
-        f"Browser: {browser_name}\nHeadless: {headless}",
+        f"Browser: {browser_name}\nHeadless: {headless}\nRemote: {Config.REMOTE_URL or 'local'}",
         name="Browser Configuration",
         attachment_type=allure.attachment_type.TEXT
     )
@@ -83,8 +322,28 @@ def driver(request):
     yield driver
     
     # Teardown
-    logger.info("Closing browser")
-    driver.quit()
+    allure.attach(
+        f"{command_stats.summary()}\nMemoized reads: {read_cache_for(driver).summary()}",
+        name="Driver Command Stats",
+        attachment_type=allure.attachment_type.TEXT
+    )
+    _session_command_stats.merge(command_stats)
+    
+    try:
+        if Config.NETWORK_MODE != "live":
+            from utils.network_replay import network
+            network.collect(driver)
+    finally:
+        logger.info("Closing browser")
+        usage = _close_driver(session)
+    if usage is not None:
+        request.node.user_properties += [(f"browser_{name}", value) for name, value in usage.items()]
+        allure.attach(
+            f"CPU time: {usage['cpu_seconds']:.1f}s\nPeak RSS: {usage['peak_rss_mb']:.0f} MB\n"
+            f"Processes: {usage['processes']}",
+            name="Browser Resources",
+            attachment_type=allure.attachment_type.TEXT
+        )
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -95,15 +354,41 @@ def test_setup(request, driver):
     """
     test_name = request.node.name
     logger.info(f"Starting test: {test_name}")
+    heals_before = len(locator_repo.cache.heals)
     
     yield
     
+    # Report locators that only resolved through a fallback alternative
+    new_heals = locator_repo.cache.heals[heals_before:]
+    if new_heals:
+        allure.attach(
+            json.dumps(new_heals, indent=2),
+            name="locator_heals",
+            attachment_type=allure.attachment_type.JSON
+        )
+    
+    recorder = get_listener(driver, FlightRecorder)
+    
     # Check if test failed
     if request.node.rep_call.failed:
         logger.error(f"Test failed: {test_name}")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Write command trace before failure artifacts add their own commands
+        if recorder is not None:
+            trace_path = recorder.dump(
+                Path(Config.TRACE_DIR) / f"{test_name}_{timestamp}.jsonl",
+                context={"test": request.node.nodeid, "error": str(request.node.rep_call.longrepr)[-2000:]}
+            )
+            logger.info(f"Command trace saved: {trace_path}")
+            allure.attach.file(
+                str(trace_path),
+                name="command_trace",
+                attachment_type=allure.attachment_type.TEXT,
+                extension="jsonl"
+            )
         
         # Take screenshot
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         screenshot_name = f"{test_name}_{timestamp}.png"
         screenshot_path = Path(Config.SCREENSHOT_DIR) / screenshot_name
         
@@ -127,6 +412,10 @@ def test_setup(request, driver):
             name="page_source",
             attachment_type=allure.attachment_type.HTML
         )
+    
+    # Discard the ring on success (and after dumping on failure)
+    if recorder is not None:
+        recorder.clear()
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -137,4 +426,141 @@ def pytest_runtest_makereport(item, call):
     """
     outcome = yield
     rep = outcome.get_result()
-    setattr(item, f"rep_{rep.when}", rep)
\ No newline at end of file
+    setattr(item, f"rep_{rep.when}", rep)
+
+
+def pytest_runtest_logreport(report):
+    """Count each test's outcome under its browser"""
+    browser = dict(report.user_properties).get("browser")
+    if browser is None or not (report.when == "call" or (report.when == "setup" and not report.passed)):
+        return
+    outcome = "error" if report.when == "setup" and report.failed else report.outcome
+    _browser_results.setdefault(browser, Counter())[outcome] += 1
+
+
+def pytest_sessionstart(session):
+    """Reap driver/browser processes left by earlier runs whose pytest process died"""
+    if Config.PROCESS_SUPERVISOR and not session.config.option.collectonly:
+        from utils.process_supervisor import supervisor
+        supervisor.reap_orphans()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Reap leftover driver processes, merge the workers' network recordings and persist
+    locator heals of this process for the run report
+    """
+    if Config.PROCESS_SUPERVISOR and not session.config.option.collectonly:
+        from utils.process_supervisor import supervisor
+        supervisor.release_all()
+        # Under xdist the controller finishes last and reaps the trees of crashed workers
+        supervisor.reap_orphans()
+    
+    if Config.NETWORK_MODE == "record" and not os.getenv("PYTEST_XDIST_WORKER"):
+        from utils.network_replay import network
+        network.merge_worker_files()
+    
+    heals = locator_repo.cache.heals
+    if heals:
+        worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        heals_path = Path("reports") / f"locator-heals-{worker}.json"
+        heals_path.parent.mkdir(parents=True, exist_ok=True)
+        heals_path.write_text(json.dumps(heals, indent=2))
+    
+    # xdist worker: hand this process's totals to the controller, which prints the terminal summary
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["session_totals"] = _session_totals()
+
+
+def _session_totals() -> dict:
+    """Totals of this process shown in the terminal summary, as plain data"""
+    totals = {"commands": _session_command_stats.as_dict(), "heals": locator_repo.cache.heals}
+    if Config.VISUAL_REGRESSION:
+        from utils.visual_regression import visual_regression
+        totals["visual"] = [
+            {"name": result.name, "status": result.status, "diff_ratio": float(result.diff_ratio),
+             "hash_distance": int(result.hash_distance), "threshold": float(result.threshold),
+             "diff_path": result.diff_path, "millis": float(result.millis)}
+            for result in visual_regression.results
+        ]
+    if Config.NETWORK_MODE != "live":
+        from utils.network_replay import network
+        totals["network_misses"] = dict(network.misses)
+    if Config.PROCESS_SUPERVISOR:
+        from utils.process_supervisor import supervisor
+        totals["processes"] = dict(supervisor.totals)
+    return totals
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """xdist controller: add a finished worker's totals to this process's, for the terminal summary"""
+    totals = getattr(node, "workeroutput", {}).get("session_totals")
+    if totals is None:
+        return  # The worker crashed before finishing its session
+    _session_command_stats.merge(CommandStats.from_dict(totals["commands"]))
+    _worker_heals.extend(totals["heals"])
+    if "visual" in totals:
+        from utils.visual_regression import visual_regression, VisualResult
+        visual_regression.results += [VisualResult(**result) for result in totals["visual"]]
+    if "network_misses" in totals:
+        from utils.network_replay import network
+        for miss, count in totals["network_misses"].items():
+            network.misses[miss] = network.misses.get(miss, 0) + count
+    if "processes" in totals:
+        from utils.process_supervisor import supervisor
+        for name, value in totals["processes"].items():
+            if name == "peak_rss_mb":
+                supervisor.totals[name] = max(supervisor.totals[name], value)
+            else:
+                supervisor.totals[name] += value
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report per-browser outcomes, driver commands, browser resources, prefetch, network replay, retries and heals"""
+    if Config.VISUAL_REGRESSION:
+        from utils.visual_regression import visual_regression
+        terminalreporter.section("visual regression")
+        terminalreporter.write_line(visual_regression.summary())
+    
+    if _session_command_stats.count:
+        terminalreporter.section("driver commands")
+        terminalreporter.write_line(_session_command_stats.summary())
+    
+    if Config.NETWORK_MODE != "live":
+        from utils.network_replay import network
+        terminalreporter.section(f"network {Config.NETWORK_MODE}")
+        terminalreporter.write_line(network.summary())
+    
+    if Config.PROCESS_SUPERVISOR and not config.option.collectonly:
+        from utils.process_supervisor import supervisor
+        if supervisor.totals["drivers"] or supervisor.totals["orphans_reaped"]:
+            terminalreporter.section("browser processes")
+            terminalreporter.write_line(supervisor.summary())
+    
+    if len(_browser_results) > 1:
+        terminalreporter.section("browser matrix")
+        for browser, outcomes in sorted(_browser_results.items()):
+            terminalreporter.write_line(
+                f"{browser}: " + ", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+            )
+    
+    prefetcher = getattr(config, "_driver_prefetcher", None)
+    if prefetcher is not None:
+        terminalreporter.section("driver prefetch")
+        terminalreporter.write_line(prefetcher.summary())
+    
+    if Config.STEP_RETRY_ATTEMPTS > 0:
+        terminalreporter.section("step retries")
+        terminalreporter.write_line(f"Used {retry_budget.used} of {retry_budget.limit} step retries")
+    
+    heals = locator_repo.cache.heals + _worker_heals
+    if not heals:
+        return
+    terminalreporter.section("locator heals")
+    for heal in heals:
+        terminalreporter.write_line(
+            f"{heal['locator']}: primary {tuple(heal['primary'])} failed, "
+            f"used {tuple(heal['used'])} ({heal['count']}x)"
+        )
\ No newline at end of file
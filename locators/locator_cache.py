@@ -0,0 +1,102 @@
+"""On-disk cache of winning locator strategies and the fallback heals that produced them"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LocatorCache:
+    """
+    Remembers which alternative of a fallback chain last found each element
+    A winner is only used for ttl seconds after it was recorded, so a primary that works again
+    gets back its first place. Heals (an alternative other than the primary succeeding) are
+    kept for reporting
+    """
+
+    def __init__(self, cache_file: str, ttl: float = None):
+        self._path = Path(cache_file)
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._winners: Dict[str, Tuple[Tuple[str, str], float]] = {}  # Strategy and when it was recorded
+        self._heals: Dict[Tuple, Dict] = {}
+        self._load()
+
+    def _load(self):
+        """Load persisted winners, ignoring an unreadable cache"""
+        if not self._path.exists():
+            return
+        try:
+            data = json.loads(self._path.read_text())
+            self._winners = {
+                key: (tuple(entry["strategy"]), datetime.fromisoformat(entry["updated"]).timestamp())
+                for key, entry in data.items()
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable locator cache {self._path}: {e}")
+
+    @property
+    def heals(self) -> List[Dict]:
+        """Heals recorded in this session, one entry per locator and strategy used"""
+        return list(self._heals.values())
+
+    def get_winner(self, key: str) -> Optional[Tuple[str, str]]:
+        """Get the strategy that last found the element, unless recorded longer than ttl seconds ago"""
+        entry = self._winners.get(key)
+        if entry is None or (self._ttl is not None and time.time() - entry[1] > self._ttl):
+            return None
+        return entry[0]
+
+    def record(self, key: str, strategy: Tuple[str, str], primary: Tuple[str, str], elapsed: float):
+        """Record the strategy that found the element and persist it if it changed"""
+        strategy = tuple(strategy)
+        healed = strategy != tuple(primary)
+        with self._lock:
+            if healed:
+                heal = self._heals.get((key, strategy))
+                if heal is None:
+                    self._heals[(key, strategy)] = {
+                        "locator": key,
+                        "primary": list(primary),
+                        "used": list(strategy),
+                        "elapsed": round(elapsed, 3),
+                        "first_seen": datetime.now().isoformat(timespec="seconds"),
+                        "count": 1,
+                    }
+                    logger.warning(f"Locator healed: {key} found with {strategy} instead of {tuple(primary)}")
+                else:
+                    heal["count"] += 1
+
+            if self.get_winner(key) == strategy:
+                return
+            if not healed and key not in self._winners:
+                return
+            self._winners[key] = (strategy, time.time())
+            self._save(key, strategy)
+
+    def _save(self, key: str, strategy: Tuple[str, str]):
+        """Merge one entry into the cache file (other workers may have written theirs)"""
+        data = {}
+        if self._path.exists():
+            try:
+                data = json.loads(self._path.read_text())
+            except ValueError:
+                data = {}
+        data[key] = {"strategy": list(strategy), "updated": datetime.now().isoformat(timespec="seconds")}
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2))
+        os.replace(tmp_path, self._path)
+
+    def clear(self):
+        """Forget all winners (e.g. after fixing primaries in locators.json)"""
+        with self._lock:
+            self._winners = {}
+            if self._path.exists():
+                self._path.unlink()
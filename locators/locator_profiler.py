@@ -0,0 +1,305 @@
+"""
+Locator cost profiler and lint for locators.json
+
+Evaluates every locator against stored page fixtures (see Config.PAGE_FIXTURE_DIR),
+measures evaluation time and match count, flags ambiguous, unmatched, slow or
+brittle selectors and proposes attribute-anchored CSS alternatives.
+
+Usage:
+    python -m locators.locator_profiler [--fixtures DIR] [--slow-ms 2.0] [--json out.json] [--strict]
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from selenium.webdriver.common.by import By
+from config.config import Config
+from locators.locator_repository import LocatorRepository
+from utils.dom_snapshot import DomSnapshot, compile_locator
+
+# Sample values for dynamic placeholders so templated locators can be evaluated
+PLACEHOLDER_SAMPLES = {
+    "location": "Istanbul, Turkiye",
+    "department": "Quality Assurance",
+    "data_location": "istanbul-turkiye",
+    "data_team": "qualityassurance",
+}
+
+# Locators expected to match a list of elements rather than a single one
+MULTI_ELEMENT_SUFFIXES = ("_list", "_options", "_items")
+
+# Locators evaluated relative to a parent element, so page-wide match counts are expected
+SCOPED_LOCATORS = {
+    "QACareersPage": {"job_position", "job_department", "job_location"},
+}
+
+# Attributes stable enough to anchor a selector on, in order of preference
+ANCHOR_ATTRIBUTES = ("id", "data-testid", "data-qa", "name", "data-location", "data-team", "href", "aria-label")
+
+TEXT_MATCH = re.compile(r"contains\(\s*text\(\)")
+CLASS_EQUALS = re.compile(r"@class\s*=\s*['\"]")
+# A single XPath step: //tag or //tag[@attr='value'] (and-joined predicates)
+XPATH_STEP = re.compile(r"(//?)([a-zA-Z][\w-]*|\*)((?:\[[^\]]*\])*)")
+XPATH_PREDICATE = re.compile(r"@([\w-]+)\s*=\s*['\"]([^'\"]*)['\"]")
+# Path segments that identify one record (numeric or hex/UUID ids) rather than a page
+ID_LIKE = re.compile(r"\d{3,}|^[0-9a-f]{8,}(?:-[0-9a-f]{4,})*$", re.IGNORECASE)
+
+
+@dataclass
+class Finding:
+    """Single lint finding for a locator"""
+    severity: str
+    rule: str
+    message: str
+
+
+@dataclass
+class LocatorProfile:
+    """Measured cost and lint findings for one locator"""
+    page: str
+    name: str
+    strategy: str
+    value: str
+    matches: Optional[int] = None
+    mean_ms: Optional[float] = None
+    findings: List[Finding] = field(default_factory=list)
+    suggestions: List[str] = field(default_factory=list)
+
+
+def fill_placeholders(value: str) -> str:
+    """Replace {placeholders} with sample values"""
+    for key, sample in PLACEHOLDER_SAMPLES.items():
+        value = value.replace(f"{{{key}}}", sample)
+    return value
+
+
+def xpath_to_css(xpath: str) -> Optional[str]:
+    """
+    Convert a plain structural XPath (tags, descendant steps, attribute equality) to an
+    equivalent CSS selector; @class='a b' stays a whole-attribute match, not .a.b
+    """
+    position = 0
+    parts = []
+    for match in XPATH_STEP.finditer(xpath):
+        if match.start() != position:
+            return None
+        axis, tag, predicates = match.groups()
+        selector = "" if tag == "*" else tag
+        for predicate in re.findall(r"\[([^\]]*)\]", predicates):
+            clauses = [clause.strip() for clause in re.split(r"\band\b", predicate)]
+            for clause in clauses:
+                attr_match = XPATH_PREDICATE.fullmatch(clause)
+                if not attr_match:
+                    return None
+                attr, attr_value = attr_match.groups()
+                if attr == "id":
+                    selector += f"#{attr_value}"
+                else:
+                    selector += f"[{attr}='{attr_value}']"
+        parts.append((axis, selector or "*"))
+        position = match.end()
+    if position != len(xpath) or not parts:
+        return None
+    css = parts[0][1]
+    for axis, selector in parts[1:]:
+        css += (" > " if axis == "/" else " ") + selector
+    return css
+
+
+def static_findings(name: str, by: str, value: str) -> List[Finding]:
+    """Lint rules that need no fixture"""
+    findings = []
+    if by != By.XPATH:
+        return findings
+    if TEXT_MATCH.search(value):
+        findings.append(Finding(
+            "warning", "text-match",
+            "contains(text(), ...) matches only the first text node and is re-evaluated over every "
+            "candidate element while polling; prefer an attribute anchor"))
+    first_step = XPATH_STEP.match(value)
+    if value.startswith("//") and first_step and "@" not in first_step.group(3):
+        findings.append(Finding(
+            "warning", "unanchored",
+            f"first step '//{first_step.group(2)}' has no attribute predicate and scans the whole document"))
+    if CLASS_EQUALS.search(value):
+        findings.append(Finding(
+            "info", "class-equals",
+            "@class='...' breaks as soon as another class is added; use CSS class matching"))
+    css = xpath_to_css(value)
+    if css:
+        findings.append(Finding("info", "css-equivalent", f"expressible as CSS: {css}"))
+    return findings
+
+
+def _same_nodes(snapshot: DomSnapshot, locator: Tuple, expected: List) -> bool:
+    """Check that a candidate locator matches exactly the expected nodes"""
+    try:
+        nodes = [element.node for element in snapshot.find_elements(*locator)]
+    except Exception:
+        return False
+    return nodes == expected
+
+
+def stable_href_part(href: str) -> Optional[str]:
+    """
+    The last path segment of a link that names a page rather than a record (no posting ids,
+    never the query string), else the link's host; None for a link with neither
+    """
+    parts = urlsplit(href)
+    for segment in reversed([segment for segment in parts.path.split("/") if segment]):
+        if not ID_LIKE.search(segment):
+            return segment
+    return parts.netloc or None
+
+
+def suggest_alternatives(snapshot: DomSnapshot, locator: Tuple, limit: int = 3) -> List[str]:
+    """Propose attribute-anchored CSS selectors that match the same elements in the fixture"""
+    elements = snapshot.find_elements(*locator)
+    if not elements:
+        return []
+    expected = [element.node for element in elements]
+    first = elements[0]
+    tag = first.tag_name
+    candidates = []
+
+    css = xpath_to_css(locator[1]) if locator[0] == By.XPATH else None
+    if css:
+        candidates.append(css)
+    for attr in ANCHOR_ATTRIBUTES:
+        attr_value = first.get_attribute(attr)
+        if not attr_value:
+            continue
+        if attr == "id":
+            candidates.append(f"#{attr_value}")
+        elif attr == "href":
+            anchor = stable_href_part(attr_value)
+            if anchor:
+                candidates.append(f"{tag}[href*='{anchor}']")
+        else:
+            candidates.append(f"{tag}[{attr}='{attr_value}']")
+    classes = (first.get_attribute("class") or "").split()
+    candidates.extend(f"{tag}.{cls}" for cls in classes)
+    if 1 < len(classes) <= 3:
+        candidates.append(tag + "".join(f".{cls}" for cls in classes))
+
+    suggestions = []
+    for candidate in candidates:
+        if candidate == locator[1] or candidate in suggestions:
+            continue
+        if _same_nodes(snapshot, (By.CSS_SELECTOR, candidate), expected):
+            suggestions.append(candidate)
+            if len(suggestions) >= limit:
+                break
+    return suggestions
+
+
+def measure(snapshot: DomSnapshot, locator: Tuple, repeat: int) -> Tuple[int, float]:
+    """Return match count and mean evaluation time in milliseconds"""
+    by, value = locator
+    compile_locator(by, value, False)  # Exclude compilation from the timing
+    start = time.perf_counter()
+    for _ in range(repeat):
+        matches = len(snapshot.find_elements(by, value))
+    elapsed = (time.perf_counter() - start) / repeat
+    return matches, elapsed * 1000
+
+
+def load_fixtures(fixture_dir: Path) -> Dict[str, DomSnapshot]:
+    """Load <PageName>.html fixtures into snapshots"""
+    fixtures = {}
+    if fixture_dir.is_dir():
+        for path in sorted(fixture_dir.glob("*.html")):
+            fixtures[path.stem] = DomSnapshot(path.read_text(encoding="utf-8"))
+    return fixtures
+
+
+def profile_locators(repo: LocatorRepository, fixtures: Dict[str, DomSnapshot],
+                     slow_ms: float = 2.0, repeat: int = 20) -> List[LocatorProfile]:
+    """Profile and lint every locator in the repository"""
+    profiles = []
+    seen: Dict[Tuple, str] = {}
+    for page in repo.get_pages():
+        snapshot = fixtures.get(page)
+        for element_name, locator in repo.get_all(page).items():
+            # Fallback alternatives are profiled as element_name[1], element_name[2], ...
+            for index, (by, template) in enumerate(locator.alternatives):
+                name = element_name if index == 0 else f"{element_name}[{index}]"
+                value = fill_placeholders(template)
+                profile = LocatorProfile(page, name, by, template)
+                profile.findings.extend(static_findings(name, by, value))
+
+                key = (by, template)
+                if key in seen:
+                    profile.findings.append(Finding("info", "duplicate", f"same locator as {seen[key]}"))
+                else:
+                    seen[key] = f"{page}.{name}"
+
+                if snapshot is not None:
+                    try:
+                        profile.matches, profile.mean_ms = measure(snapshot, (by, value), repeat)
+                    except Exception as e:
+                        profile.findings.append(Finding("error", "invalid", f"cannot be evaluated: {e}"))
+                    else:
+                        multi = element_name.endswith(MULTI_ELEMENT_SUFFIXES) \
+                            or element_name in SCOPED_LOCATORS.get(page, ())
+                        if profile.matches == 0:
+                            profile.findings.append(Finding("warning", "no-match", "matches nothing in the fixture"))
+                        elif profile.matches > 1 and not multi:
+                            profile.findings.append(Finding(
+                                "warning", "ambiguous", f"matches {profile.matches} elements, expected one"))
+                        if profile.mean_ms > slow_ms:
+                            profile.findings.append(Finding(
+                                "warning", "slow", f"{profile.mean_ms:.3f} ms per evaluation (> {slow_ms} ms)"))
+                        if any(f.severity != "info" for f in profile.findings):
+                            profile.suggestions = suggest_alternatives(snapshot, (by, value))
+                profiles.append(profile)
+    return profiles
+
+
+def format_report(profiles: List[LocatorProfile], fixtures: Dict[str, DomSnapshot]) -> str:
+    """Render a plain-text report"""
+    lines = []
+    for page in dict.fromkeys(p.page for p in profiles):
+        source = "fixture" if page in fixtures else "no fixture - static lint only"
+        lines.append(f"== {page} ({source})")
+        for profile in (p for p in profiles if p.page == page):
+            cost = ""
+            if profile.matches is not None:
+                cost = f" matches={profile.matches} mean={profile.mean_ms:.3f}ms"
+            lines.append(f"  {profile.name}: {profile.strategy} {profile.value}{cost}")
+            for finding in profile.findings:
+                lines.append(f"    [{finding.severity}] {finding.rule}: {finding.message}")
+            for suggestion in profile.suggestions:
+                lines.append(f"    suggest: css selector {suggestion}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profile and lint locators.json against page fixtures")
+    parser.add_argument("--locators", default="locators/locators.json", help="Locator file to check")
+    parser.add_argument("--fixtures", default=Config.PAGE_FIXTURE_DIR, help="Directory of <PageName>.html fixtures")
+    parser.add_argument("--slow-ms", type=float, default=2.0, help="Flag locators slower than this per evaluation")
+    parser.add_argument("--repeat", type=int, default=20, help="Evaluations per locator when timing")
+    parser.add_argument("--json", dest="json_path", help="Also write findings as JSON")
+    parser.add_argument("--strict", action="store_true", help="Exit non-zero on warnings, not only errors")
+    args = parser.parse_args(argv)
+
+    repo = LocatorRepository(args.locators)
+    fixtures = load_fixtures(Path(args.fixtures))
+    profiles = profile_locators(repo, fixtures, slow_ms=args.slow_ms, repeat=args.repeat)
+    print(format_report(profiles, fixtures))
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps([asdict(p) for p in profiles], indent=2))
+
+    failing = {"error", "warning"} if args.strict else {"error"}
+    return 1 if any(f.severity in failing for p in profiles for f in p.findings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,125 @@
 """Locator repository for managing test locators"""
 import json
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List
 from pathlib import Path
+from config.config import Config
+from locators.locator_cache import LocatorCache
+
+
+class Locator(tuple):
+    """
+    (By strategy, locator value) pair of the primary strategy, carrying the
+    element's ordered fallback chain. Behaves exactly like the plain tuple.
+    """
+
+    def __new__(cls, key: str, alternatives: List[Tuple[str, str]]):
+        locator = super().__new__(cls, alternatives[0])
+        locator.key = key
+        locator.alternatives = tuple(tuple(alternative) for alternative in alternatives)
+        return locator
+
+    def __getnewargs__(self):
+        return (self.key, list(self.alternatives))
+
+    @property
+    def has_fallbacks(self) -> bool:
+        return len(self.alternatives) > 1
 
 
 class LocatorRepository:
-    """Repository pattern for managing locators"""
-    
-    def __init__(self, locator_file: str = "locators/locators.json"):
-        self._locators: Dict[str, Dict[str, Tuple]] = {}
-        self._load_locators(locator_file)
-    
-    def _load_locators(self, locator_file: str):
+    """
+    Repository pattern for managing locators
+    The locator file and the winner cache are read on first use, not at construction
+    """
+
+    def __init__(self, locator_file: str = "locators/locators.json", cache_file: str = None):
+        self._locator_file = locator_file
+        self._cache_file = cache_file
+        self._loaded: Dict[str, Dict[str, Locator]] = None
+        self._cache: LocatorCache = None
+
+    @property
+    def _locators(self) -> Dict[str, Dict[str, Locator]]:
+        if self._loaded is None:
+            self._loaded = self._load_locators(self._locator_file)
+        return self._loaded
+
+    @property
+    def cache(self) -> LocatorCache:
+        if self._cache is None:
+            self._cache = LocatorCache(self._cache_file or Config.LOCATOR_CACHE_FILE, Config.LOCATOR_CACHE_TTL)
+        return self._cache
+
+    def _load_locators(self, locator_file: str) -> Dict[str, Dict[str, Locator]]:
         """Load locators from JSON file"""
         file_path = Path(locator_file)
         if not file_path.exists():
             raise FileNotFoundError(f"Locator file not found: {locator_file}")
-        
+
+        locators = {}
         with open(file_path, 'r') as f:
             data = json.load(f)
             for page, elements in data.items():
-                self._locators[page] = {}
+                locators[page] = {}
                 for elem_name, locator_data in elements.items():
-                    # Convert list to tuple (By strategy, locator value)
-                    self._locators[page][elem_name] = tuple(locator_data)
-    
-    def get(self, page_name: str, element_name: str, **kwargs) -> Tuple:
+                    # Either one [By strategy, value] pair or an ordered list of fallback pairs
+                    if isinstance(locator_data[0], list):
+                        alternatives = [tuple(pair) for pair in locator_data]
+                    else:
+                        alternatives = [tuple(locator_data)]
+                    locators[page][elem_name] = Locator(f"{page}.{elem_name}", alternatives)
+        return locators
+
+    def get(self, page_name: str, element_name: str, **kwargs) -> Locator:
         """Get locator for a specific element with support for dynamic placeholders"""
         try:
             locator = self._locators[page_name][element_name]
             # Handle dynamic locators
             if kwargs:
-                by, value = locator
-                for key, val in kwargs.items():
-                    value = value.replace(f'{{{key}}}', str(val))
-                return (by, value)
+                alternatives = []
+                for by, value in locator.alternatives:
+                    for key, val in kwargs.items():
+                        value = value.replace(f'{{{key}}}', str(val))
+                    alternatives.append((by, value))
+                return Locator(locator.key, alternatives)
             return locator
         except KeyError:
             raise ValueError(f"Locator not found: {page_name}.{element_name}")
 
-    def get_all(self, page_name: str) -> Dict[str, Tuple]:
+    def get_all(self, page_name: str) -> Dict[str, Locator]:
         """Get all locators for a page"""
         return self._locators.get(page_name, {})
 
+    def get_pages(self) -> List[str]:
+        """Get names of all pages with locators"""
+        return list(self._locators)
+
+    def ordered_alternatives(self, locator: Locator) -> List[Tuple[str, str]]:
+        """Get alternatives in lookup order - the cached winning strategy first, until it expires"""
+        alternatives = list(locator.alternatives)
+        winner = self.cache.get_winner(locator.key)
+        if winner is not None:
+            # The cache stores strategies by position in the chain, so it survives placeholder values
+            index = self._template(locator).alternatives.index(winner) \
+                if winner in self._template(locator).alternatives else None
+            if index:
+                alternatives.insert(0, alternatives.pop(index))
+        return alternatives
+
+    def record_success(self, locator: Locator, used: Tuple[str, str], elapsed: float):
+        """
+        Remember which alternative found the element; a non-primary one is recorded as a heal
+        Callers must have checked that the primary is absent (see BasePage.resolve_locator)
+        """
+        template = self._template(locator)
+        used_template = template.alternatives[locator.alternatives.index(tuple(used))]
+        self.cache.record(locator.key, used_template, template.alternatives[0], elapsed)
+
+    def _template(self, locator: Locator) -> Locator:
+        """Get the unformatted locator a (possibly formatted) locator was built from"""
+        page_name, element_name = locator.key.split(".", 1)
+        return self._locators[page_name][element_name]
+
 
-# Singleton instance
+# Singleton instance (cheap to create - nothing is read until the first lookup)
 locator_repo = LocatorRepository()
@@ -1,20 +1,106 @@
 """Base page class with common page object functionality"""
 from abc import ABC, abstractmethod
 import time
+import allure
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from typing import Tuple, List
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from typing import Tuple, List, Dict, Iterable, Optional
 import logging
-from config.config import Config
+from pathlib import Path
+from config.config import Config, BrowserConfig
 from utils.decorators import log_action, screenshot_on_failure
+from utils.dom_snapshot import DomSnapshot
+from utils.element_cache import element_cache_for
+from utils.read_cache import memoized_read, read_cache_for, register_read_only_script
 from locators.locator_repository import locator_repo
 from selenium.webdriver import ActionChains
+from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
 logger = logging.getLogger(__name__)
 
 
+# Resolves a batch of locators in the page and reports presence, visibility,
+# text and bounding box for each of them in a single round-trip
+ELEMENTS_STATE_SCRIPT = register_read_only_script("""
+var locators = arguments[0];
+var scroll = arguments[1];
+var states = {};
+
+function resolve(strategy, value) {
+    if (strategy === 'xpath') {
+        return document.evaluate(value, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(value);
+}
+
+function isVisible(el) {
+    if (!el.getClientRects().length) {
+        return false;
+    }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none'
+        && parseFloat(style.opacity) > 0;
+}
+
+for (var name in locators) {
+    var el = null;
+    var alternative = -1;
+    // Each entry is an ordered list of alternatives; the first one found wins
+    for (var i = 0; i < locators[name].length && !el; i++) {
+        try {
+            el = resolve(locators[name][i][0], locators[name][i][1]);
+        } catch (e) {
+            el = null;
+        }
+        alternative = i;
+    }
+    if (!el) {
+        states[name] = {present: false, visible: false, text: '', rect: null, alternative: -1};
+        continue;
+    }
+    if (scroll) {
+        el.scrollIntoView(true);
+    }
+    var box = el.getBoundingClientRect();
+    states[name] = {
+        present: true,
+        visible: isVisible(el),
+        text: (el.innerText || el.textContent || '').trim(),
+        rect: {x: box.x, y: box.y, width: box.width, height: box.height},
+        alternative: alternative
+    };
+}
+return states;
+""")
+
+DEVICE_PIXEL_RATIO_SCRIPT = register_read_only_script("return window.devicePixelRatio;")
+
+
+def to_script_locator(locator: Tuple) -> List[str]:
+    """Translate a Selenium locator into a CSS/XPath pair the in-page script understands"""
+    by, value = locator
+    if by == By.XPATH:
+        return ["xpath", value]
+    if by == By.CSS_SELECTOR:
+        return ["css", value]
+    if by == By.ID:
+        return ["css", f'[id="{value}"]']
+    if by == By.NAME:
+        return ["css", f'[name="{value}"]']
+    if by == By.CLASS_NAME:
+        return ["css", f".{value}"]
+    if by == By.TAG_NAME:
+        return ["css", value]
+    if by == By.LINK_TEXT:
+        return ["xpath", f'//a[normalize-space(.)="{value}"]']
+    if by == By.PARTIAL_LINK_TEXT:
+        return ["xpath", f'//a[contains(., "{value}")]']
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
 class BasePage(ABC):
     """Base page with common functionality for all pages"""
     
@@ -22,6 +108,8 @@ class BasePage(ABC):
         self.driver = driver
         self.wait = WebDriverWait(driver, Config.DEFAULT_TIMEOUT)
         self.locator_repo = locator_repo
+        self._snapshot = None
+        self._elements = element_cache_for(driver)
     
     @abstractmethod
     def get_page_name(self) -> str:
@@ -32,24 +120,109 @@ class BasePage(ABC):
         """Get locator from repository"""
         return self.locator_repo.get(self.get_page_name(), element_name, **kwargs)
     
+    def resolve_locator(self, locator: Tuple, timeout: int = None) -> Tuple:
+        """
+        Pick the strategy to use for a locator with fallback alternatives
+        Each alternative (cached winner first) gets a short presence wait; if none
+        appears, all of them are polled together for the rest of the timeout.
+        A fallback only counts (and is remembered) as a heal if the primary is still absent
+        once the fallback has been found: a primary that is merely slow is used instead.
+        Plain locators are returned unchanged.
+        """
+        if not getattr(locator, "has_fallbacks", False):
+            return locator
+        
+        wait_time = timeout or Config.DEFAULT_TIMEOUT
+        alternatives = self.locator_repo.ordered_alternatives(locator)
+        start = time.monotonic()
+        
+        def confirm(alternative):
+            return self._confirm_alternative(locator, alternative, time.monotonic() - start)
+        
+        for alternative in alternatives:
+            remaining = wait_time - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            try:
+                WebDriverWait(self.driver, min(Config.FALLBACK_TIMEOUT, remaining)).until(
+                    EC.presence_of_element_located(alternative)
+                )
+                return confirm(alternative)
+            except TimeoutException:
+                logger.info(f"Locator alternative not found for {locator.key}: {alternative}")
+        
+        def any_alternative_present(driver):
+            for alternative in alternatives:
+                if driver.find_elements(*alternative):
+                    return alternative
+            return False
+        
+        remaining = wait_time - (time.monotonic() - start)
+        if remaining > 0:
+            return confirm(WebDriverWait(self.driver, remaining).until(any_alternative_present))
+        raise TimeoutException(f"No alternative found for {locator.key}: {alternatives}")
+    
+    def _confirm_alternative(self, locator: Tuple, alternative: Tuple, elapsed: float) -> Tuple:
+        """
+        Record the alternative that found a fallback locator's element and return the one to use
+        A non-primary alternative is only a heal if the primary is absent right now
+        """
+        primary = locator.alternatives[0]
+        if tuple(alternative) != tuple(primary) and self.driver.find_elements(*primary):
+            logger.info(f"Primary locator of {locator.key} found after {alternative}; not a heal")
+            alternative = primary
+        self.locator_repo.record_success(locator, alternative, elapsed)
+        return alternative
+    
     @log_action
     def find_element(self, locator: Tuple, timeout: int = None):
         """Find single element with explicit wait"""
         wait_time = timeout or Config.DEFAULT_TIMEOUT
         try:
+            requested = locator
+            locator = self.resolve_locator(locator, wait_time)
             element = WebDriverWait(self.driver, wait_time).until(
                 EC.presence_of_element_located(locator)
             )
+            self._elements.put(self.get_page_name(), requested, element)
             return element
         except TimeoutException:
             logger.error(f"Element not found: {locator}")
             raise
     
+    def _with_element(self, locator: Tuple, action, timeout: int = None):
+        """
+        Run action(element) on the cached handle for locator. A missing handle, or one that
+        raises StaleElementReferenceException, is a cache miss: the element is found again.
+        """
+        element = self._elements.get(self.get_page_name(), locator)
+        if element is not None:
+            try:
+                result = action(element)
+                self._elements.hits += 1
+                return result
+            except StaleElementReferenceException:
+                logger.debug(f"Stale cached element for {locator}")
+                self._elements.discard(self.get_page_name(), locator)
+        self._elements.misses += 1
+        try:
+            return action(self.find_element(locator, timeout))
+        except StaleElementReferenceException:
+            # Re-rendered between lookup and use - find it once more
+            return action(self.find_element(locator, timeout))
+    
+    def _wait_clickable(self, element: WebElement, timeout: int) -> WebElement:
+        """Wait until the element is displayed and enabled; unlike EC.element_to_be_clickable, staleness is raised"""
+        return WebDriverWait(self.driver, timeout).until(
+            lambda driver: element if element.is_displayed() and element.is_enabled() else False
+        )
+    
     @log_action
     def find_elements(self, locator: Tuple, timeout: int = None) -> List:
         """Find multiple elements with explicit wait"""
         wait_time = timeout or Config.DEFAULT_TIMEOUT
         try:
+            locator = self.resolve_locator(locator, wait_time)
             WebDriverWait(self.driver, wait_time).until(
                 EC.presence_of_element_located(locator)
             )
@@ -63,12 +236,10 @@ class BasePage(ABC):
     def click(self, locator: Tuple, timeout: int = None):
         """Click on element with wait for clickability"""
         wait_time = timeout or Config.DEFAULT_TIMEOUT
-        element = WebDriverWait(self.driver, wait_time).until(
-            EC.element_to_be_clickable(locator)
-        )
-        element.click()
+        self._with_element(locator, lambda element: self._wait_clickable(element, wait_time).click(), wait_time)
     
     @log_action
+    @memoized_read
     def get_text(self, locator: Tuple) -> str:
         """Get text from element"""
         element = self.find_element(locator)
@@ -79,6 +250,7 @@ class BasePage(ABC):
         """Check if element is visible"""
         wait_time = timeout or Config.DEFAULT_TIMEOUT
         try:
+            locator = self.resolve_locator(locator, wait_time)
             WebDriverWait(self.driver, wait_time).until(
                 EC.visibility_of_element_located(locator)
             )
@@ -91,6 +263,7 @@ class BasePage(ABC):
         """Check if element is present in DOM"""
         wait_time = timeout or Config.DEFAULT_TIMEOUT
         try:
+            locator = self.resolve_locator(locator, wait_time)
             WebDriverWait(self.driver, wait_time).until(
                 EC.presence_of_element_located(locator)
             )
@@ -101,8 +274,10 @@ class BasePage(ABC):
     @log_action
     def scroll_to_element(self, locator: Tuple):
         """Scroll element into view"""
-        element = self.find_element(locator)
-        self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        self._with_element(
+            locator,
+            lambda element: self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        )
     
     @log_action
     def wait_for_url_contains(self, url_part: str, timeout: int = None):
@@ -123,11 +298,13 @@ class BasePage(ABC):
     def wait_for_element_and_click(self, locator: Tuple, timeout: int = None):
         """Wait for element to be clickable and click it - useful for AJAX loaded elements"""
         wait_time = timeout or Config.DEFAULT_TIMEOUT
-        element = WebDriverWait(self.driver, wait_time).until(
-            EC.element_to_be_clickable(locator)
-        )
-        element.click()
-        return element
+        
+        def click_when_clickable(element):
+            element = self._wait_clickable(element, wait_time)
+            element.click()
+            return element
+        
+        return self._with_element(locator, click_when_clickable, wait_time)
     
     @log_action
     def dismiss_cookie_banner_if_present(self):
@@ -157,8 +334,129 @@ class BasePage(ABC):
         actions = ActionChains(self.driver)
         actions.move_to_element(element).perform()
     
+    def get_elements_state(self, locators: Dict[str, Tuple], scroll: bool = False,
+                           record: bool = True) -> Dict[str, Dict]:
+        """
+        Get presence, visibility, text and bounding box of named locators in one script call
+        With record=False the alternatives that matched are not recorded (see record_alternatives)
+        """
+        ordered = {}
+        for name, locator in locators.items():
+            if getattr(locator, "has_fallbacks", False):
+                ordered[name] = self.locator_repo.ordered_alternatives(locator)
+            else:
+                ordered[name] = [locator]
+        script_locators = {name: [to_script_locator(alternative) for alternative in alternatives]
+                           for name, alternatives in ordered.items()}
+        states = self.driver.execute_script(ELEMENTS_STATE_SCRIPT, script_locators, scroll)
+        
+        if record:
+            self.record_alternatives(locators, states, ordered)
+        return states
+    
+    def record_alternatives(self, locators: Dict[str, Tuple], states: Dict[str, Dict],
+                            ordered: Dict[str, List[Tuple]] = None, elapsed: float = 0):
+        """Record which alternative of each fallback locator matched in states from get_elements_state"""
+        for name, state in states.items():
+            locator = locators[name]
+            if not state["present"] or not getattr(locator, "has_fallbacks", False):
+                continue
+            alternatives = ordered[name] if ordered else self.locator_repo.ordered_alternatives(locator)
+            self._confirm_alternative(locator, alternatives[state["alternative"]], elapsed)
+    
+    @log_action
+    def wait_for_elements(self, locators: Dict[str, Tuple], required: Optional[Iterable[str]] = None,
+                          visible: bool = True, scroll: bool = False, timeout: int = None) -> Dict[str, Dict]:
+        """
+        Wait until every required locator is present (and visible) using batched state checks
+        Returns the last observed states, so callers can assert on whichever entries are unsatisfied
+        """
+        wait_time = timeout or Config.DEFAULT_TIMEOUT
+        required_names = list(required) if required is not None else list(locators)
+        last_states = {}
+        start = time.monotonic()
+        
+        def all_satisfied(driver):
+            # Alternatives are recorded once the wait is over, not on every poll
+            last_states.update(self.get_elements_state(locators, scroll=scroll, record=False))
+            for name in required_names:
+                state = last_states[name]
+                if not state["present"] or (visible and not state["visible"]):
+                    return False
+            return last_states
+        
+        try:
+            WebDriverWait(self.driver, wait_time).until(all_satisfied)
+        except TimeoutException:
+            missing = [name for name in required_names
+                       if not last_states.get(name, {}).get("visible" if visible else "present")]
+            logger.error(f"Elements not satisfied after {wait_time}s: {missing}")
+        self.record_alternatives(locators, last_states, elapsed=time.monotonic() - start)
+        return last_states
+    
+    @log_action
+    def take_snapshot(self, locator: Tuple = None) -> DomSnapshot:
+        """Capture the page (or the subtree under locator) once for local read-only queries"""
+        element = self.find_element(locator) if locator else None
+        self._snapshot = DomSnapshot.from_driver(self.driver, element)
+        return self._snapshot
+    
+    def get_snapshot(self) -> DomSnapshot:
+        """Return the current snapshot, capturing one if none is held (see invalidate_snapshot)"""
+        if self._snapshot is None:
+            return self.take_snapshot()
+        return self._snapshot
+    
+    def invalidate_snapshot(self):
+        """
+        Drop the held snapshot so the next read captures fresh page state
+        Memoized reads go too, as they may have been computed from the snapshot
+        """
+        self._snapshot = None
+        read_cache_for(self.driver).bump()
+    
+    def get_checkpoint_state(self) -> Dict:
+        """Page state (beyond URL and cookies) needed to resume after this page's last step"""
+        return {}
+    
+    def restore_checkpoint_state(self, state: Dict):
+        """Re-apply state captured by get_checkpoint_state after the URL was reloaded"""
+        pass
+    
+    def save_page_fixture(self):
+        """Save current page source as a locator profiler fixture (when enabled)"""
+        if not Config.SAVE_PAGE_FIXTURES:
+            return
+        fixture_path = Path(Config.PAGE_FIXTURE_DIR) / f"{self.get_page_name()}.html"
+        fixture_path.parent.mkdir(parents=True, exist_ok=True)
+        fixture_path.write_text(self.driver.page_source, encoding="utf-8")
+        logger.info(f"Page fixture saved: {fixture_path}")
+    
+    def check_visual(self, name: str, png: bytes):
+        """Compare a load-state capture with its baseline when visual regression is enabled"""
+        if not Config.VISUAL_REGRESSION:
+            return
+        from utils.visual_regression import visual_regression  # NumPy/Pillow only when enabled
+        
+        regions = [region for region in Config.VISUAL_IGNORE_REGIONS.get(name, []) if not isinstance(region, str)]
+        locator_names = [region for region in Config.VISUAL_IGNORE_REGIONS.get(name, []) if isinstance(region, str)]
+        if locator_names:
+            states = self.get_elements_state({locator_name: self.get_locator(locator_name)
+                                              for locator_name in locator_names})
+            regions += [[state["rect"]["x"], state["rect"]["y"], state["rect"]["width"], state["rect"]["height"]]
+                        for state in states.values() if state["rect"]]
+        
+        # Regions are CSS pixels, the screenshot has device pixels
+        scale = self.driver.execute_script(DEVICE_PIXEL_RATIO_SCRIPT) or 1
+        result = visual_regression.compare(name, png, browser=BrowserConfig.of(self.driver).name,
+                                           ignore_regions=regions, scale=scale)
+        if result.diff_path:
+            allure.attach.file(result.diff_path, name=f"{name}_visual_diff",
+                               attachment_type=allure.attachment_type.PNG)
+        assert result.passed, f"Visual regression: {result.describe()}"
+    
     def get_current_url(self) -> str:
-        """Get current page URL"""
+        """Get current page URL (never memoized: redirects and script navigations send no driver command)"""
         return self.driver.current_url
 
 
@@ -177,6 +475,7 @@ class LoadableComponent(BasePage):
     
     def get(self):
         """Load and verify the page"""
+        self.invalidate_snapshot()
         self.load()
         self.is_loaded()
         return self
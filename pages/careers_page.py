@@ -26,36 +26,28 @@ class CareersPage(LoadableComponent):
             assert "careers" in self.get_current_url().lower(), \
                 "URL does not contain 'careers'"
             
-            # Verify all three blocks
-            self._verify_locations_block()
-            self._verify_teams_block()
-            self._verify_life_at_insider_block()
+            # Verify all three blocks in one batched check
+            self._verify_blocks()
             
+            screenshot = self.driver.get_screenshot_as_png()
             allure.attach(
-                self.driver.get_screenshot_as_png(),
+                screenshot,
                 name="careers_page_loaded",
                 attachment_type=allure.attachment_type.PNG
             )
+            self.check_visual("careers_page_loaded", screenshot)
+            self.save_page_fixture()
         except AssertionError as e:
             raise AssertionError(f"Careers page verification failed: {str(e)}")
     
-    def _verify_locations_block(self):
-        """Verify Locations block is visible"""
-        locations_locator = self.get_locator("locations_block")
-        self.scroll_to_element(locations_locator)
-        assert self.is_element_visible(locations_locator), \
-            "Locations block is not visible"
-    
-    def _verify_teams_block(self):
-        """Verify Teams block is visible"""
-        teams_locator = self.get_locator("teams_block")
-        self.scroll_to_element(teams_locator)
-        assert self.is_element_visible(teams_locator), \
-            "Teams block is not visible"
-    
-    def _verify_life_at_insider_block(self):
-        """Verify Life at Insider block is visible"""
-        life_locator = self.get_locator("life_at_insider_block")
-        self.scroll_to_element(life_locator)
-        assert self.is_element_visible(life_locator), \
-            "Life at Insider block is not visible"
+    def _verify_blocks(self):
+        """Verify Locations, Teams and Life at Insider blocks are visible"""
+        blocks = {
+            "Locations": self.get_locator("locations_block"),
+            "Teams": self.get_locator("teams_block"),
+            "Life at Insider": self.get_locator("life_at_insider_block"),
+        }
+        states = self.wait_for_elements(blocks, scroll=True)
+        
+        for block_name, state in states.items():
+            assert state["visible"], f"{block_name} block is not visible"
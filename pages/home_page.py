@@ -33,11 +33,14 @@ class HomePage(LoadableComponent):
             assert self.is_element_visible(company_menu_locator, timeout=10), \
                 "Company menu not visible on home page"
             
+            screenshot = self.driver.get_screenshot_as_png()
             allure.attach(
-                self.driver.get_screenshot_as_png(),
+                screenshot,
                 name="home_page_loaded",
                 attachment_type=allure.attachment_type.PNG
             )
+            self.check_visual("home_page_loaded", screenshot)
+            self.save_page_fixture()
         except AssertionError as e:
             raise AssertionError(f"Home page failed to load: {str(e)}")
     
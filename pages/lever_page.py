@@ -28,11 +28,14 @@ class LeverPage(LoadableComponent):
             assert self.is_element_visible(form_locator, timeout=10), \
                 "Application form not visible"
             
+            screenshot = self.driver.get_screenshot_as_png()
             allure.attach(
-                self.driver.get_screenshot_as_png(),
+                screenshot,
                 name="lever_application_page",
                 attachment_type=allure.attachment_type.PNG
             )
+            self.check_visual("lever_application_page", screenshot)
+            self.save_page_fixture()
         
         except AssertionError as e:
             raise AssertionError(f"Lever page verification failed: {str(e)}")
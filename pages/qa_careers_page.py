@@ -1,24 +1,135 @@
 """QA Careers page with job filtering functionality"""
 import allure
 import logging
+import uuid
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 from selenium.webdriver.common.by import By
-from pages.base_page import LoadableComponent
+from pages.base_page import LoadableComponent, to_script_locator
 from utils.decorators import allure_step, screenshot_on_failure
+from utils.job_catalog import JobCatalog
+from utils.read_cache import memoized_read, register_read_only_script
 from config.config import Config
-from typing import List, Dict
+from typing import Dict, Iterator, List
 
 logger = logging.getLogger(__name__)
 
 
+_QUERY_ALL_JS = """
+function queryAll(root, strategy, value) {
+    if (strategy === 'xpath') {
+        var result = document.evaluate(value, root, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < result.snapshotLength; i++) {
+            nodes.push(result.snapshotItem(i));
+        }
+        return nodes;
+    }
+    return Array.prototype.slice.call(root.querySelectorAll(value));
+}
+"""
+
+# The text of a card field, the same for the catalog and the listings: what the browser
+# renders (innerText, which equals textContent only for a card that is not rendered)
+_FIELD_TEXT_JS = """
+function fieldText(card, locator) {
+    var el = queryAll(card, locator[0], locator[1])[0];
+    return el ? (el.innerText || '').trim() : '';
+}
+"""
+
+# Reads every job card in the DOM (hidden ones included) with its field texts and
+# data attributes in a single round-trip
+JOB_CATALOG_SCRIPT = register_read_only_script(_QUERY_ALL_JS + _FIELD_TEXT_JS + """
+var list = arguments[0];
+var fields = arguments[1];
+
+return queryAll(document, list[0], list[1]).map(function (card) {
+    var job = {
+        data_location: card.getAttribute('data-location') || '',
+        data_team: card.getAttribute('data-team') || ''
+    };
+    for (var name in fields) {
+        job[name] = fieldText(card, fields[name]);
+    }
+    return job;
+});
+""")
+
+# Reads one chunk of the displayed (rendered) job cards: field texts, plus the card element
+# when requested. The first chunk (start 0) stores the ordered card list in the page under
+# the reader's token and later chunks page through that list, so each card is queried once
+# and a DOM update between chunks cannot shift the offsets. Returns the total card count so
+# the caller knows when to stop, or null when the stored list is gone (navigation) or a card
+# was removed from the page.
+JOB_LISTINGS_CHUNK_SCRIPT = register_read_only_script(_QUERY_ALL_JS + _FIELD_TEXT_JS + """
+var list = arguments[0];
+var fields = arguments[1];
+var token = arguments[2];
+var start = arguments[3];
+var count = arguments[4];
+var withElements = arguments[5];
+
+if (start === 0) {
+    window.__jobListings = {
+        token: token,
+        cards: queryAll(document, list[0], list[1]).filter(function (card) {
+            return card.getClientRects().length > 0;
+        })
+    };
+}
+var listings = window.__jobListings;
+if (!listings || listings.token !== token) {
+    return null;
+}
+var cards = listings.cards;
+var chunk = cards.slice(start, start + count);
+if (chunk.some(function (card) { return !card.isConnected; })) {
+    return null;
+}
+if (start + count >= cards.length) {
+    delete window.__jobListings;
+}
+var jobs = chunk.map(function (card) {
+    var job = {};
+    for (var name in fields) {
+        job[name] = fieldText(card, fields[name]);
+    }
+    if (withElements) {
+        job.element = card;
+    }
+    return job;
+});
+return {total: cards.length, jobs: jobs};
+""")
+
+
 class QACareersPage(LoadableComponent):
     """QA Careers page with job filtering"""
     
+    def __init__(self, driver):
+        super().__init__(driver)
+        self._filters = {}
+    
     def get_page_name(self) -> str:
         return "QACareersPage"
     
+    def get_checkpoint_state(self) -> Dict:
+        """Filter selections are client-side and lost on reload, so they are part of the checkpoint"""
+        return {"filters": dict(self._filters)}
+    
+    def restore_checkpoint_state(self, state: Dict):
+        """Re-apply recorded filter selections"""
+        filters = state.get("filters", {})
+        if "location" in filters:
+            self.filter_by_location(filters["location"], exact=filters.get("location_exact", False))
+        if "department" in filters:
+            self.filter_by_department(filters["department"], exact=filters.get("department_exact", False))
+    
     @allure_step("Navigate to QA Careers page")
     def load(self):
         """Navigate directly to QA careers page"""
+        self._filters = {}
         self.driver.get(Config.CAREERS_QA_URL)
     
     @allure_step("Verify QA Careers page is loaded")
@@ -42,6 +153,7 @@ class QACareersPage(LoadableComponent):
         see_all_jobs_locator = self.get_locator("see_all_jobs_btn")
         self.scroll_to_element(see_all_jobs_locator)
         self.click(see_all_jobs_locator)
+        self.invalidate_snapshot()
         
         # Wait for transition/page load
         import time
@@ -64,10 +176,20 @@ class QACareersPage(LoadableComponent):
     
     @allure_step("Filter jobs by location: {location}")
     @screenshot_on_failure
-    def filter_by_location(self, location: str):
-        """Filter jobs by location using Select2 dropdown with polling"""
+    def filter_by_location(self, location: str, exact: bool = False):
+        """
+        Filter jobs by location using Select2 dropdown with polling
+        The option is matched by substring, or by its whole text with exact=True
+        """
         import time
         
+        option_name = "location_option_exact" if exact else "location_option"
+        if Config.NETWORK_MODE == "replay":
+            self._select_replayed_option("location_filter", "location_dropdown_options",
+                                         self.get_locator(option_name, location=location))
+            self._set_filter("location", location, exact)
+            return
+        
         # Poll for dropdown options to load (AJAX can take a long time)
         max_wait = 300  # 5 minutes total
         poll_interval = 30  # Check every 30 seconds
@@ -75,7 +197,7 @@ class QACareersPage(LoadableComponent):
         
         location_filter_locator = self.get_locator("location_filter")
         options_locator = self.get_locator("location_dropdown_options")
-        specific_option_locator = self.get_locator("location_option", location=location)
+        specific_option_locator = self.get_locator(option_name, location=location)
         
         # Scroll to filter element
         self.scroll_to_element(location_filter_locator)
@@ -130,13 +252,26 @@ class QACareersPage(LoadableComponent):
         
         # Wait for filter to apply
         time.sleep(2)
+        self.invalidate_snapshot()
+        self._set_filter("location", location, exact)
     
     @allure_step("Filter jobs by department: {department}")
     @screenshot_on_failure
-    def filter_by_department(self, department: str):
-        """Filter jobs by department using Select2 dropdown with polling"""
+    def filter_by_department(self, department: str, exact: bool = False):
+        """
+        Filter jobs by department using Select2 dropdown with polling
+        The option is matched by substring, or by its whole text with exact=True
+        """
         import time
         
+        option_name = "department_option_exact" if exact else "department_option"
+        if Config.NETWORK_MODE == "replay":
+            self._select_replayed_option("department_filter", "department_dropdown_options",
+                                         self.get_locator(option_name, department=department),
+                                         save_fixture=True)
+            self._set_filter("department", department, exact)
+            return
+        
         # Poll for dropdown options to load (AJAX can take a long time)
         max_wait = 300  # 5 minutes total
         poll_interval = 30  # Check every 30 seconds
@@ -144,7 +279,7 @@ class QACareersPage(LoadableComponent):
         
         department_filter_locator = self.get_locator("department_filter")
         options_locator = self.get_locator("department_dropdown_options")
-        specific_option_locator = self.get_locator("department_option", department=department)
+        specific_option_locator = self.get_locator(option_name, department=department)
         
         # Scroll to filter element
         self.scroll_to_element(department_filter_locator)
@@ -161,6 +296,9 @@ class QACareersPage(LoadableComponent):
                 
                 # Check if dropdown options are loaded
                 if self.is_element_visible(options_locator, timeout=5):
+                    # Capture job list with the dropdown open for the locator profiler
+                    self.save_page_fixture()
+                    
                     # Options are loaded, try to click the specific one
                     try:
                         self.scroll_to_element(specific_option_locator)
@@ -200,12 +338,71 @@ class QACareersPage(LoadableComponent):
         
         # Wait for filter to apply
         time.sleep(2)
+        self.invalidate_snapshot()
+        self._set_filter("department", department, exact)
+    
+    def _set_filter(self, name: str, value: str, exact: bool):
+        """Remember a filter selection for checkpoints"""
+        self._filters[name] = value
+        self._filters[f"{name}_exact"] = exact
+    
+    def _select_replayed_option(self, filter_name: str, options_name: str, option_locator, save_fixture: bool = False):
+        """
+        Pick a Select2 filter option when the filter calls are replayed from fixtures
+        The options and the filtered list arrive within milliseconds, so this waits on the
+        options and then on the replayed requests instead of sleeping and polling
+        """
+        from utils.network_replay import network
+        
+        filter_locator = self.get_locator(filter_name)
+        # No waiting for a banner that is usually gone by now; only close one that is showing
+        for button in self.driver.find_elements(*self.get_locator("cookie_accept_btn")):
+            if button.is_displayed():
+                button.click()
+        
+        self.scroll_to_element(filter_locator)
+        self.click(filter_locator)
+        assert self.is_element_visible(self.get_locator(options_name)), \
+            f"Replayed {filter_name} options did not appear"
+        if save_fixture:
+            self.save_page_fixture()
+        self.scroll_to_element(option_locator)
+        self.wait_for_element_and_click(option_locator)
+        network.wait_until_idle(self.driver)
+        self.invalidate_snapshot()
+    
+    @allure_step("Open all open positions")
+    @screenshot_on_failure
+    def open_all_positions(self):
+        """Open the open positions list without the department preselected by 'See all QA jobs'"""
+        self._filters = {}
+        self.driver.get(Config.CAREERS_OPEN_POSITIONS_URL)
+        self.invalidate_snapshot()
+        
+        job_list_locator = self.get_locator("job_list")
+        assert self.is_element_visible(job_list_locator, timeout=60), \
+            "Job listings did not load on the open positions page"
+        self.dismiss_cookie_banner_if_present()
     
     @allure_step("Get all job listings")
-    def get_job_listings(self) -> List[Dict[str, str]]:
-        """Get all job listings with their details"""
+    @memoized_read
+    def get_job_listings(self, from_snapshot: bool = False) -> List[Dict[str, str]]:
+        """
+        Get all displayed job listings with their details - the cards the browser renders,
+        as in iter_job_listings and verify_job_listings
+        Live records carry the card as 'element'. With from_snapshot=True the texts are read
+        from a local DOM snapshot (no per-element driver calls) and records carry no 'element'
+        """
+        if not from_snapshot:
+            jobs = list(self.iter_job_listings(with_elements=True))
+            self._attach_job_summary(jobs, len(jobs))
+            return jobs
+        
         job_list_locator = self.get_locator("job_list")
-        job_elements = self.find_elements(job_list_locator)
+        if not self.is_element_present(job_list_locator):
+            return []
+        job_elements = [element for element in self.get_snapshot().find_elements(*job_list_locator)
+                        if element.is_displayed()]
         
         jobs = []
         for job_elem in job_elements:
@@ -217,37 +414,124 @@ class QACareersPage(LoadableComponent):
                 jobs.append({
                     'position': position,
                     'department': department,
-                    'location': location,
-                    'element': job_elem
+                    'location': location
                 })
             except Exception as e:
                 continue
         
+        self._attach_job_summary(jobs, len(jobs))
+        
+        return jobs
+    
+    def iter_job_listings(self, chunk_size: int = None, with_elements: bool = False) -> Iterator[Dict]:
+        """
+        Yield the displayed job listings, reading them from the page chunk_size cards per script call
+        The ordered card list is fixed by the first call and paged through by the later ones.
+        Only one chunk is held at a time, and a consumer that stops early (e.g. on the first
+        mismatch) skips the remaining calls. with_elements adds each card as a live 'element'.
+        Raises StaleElementReferenceException if the page navigates or drops a card meanwhile.
+        """
+        chunk_size = chunk_size or Config.JOB_LISTING_CHUNK_SIZE
+        job_list_locator = self.get_locator("job_list")
+        if not self.is_element_present(job_list_locator):
+            return
+        
+        list_locator = to_script_locator(job_list_locator)
+        fields = {
+            field: to_script_locator(self.get_locator(f"job_{field}"))
+            for field in ("position", "department", "location")
+        }
+        token = uuid.uuid4().hex
+        start = 0
+        while True:
+            chunk = self.driver.execute_script(JOB_LISTINGS_CHUNK_SCRIPT, list_locator, fields,
+                                               token, start, chunk_size, with_elements)
+            if chunk is None:
+                raise StaleElementReferenceException(f"Job list changed after {start} listings were read")
+            yield from chunk["jobs"]
+            start += len(chunk["jobs"])
+            if not chunk["jobs"] or start >= chunk["total"]:
+                return
+    
+    def _attach_job_summary(self, jobs: List[Dict], total: int, name: str = "job_listings"):
+        """Attach up to Config.JOB_LISTING_ATTACHMENT_LIMIT jobs as text lines, with a count of the rest"""
+        limit = Config.JOB_LISTING_ATTACHMENT_LIMIT
+        lines = [f"{total} jobs"]
+        lines += [f"{idx}. {job['position']} | {job['department']} | {job['location']}"
+                  for idx, job in enumerate(jobs[:limit], 1)]
+        if total > limit:
+            lines.append(f"... and {total - limit} more")
         allure.attach(
-            str(jobs),
-            name="job_listings",
+            "\n".join(lines),
+            name=name,
             attachment_type=allure.attachment_type.TEXT
         )
+    
+    @allure_step("Extract job catalog")
+    def get_job_catalog(self, timeout: int = None) -> JobCatalog:
+        """
+        Extract the complete job list, before any filter is applied, into an indexed catalog
+        Call on the unfiltered list (see open_all_positions). Cards are read in one script call
+        once their count stops changing (the list loads via AJAX); a count still changing at
+        the timeout raises TimeoutException rather than returning a partial catalog.
+        """
+        timeout = timeout or Config.DEFAULT_TIMEOUT
+        list_locator = to_script_locator(self.get_locator("job_list"))
+        fields = {
+            field: to_script_locator(self.get_locator(f"job_{field}"))
+            for field in ("position", "department", "location")
+        }
         
-        return jobs
+        import time
+        records, previous_count, settled = [], -1, False
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            records = self.driver.execute_script(JOB_CATALOG_SCRIPT, list_locator, fields)
+            if records and len(records) == previous_count:
+                settled = True
+                break
+            previous_count = len(records)
+            time.sleep(1)
+        if not settled:
+            raise TimeoutException(f"Job list did not settle within {timeout}s "
+                                   f"({len(records)} cards at the last read); the catalog would be partial")
+        
+        catalog = JobCatalog.from_records(records)
+        logger.info(f"Job catalog: {len(catalog)} jobs, {len(catalog.combinations())} location/department combinations")
+        allure.attach(
+            catalog.to_json(),
+            name="job_catalog",
+            attachment_type=allure.attachment_type.JSON
+        )
+        return catalog
     
     @allure_step("Verify job listings contain expected values")
     def verify_job_listings(self, expected_position: str, expected_department: str, expected_location: str):
-        """Verify all jobs match expected criteria"""
-        jobs = self.get_job_listings()
-        
-        assert len(jobs) > 0, "No jobs found in the list"
-        
-        for idx, job in enumerate(jobs, 1):
-            with allure.step(f"Verify Job #{idx}: {job['position']}"):
+        """
+        Verify all jobs match expected criteria
+        Listings are streamed in chunks and checking stops at the first mismatch; the jobs
+        checked so far are attached as a capped summary either way.
+        """
+        verified = []
+        count = passed = 0
+        try:
+            for count, job in enumerate(self.iter_job_listings(), 1):
                 assert expected_position.lower() in job['position'].lower(), \
-                    f"Job {idx}: Position '{job['position']}' does not contain '{expected_position}'"
+                    f"Job {count}: Position '{job['position']}' does not contain '{expected_position}'"
                 
                 assert expected_department.lower() in job['department'].lower(), \
-                    f"Job {idx}: Department '{job['department']}' does not contain '{expected_department}'"
+                    f"Job {count}: Department '{job['department']}' does not contain '{expected_department}'"
                 
                 assert expected_location.lower() in job['location'].lower(), \
-                    f"Job {idx}: Location '{job['location']}' does not contain '{expected_location}'"
+                    f"Job {count}: Location '{job['location']}' does not contain '{expected_location}'"
+                
+                passed = count
+                if len(verified) < Config.JOB_LISTING_ATTACHMENT_LIMIT:
+                    verified.append(job)
+        finally:
+            self._attach_job_summary(verified, passed, name="verified_job_listings")
+        
+        assert count > 0, "No jobs found in the list"
     
     @allure_step("Click 'View Role' button for first job")
     @screenshot_on_failure
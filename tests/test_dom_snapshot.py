@@ -0,0 +1,70 @@
+import pytest
+import allure
+from pathlib import Path
+from selenium.webdriver.common.by import By
+from locators.locator_repository import locator_repo
+from utils.dom_snapshot import DomSnapshot, HIDDEN_ATTRIBUTE
+
+SAVED_PAGE = Path(__file__).parent / "pages" / "job_list.html"
+
+FIELDS = ("job_position", "job_department", "job_location")
+
+
+@allure.feature("DOM Snapshot")
+class TestDomSnapshotParity:
+    """
+    The snapshot answers the same as live WebDriver on a saved copy of the job list,
+    whose cards are hidden by stylesheet class, attribute and inline style
+    """
+
+    @pytest.fixture
+    def saved_page(self, driver):
+        driver.get(SAVED_PAGE.resolve().as_uri())
+        return driver
+
+    def test_find_elements_and_is_displayed_match_webdriver(self, saved_page):
+        # Arrange
+        job_list = locator_repo.get("QACareersPage", "job_list")
+
+        # Act
+        live = saved_page.find_elements(*job_list)
+        snapshot = DomSnapshot.from_driver(saved_page).find_elements(*job_list)
+
+        # Assert
+        assert len(snapshot) == len(live)
+        assert [element.is_displayed() for element in snapshot] == [element.is_displayed() for element in live]
+        assert [element.get_attribute("data-location") for element in snapshot] == \
+            [element.get_attribute("data-location") for element in live]
+
+    def test_text_matches_webdriver(self, saved_page):
+        # Arrange
+        job_list = locator_repo.get("QACareersPage", "job_list")
+
+        # Act
+        live_cards = saved_page.find_elements(*job_list)
+        snapshot_cards = DomSnapshot.from_driver(saved_page).find_elements(*job_list)
+
+        # Assert
+        for index, (live, snapshot) in enumerate(zip(live_cards, snapshot_cards)):
+            assert snapshot.text == live.text, f"Card {index} text differs"
+            for field in FIELDS:
+                locator = locator_repo.get("QACareersPage", field)
+                live_fields = live.find_elements(*locator)
+                snapshot_fields = snapshot.find_elements(*locator)
+                assert [element.text for element in snapshot_fields] == [element.text for element in live_fields], \
+                    f"Card {index} {field} text differs"
+
+    def test_snapshot_leaves_the_page_unchanged(self, saved_page):
+        # Arrange
+        saved_page.execute_script("""
+            window.__mutations = 0;
+            new MutationObserver(function (records) { window.__mutations += records.length; })
+                .observe(document, {attributes: true, childList: true, subtree: true});
+        """)
+
+        # Act
+        DomSnapshot.from_driver(saved_page)
+
+        # Assert
+        assert saved_page.execute_script("return window.__mutations;") == 0
+        assert saved_page.find_elements(By.CSS_SELECTOR, f"[{HIDDEN_ATTRIBUTE}]") == []
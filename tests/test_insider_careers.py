@@ -4,6 +4,8 @@ from pages.home_page import HomePage
 from pages.careers_page import CareersPage
 from pages.qa_careers_page import QACareersPage
 from pages.lever_page import LeverPage
+from config.config import Config
+from utils.job_catalog import normalize
 
 
 @allure.feature("Insider Careers")
@@ -88,8 +90,8 @@ class TestInsiderCareers:
         qa_page.filter_by_location("Istanbul, Turkiye")
         qa_page.filter_by_department("Quality Assurance")
         
-        # Act
-        jobs = qa_page.get_job_listings()
+        # Act - read all listings from one local DOM snapshot
+        jobs = qa_page.get_job_listings(from_snapshot=True)
         
         # Assert
         assert len(jobs) > 0, "No jobs found to verify"
@@ -203,4 +205,39 @@ class TestInsiderCareers:
             f"Lever redirect failed. Current URL: {current_url}"
         
         allure.attach(current_url, name="Final Lever URL",
-                     attachment_type=allure.attachment_type.TEXT)
\ No newline at end of file
+                     attachment_type=allure.attachment_type.TEXT)
+    
+    
+    @pytest.mark.parametrize("sample", range(Config.CATALOG_SAMPLE_SIZE))
+    def test_07_filters_match_job_catalog(self, driver, job_catalog, sample):
+        """
+        Data-driven: apply a sampled location/department combination in the UI and
+        verify the filtered list equals the catalog's answer for the same filters
+        """
+        # Arrange
+        combinations = job_catalog.sample_combinations(Config.CATALOG_SAMPLE_SIZE)
+        if sample >= len(combinations):
+            pytest.skip(f"Catalog has only {len(combinations)} filter combinations")
+        location, department = combinations[sample]
+        expected = sorted(job.key() for job in job_catalog.query(location=location, department=department))
+        
+        qa_page = QACareersPage(driver)
+        qa_page.get()
+        qa_page.click_see_all_jobs()
+        
+        # Act
+        qa_page.filter_by_location(location, exact=True)
+        qa_page.filter_by_department(department, exact=True)
+        # Read like the catalog: rendered text of the displayed cards
+        jobs = qa_page.get_job_listings()
+        
+        # Assert
+        actual = sorted(
+            (normalize(job['position']), normalize(job['department']), normalize(job['location']))
+            for job in jobs
+        )
+        assert actual == expected, \
+            f"Filter '{location}' / '{department}' shows {len(actual)} jobs, catalog has {len(expected)}"
+        
+        allure.attach(f"{location} / {department}: {len(actual)} jobs", name="Filter Combination",
+                     attachment_type=allure.attachment_type.TEXT)
@@ -0,0 +1,63 @@
+import pytest
+
+
+@pytest.fixture(scope="function", autouse=True)
+def test_setup():
+    """Unit tests need no browser: replaces the suite's driver-bound auto-fixture"""
+    yield
+
+
+class FakeDriver:
+    """
+    Stand-in WebDriver that answers commands from responses (command name -> value, or a
+    callable of the command parameters), and every other command with an empty response
+    """
+
+    def __init__(self, responses=None):
+        self.commands = []
+        self.responses = dict(responses or {})
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        response = self.responses.get(driver_command)
+        if callable(response):
+            response = response(params or {})
+        return {"value": response}
+
+    def get(self, url):
+        self.execute("get", {"url": url})
+
+    @property
+    def current_url(self):
+        return self.execute("getCurrentUrl")["value"]
+
+    @property
+    def current_window_handle(self):
+        return self.execute("w3cGetCurrentWindowHandle")["value"]
+
+    @property
+    def window_handles(self):
+        return self.execute("w3cGetWindowHandles")["value"] or []
+
+    def get_cookies(self):
+        return self.execute("getAllCookies")["value"] or []
+
+    def delete_all_cookies(self):
+        self.execute("deleteAllCookies")
+
+    def add_cookie(self, cookie):
+        self.execute("addCookie", {"cookie": cookie})
+
+    def refresh(self):
+        self.execute("refresh")
+
+    def find_elements(self, by, value):
+        return self.execute("findElements", {"using": by, "value": value})["value"] or []
+
+    def execute_script(self, script, *args):
+        return self.execute("w3cExecuteScript", {"script": script, "args": list(args)})["value"]
+
+
+@pytest.fixture
+def fake_driver():
+    return FakeDriver()
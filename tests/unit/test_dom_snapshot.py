@@ -0,0 +1,22 @@
+from pathlib import Path
+from utils.dom_snapshot import DomSnapshot, HIDDEN_ATTRIBUTE
+
+SAVED_PAGE = Path(__file__).parent.parent / "pages" / "job_list.html"
+
+
+def test_text_breaks_lines_only_at_blocks_and_br():
+    snapshot = DomSnapshot(SAVED_PAGE.read_text())
+    titles = [element.text for element in snapshot.find_elements("css selector", ".position-title")]
+    locations = [element.text for element in snapshot.find_elements("css selector", ".position-location")]
+
+    assert titles[:2] == ["Senior Software QA Engineer", "QA Engineer"]
+    assert locations[1] == "Istanbul, Turkiye\nHybrid"
+
+
+def test_marked_elements_and_their_descendants_are_not_displayed():
+    source = SAVED_PAGE.read_text().replace('class="position-list-item filtered-out"',
+                                            f'class="position-list-item filtered-out" {HIDDEN_ATTRIBUTE}')
+    cards = DomSnapshot(source).find_elements("css selector", ".position-list-item")
+
+    assert [card.is_displayed() for card in cards] == [True, True, False, False, True, False]
+    assert cards[2].find_element("css selector", ".position-title").text == ""
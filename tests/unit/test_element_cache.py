@@ -0,0 +1,28 @@
+from pages.home_page import HomePage
+from pages.qa_careers_page import QACareersPage
+from utils.element_cache import ElementCache
+
+
+def _listeners(driver, listener_type):
+    return [listener for listener in driver.execute.listeners if isinstance(listener, listener_type)]
+
+
+def test_page_objects_share_one_element_cache(fake_driver):
+    """Building many page objects on one driver attaches a single cache listener"""
+    pages = [page_type(fake_driver) for _ in range(1000) for page_type in (HomePage, QACareersPage)]
+
+    assert len(_listeners(fake_driver, ElementCache)) == 1
+    assert len(fake_driver.execute.listeners) == 1  # the read cache is attached on first memoized read
+    assert all(page._elements is pages[0]._elements for page in pages)
+
+
+def test_element_cache_entries_are_keyed_by_page(fake_driver):
+    home_page, qa_page = HomePage(fake_driver), QACareersPage(fake_driver)
+    locator = ("css selector", "#wt-cli-accept-all-btn")
+
+    home_page._elements.put(home_page.get_page_name(), locator, "home element")
+
+    assert qa_page._elements.get(qa_page.get_page_name(), locator) is None
+    assert qa_page._elements.get(home_page.get_page_name(), locator) == "home element"
+    fake_driver.execute("get", {"url": "https://useinsider.com/"})
+    assert home_page._elements.get(home_page.get_page_name(), locator) is None
@@ -0,0 +1,51 @@
+import json
+import pytest
+from locators.locator_repository import LocatorRepository
+from pages.home_page import HomePage
+
+PRIMARY = ["css selector", "#company"]
+FALLBACK = ["xpath", "//a[text()='Company']"]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    locator_file = tmp_path / "locators.json"
+    locator_file.write_text(json.dumps({"HomePage": {"company_menu": [PRIMARY, FALLBACK]}}))
+    return LocatorRepository(str(locator_file), str(tmp_path / "cache.json"))
+
+
+def _page(driver, repo):
+    page = HomePage(driver)
+    page.locator_repo = repo
+    return page
+
+
+def _state(alternative):
+    return {"present": alternative >= 0, "visible": alternative >= 0, "text": "", "rect": None,
+            "alternative": alternative}
+
+
+def test_wait_for_elements_records_a_heal_once(fake_driver, repo):
+    """Polls that find the fallback record one heal when the wait ends, not one per poll"""
+    polls = iter([-1, -1, 1])
+    fake_driver.responses["w3cExecuteScript"] = lambda params: {"company_menu": _state(next(polls))}
+    fake_driver.responses["findElements"] = []
+    page = _page(fake_driver, repo)
+
+    page.wait_for_elements({"company_menu": page.get_locator("company_menu")}, timeout=5)
+
+    assert [heal["count"] for heal in repo.cache.heals] == [1]
+    assert repo.cache.get_winner("HomePage.company_menu") == tuple(FALLBACK)
+
+
+def test_cached_fallback_gives_way_to_a_present_primary(fake_driver, repo):
+    """A batched lookup that matched the cached fallback records the primary when it is back"""
+    repo.cache.record("HomePage.company_menu", FALLBACK, PRIMARY, 0)
+    fake_driver.responses["w3cExecuteScript"] = {"company_menu": _state(0)}  # the winner is tried first
+    fake_driver.responses["findElements"] = ["primary element"]
+    page = _page(fake_driver, repo)
+
+    page.get_elements_state({"company_menu": page.get_locator("company_menu")})
+
+    assert repo.cache.get_winner("HomePage.company_menu") == tuple(PRIMARY)
+    assert repo.ordered_alternatives(page.get_locator("company_menu"))[0] == tuple(PRIMARY)
@@ -0,0 +1,49 @@
+from selenium.webdriver.common.by import By
+from locators.locator_profiler import stable_href_part, static_findings, suggest_alternatives, xpath_to_css
+from utils.dom_snapshot import DomSnapshot
+
+PAGE = """
+<html><body><div id="jobs">
+  <div class="position-list-item" data-team="qualityassurance">
+    <a class="btn view-role" href="https://jobs.lever.co/useinsider/5f2b6a3e-1c2d-4e5f-8a9b-0c1d2e3f4a5b">View Role</a>
+  </div>
+  <div class="position-list-item" data-team="qualityassurance">
+    <a class="btn view-role" href="https://jobs.lever.co/useinsider/0a1b2c3d-4e5f-6a7b-8c9d-0e1f2a3b4c5d">View Role</a>
+  </div>
+  <a class="btn" href="/careers/open-positions/?department=qualityassurance">See all QA jobs</a>
+</div></body></html>
+"""
+
+
+def test_href_anchor_skips_record_ids_and_queries():
+    assert stable_href_part("https://jobs.lever.co/useinsider/5f2b6a3e-1c2d-4e5f-8a9b-0c1d2e3f4a5b") == "useinsider"
+    assert stable_href_part("https://jobs.lever.co/useinsider/12345/apply") == "apply"
+    assert stable_href_part("https://useinsider.com/careers/open-positions/?department=qa") == "open-positions"
+    assert stable_href_part("https://jobs.lever.co/") == "jobs.lever.co"
+    assert stable_href_part("?department=qa") is None
+
+
+def test_suggestions_anchor_on_stable_href_parts():
+    snapshot = DomSnapshot(PAGE)
+
+    suggestions = suggest_alternatives(snapshot, (By.XPATH, "//a[contains(text(),'View Role')]"), limit=5)
+
+    assert "a[href*='useinsider']" in suggestions
+    assert not any("5f2b6a3e" in suggestion or "?" in suggestion for suggestion in suggestions)
+
+
+def test_class_equality_converts_to_a_whole_attribute_match():
+    css = xpath_to_css("//ul[@class='select2-results__options']//li")
+    snapshot = DomSnapshot("<ul class='select2-results__options extra'><li>a</li></ul>")
+
+    assert css == "ul[class='select2-results__options'] li"
+    assert snapshot.find_elements(By.CSS_SELECTOR, css) == []  # as the XPath: an extra class breaks it
+    assert snapshot.find_elements(By.XPATH, "//ul[@class='select2-results__options']//li") == []
+
+
+def test_css_equivalent_finding_is_exact():
+    findings = {finding.rule: finding.message
+                for finding in static_findings("options", By.XPATH, "//div[@class='a b']//span[@data-team='qa']")}
+
+    assert findings["css-equivalent"] == "expressible as CSS: div[class='a b'] span[data-team='qa']"
+    assert "class-equals" in findings
@@ -0,0 +1,122 @@
+import json
+import shutil
+import subprocess
+import pytest
+from utils.network_replay import NetworkInterceptor
+
+# Runs the shim in record mode against a stub XMLHttpRequest and prints the recorded request keys
+_KEYS_HARNESS = """
+var store = {};
+globalThis.sessionStorage = {
+    getItem: function (key) { return key in store ? store[key] : null; },
+    setItem: function (key, value) { store[key] = String(value); }
+};
+globalThis.location = {href: 'https://useinsider.com/careers/'};
+globalThis.window = globalThis;
+function XMLHttpRequest() { this.listeners = []; }
+XMLHttpRequest.prototype.open = function () {};
+XMLHttpRequest.prototype.send = function () {
+    this.status = 200;
+    this.responseType = '';
+    this.responseText = '{}';
+    this.listeners.forEach(function (listener) { listener(); });
+};
+XMLHttpRequest.prototype.addEventListener = function (type, listener) { this.listeners.push(listener); };
+XMLHttpRequest.prototype.getResponseHeader = function () { return 'application/json'; };
+globalThis.XMLHttpRequest = XMLHttpRequest;
+
+__SHIM__
+
+__REQUESTS__.forEach(function (request) {
+    var xhr = new XMLHttpRequest();
+    xhr.open(request[0], request[1]);
+    xhr.send(request[2]);
+});
+console.log(JSON.stringify(JSON.parse(store.__networkRecording || '[]').map(function (entry) {
+    return entry.key;
+})));
+"""
+
+
+def _request_keys(requests):
+    """Keys the shim gives to (method, url, body) requests"""
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("Node.js is needed to run the network shim")
+    interceptor = NetworkInterceptor(mode="record", fixture_file="unused.json")
+    script = _KEYS_HARNESS.replace("__SHIM__", interceptor._shim()).replace("__REQUESTS__", json.dumps(requests))
+    result = subprocess.run([node, "-e", script], capture_output=True, text=True, check=True, timeout=30)
+    return json.loads(result.stdout)
+
+
+def test_request_keys_drop_cache_busters_and_sort_parameters():
+    keys = _request_keys([
+        ["GET", "https://api.lever.co/v0/postings/insiderone?mode=json&team=qa&_=1700000000"],
+        ["get", "https://api.lever.co/v0/postings/insiderone?team=qa&mode=json&cb=42#top"],
+    ])
+
+    assert keys == ["GET https://api.lever.co/v0/postings/insiderone?mode=json&team=qa"] * 2
+
+
+def test_request_keys_normalize_form_and_json_bodies():
+    url = "https://useinsider.com/wp-admin/admin-ajax.php"
+    keys = _request_keys([
+        ["POST", url, "action=get_jobs&department=qa&ts=1"],
+        ["POST", url, "department=qa&action=get_jobs&ts=2"],
+        ["POST", url, '{"action": "get_jobs", "filters": {"team": "qa", "location": "istanbul"}}'],
+        ["POST", url, '{"filters": {"location": "istanbul", "team": "qa"}, "action": "get_jobs"}'],
+    ])
+
+    assert keys[0] == keys[1]
+    assert keys[2] == keys[3]
+    assert keys[0] != keys[2]
+    assert all(key.startswith(f"POST {url} body:") for key in keys)
+
+
+def test_request_keys_differ_by_admin_ajax_body():
+    url = "https://useinsider.com/wp-admin/admin-ajax.php?_t=99"
+    keys = _request_keys([
+        ["POST", url, "action=get_locations"],
+        ["POST", url, "action=get_departments"],
+        ["POST", url, "action=get_jobs&department=qualityassurance"],
+        ["POST", url, "action=get_jobs&department=sales"],
+    ])
+
+    assert len(set(keys)) == 4
+
+
+def _interceptor(tmp_path, worker):
+    interceptor = NetworkInterceptor(mode="record", fixture_file=str(tmp_path / "careers.json"))
+    interceptor.worker = worker
+    return interceptor
+
+
+def _response(body):
+    return {"status": 200, "content_type": "application/json", "body": body}
+
+
+def test_merge_worker_files_folds_recordings_into_the_fixture_file(tmp_path):
+    fixture_file = tmp_path / "careers.json"
+    fixture_file.write_text(json.dumps({"GET old": _response("old"), "GET shared": _response("stale")}))
+    for worker, keys in (("gw0", ["GET a", "GET shared"]), ("gw1", ["GET b"])):
+        _interceptor(tmp_path, worker)._save([dict(_response(f"{worker} {key}"), key=key) for key in keys])
+
+    controller = _interceptor(tmp_path, None)
+    merged = controller.merge_worker_files()
+
+    responses = json.loads(fixture_file.read_text())
+    assert merged == 3
+    assert set(responses) == {"GET old", "GET shared", "GET a", "GET b"}
+    assert responses["GET shared"]["body"] == "gw0 GET shared"
+    assert list(tmp_path.glob("careers.gw*.json")) == []
+    assert controller.merge_worker_files() == 0
+
+
+def test_worker_writes_only_its_own_recordings(tmp_path):
+    (tmp_path / "careers.json").write_text(json.dumps({"GET old": _response("old")}))
+    worker = _interceptor(tmp_path, "gw3")
+
+    worker._save([dict(_response("new"), key="GET new")])
+
+    assert set(json.loads((tmp_path / "careers.gw3.json").read_text())) == {"GET new"}
+    assert set(json.loads((tmp_path / "careers.json").read_text())) == {"GET old"}
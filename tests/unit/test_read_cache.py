@@ -0,0 +1,139 @@
+import pytest
+from types import SimpleNamespace
+from config.config import Config
+from utils import read_cache
+from utils.read_cache import MUTATING_COMMANDS, memoized_read, read_cache_for, register_read_only_script
+
+READ_ONLY_SCRIPT = register_read_only_script("return document.title;")
+
+
+class _Page:
+    """Page object stand-in counting how often its reads reach the driver"""
+
+    def __init__(self, driver, name="page"):
+        self.driver = driver
+        self.name = name
+        self.reads = 0
+
+    @memoized_read
+    def get_items(self, prefix=""):
+        self.reads += 1
+        return [f"{prefix}{self.name}-{self.reads}"]
+
+    @memoized_read
+    def get_items_after_click(self):
+        self.reads += 1
+        self.driver.execute("clickElement", {"id": "more"})
+        return [self.reads]
+
+
+@pytest.fixture(autouse=True)
+def read_cache_enabled(monkeypatch):
+    monkeypatch.setattr(Config, "READ_CACHE", True)
+    monkeypatch.setattr(Config, "READ_CACHE_MAX_AGE", 10)
+
+
+def test_repeated_read_is_memoized_and_copied(fake_driver):
+    page = _Page(fake_driver)
+
+    first = page.get_items()
+    first.append("changed by the caller")
+
+    assert page.get_items() == ["page-1"]
+    assert page.reads == 1
+    assert read_cache_for(fake_driver).hits == 1
+
+
+def test_arguments_are_part_of_the_key(fake_driver):
+    page = _Page(fake_driver)
+
+    assert page.get_items(prefix="a:") == ["a:page-1"]
+    assert page.get_items(prefix="b:") == ["b:page-2"]
+    assert page.get_items(prefix="a:") == ["a:page-1"]
+
+
+def test_pages_on_the_same_driver_do_not_share_reads(fake_driver):
+    first, second = _Page(fake_driver, "first"), _Page(fake_driver, "second")
+
+    assert first.get_items() == ["first-1"]
+    assert second.get_items() == ["second-1"]
+    assert first.get_items() == ["first-1"]
+    assert (first.reads, second.reads) == (1, 1)
+
+
+@pytest.mark.parametrize("command", sorted(MUTATING_COMMANDS))
+def test_mutating_command_invalidates_reads(fake_driver, command):
+    page = _Page(fake_driver)
+    page.get_items()
+    epoch = read_cache_for(fake_driver).epoch
+
+    fake_driver.execute(command, {})
+
+    assert read_cache_for(fake_driver).epoch == epoch + 1
+    assert page.get_items() == ["page-2"]
+
+
+def test_read_commands_keep_reads(fake_driver):
+    page = _Page(fake_driver)
+    page.get_items()
+
+    fake_driver.execute("getCurrentUrl")
+    fake_driver.find_elements("css selector", ".position-list-item")
+    fake_driver.execute_script(READ_ONLY_SCRIPT)
+    fake_driver.execute_script("/* getAttribute */return (function(){...})", "element", "href")
+
+    assert read_cache_for(fake_driver).epoch == 0
+    assert page.get_items() == ["page-1"]
+
+
+def test_unregistered_script_invalidates_reads(fake_driver):
+    page = _Page(fake_driver)
+    page.get_items()
+
+    fake_driver.execute_script("document.querySelector('#filter').value = 'qa';")
+
+    assert page.get_items() == ["page-2"]
+
+
+def test_failed_mutating_command_invalidates_reads(fake_driver):
+    def click_fails(params):
+        raise RuntimeError("element click intercepted")
+
+    fake_driver.responses["clickElement"] = click_fails
+    page = _Page(fake_driver)
+    page.get_items()
+
+    with pytest.raises(RuntimeError):
+        fake_driver.execute("clickElement", {"id": "more"})
+
+    assert page.get_items() == ["page-2"]
+
+
+def test_read_that_changes_the_page_is_not_memoized(fake_driver):
+    page = _Page(fake_driver)
+
+    assert page.get_items_after_click() == [1]
+    assert page.get_items_after_click() == [2]
+
+
+def test_reads_expire_after_max_age(fake_driver, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(read_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    page = _Page(fake_driver)
+    page.get_items()
+
+    now[0] += Config.READ_CACHE_MAX_AGE
+    assert page.get_items() == ["page-1"]
+
+    now[0] += 0.1
+    assert page.get_items() == ["page-2"]
+
+
+def test_disabled_cache_always_reads(fake_driver, monkeypatch):
+    monkeypatch.setattr(Config, "READ_CACHE", False)
+    page = _Page(fake_driver)
+
+    page.get_items()
+    page.get_items()
+
+    assert page.reads == 2
@@ -0,0 +1,143 @@
+import json
+import pytest
+from utils import results_aggregator
+from utils.results_aggregator import DurationStats, ResultsAggregator, percentile
+
+JUNIT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" tests="4">
+  <testcase classname="tests.test_insider_careers.TestInsiderCareers" name="test_01[chrome]" time="2.0">
+    <properties><property name="browser" value="chrome"/></properties>
+  </testcase>
+  <testcase classname="tests.test_insider_careers.TestInsiderCareers" name="test_01[firefox]" time="4.0">
+    <properties><property name="browser" value="firefox"/></properties>
+    <failure message="assert False">trace</failure>
+  </testcase>
+  <testcase classname="tests.test_insider_careers.TestInsiderCareers" name="test_02[chrome]" time="1.5">
+    <properties><property name="browser" value="chrome"/></properties>
+    <skipped message="no catalog"/>
+  </testcase>
+  <testcase classname="tests.test_insider_careers.TestInsiderCareers" name="test_03[chrome]" time="3.0">
+    <properties><property name="browser" value="chrome"/></properties>
+    <error message="driver crashed"/>
+  </testcase>
+</testsuite></testsuites>
+"""
+
+
+def _allure_result(name, status, start, stop, steps=(), browser="chrome"):
+    return {"name": name, "fullName": f"tests.test_insider_careers.TestInsiderCareers#{name}",
+            "status": status, "start": start, "stop": stop,
+            "labels": [{"name": "browser", "value": browser}], "steps": list(steps)}
+
+
+def _step(name, start, stop, status="passed", steps=()):
+    return {"name": name, "status": status, "start": start, "stop": stop, "steps": list(steps)}
+
+
+@pytest.fixture
+def results(tmp_path):
+    (tmp_path / "junit.xml").write_text(JUNIT)
+    allure_dir = tmp_path / "allure-results"
+    allure_dir.mkdir()
+    (allure_dir / "a-result.json").write_text(json.dumps(_allure_result("test_01", "passed", 1000, 3000, [
+        _step("Open home page", 1000, 1500),
+        _step("Filter jobs", 1500, 3000, steps=[_step("Select location", 1500, 2500)]),
+    ])))
+    (allure_dir / "b-result.json").write_text(json.dumps(_allure_result("test_03", "broken", 10000, 13000, [
+        _step("Filter jobs", 10000, 13000, status="broken"),
+    ])))
+    (allure_dir / "c-container.json").write_text("{}")
+    return tmp_path
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(value) for value in range(1, 11)]
+
+    assert percentile(values, 50) == 5.0
+    assert percentile(values, 90) == 9.0
+    assert percentile(values, 95) == 10.0
+    assert percentile(values, 0) == 1.0
+    assert percentile([], 95) == 0.0
+
+
+def test_duration_stats_merge_adds_counts_and_keeps_exact_samples():
+    first, second = DurationStats(), DurationStats()
+    for seconds in (1.0, 2.0, 3.0):
+        first.add(seconds)
+    second.add(10.0, failed=True)
+
+    first.merge(second)
+    first.merge(DurationStats())
+
+    assert (first.count, first.total, first.max, first.failed) == (4, 16.0, 10.0, 1)
+    assert sorted(first.samples) == [1.0, 2.0, 3.0, 10.0]
+    assert first.percentiles() == {50: 2.0, 90: 10.0, 95: 10.0}
+
+
+def test_duration_stats_merge_keeps_the_reservoir_proportional(monkeypatch):
+    monkeypatch.setattr(results_aggregator, "RESERVOIR_SIZE", 100)
+    large, small = DurationStats(), DurationStats()
+    for _ in range(300):
+        large.add(1.0)
+    for _ in range(100):
+        small.add(2.0)
+
+    large.merge(small)
+
+    assert large.count == 400
+    assert len(large.samples) == 100
+    assert large.samples.count(1.0) == 75
+
+
+def test_junit_outcomes_win_over_allure_and_allure_gives_steps(results):
+    aggregator = ResultsAggregator()
+
+    aggregator.add_paths([str(results / "junit.xml"), str(results / "allure-results")])
+
+    assert aggregator.summary() == {"total": 4, "passed": 1, "failed": 1, "error": 1, "skipped": 1, "files": 3}
+    assert aggregator.browsers["junit"] == {"chrome": {"passed": 1, "skipped": 1, "error": 1},
+                                            "firefox": {"failed": 1}}
+    assert {name: (stats.count, stats.failed) for name, stats in aggregator.steps.items()} == {
+        "Open home page": (1, 0), "Filter jobs": (2, 1), "Select location": (1, 0)}
+    assert max(aggregator.slowest) == (3.0, "Filter jobs", "tests.test_insider_careers.TestInsiderCareers#test_03")
+    markdown = aggregator.to_markdown()
+    assert "## Per browser" in markdown and "| firefox | 0 | 1 | 0 | 0 |" in markdown
+
+
+def test_allure_outcomes_are_used_without_junit(results):
+    aggregator = ResultsAggregator()
+
+    aggregator.add_paths([str(results / "allure-results")])
+
+    assert aggregator.source == "allure"
+    assert aggregator.summary()["passed"] == 1 and aggregator.summary()["error"] == 1
+
+
+def test_merged_shard_states_equal_one_aggregate(results, tmp_path):
+    whole = ResultsAggregator()
+    whole.add_paths([str(results)])
+    junit_shard, allure_shard = ResultsAggregator(), ResultsAggregator()
+    junit_shard.add_paths([str(results / "junit.xml")])
+    allure_shard.add_paths([str(results / "allure-results")])
+    allure_shard.save(tmp_path / "allure-state.json")
+
+    junit_shard.merge(ResultsAggregator.load(tmp_path / "allure-state.json"))
+
+    assert junit_shard.summary() == whole.summary()
+    assert junit_shard.browsers == whole.browsers
+    assert sorted(junit_shard.slowest) == sorted(whole.slowest)
+    assert {name: stats.count for name, stats in junit_shard.steps.items()} == \
+        {name: stats.count for name, stats in whole.steps.items()}
+
+
+def test_main_reads_only_the_files_given(results, tmp_path):
+    (results / "junit-stale.xml").write_text(JUNIT)  # a previous run's file next to the current one
+    output = tmp_path / "summary" / "summary.md"
+
+    exit_code = results_aggregator.main([str(results / "junit.xml"), str(results / "allure-results"),
+                                         "--output", str(output), "--json", str(tmp_path / "counts.json"),
+                                         "--strict"])
+
+    assert exit_code == 1
+    assert json.loads((tmp_path / "counts.json").read_text())["total"] == 4
+    assert output.read_text().startswith("# Aggregated Test Results")
@@ -0,0 +1,191 @@
+import multiprocessing
+import os
+import threading
+import time
+import pytest
+from pathlib import Path
+from config.config import Config
+from utils import decorators
+from utils.checkpoint import RetryBudget, checkpoints
+from utils.decorators import allure_step
+
+
+def _consume_shared(path: str, limit: int, attempts: int) -> int:
+    """One xdist worker: take retries from the controller's budget file"""
+    budget = RetryBudget(limit)
+    budget.share(path)
+    return sum(budget.consume() for _ in range(attempts))
+
+
+def test_budget_is_capped_per_process():
+    budget = RetryBudget(limit=2)
+
+    assert [budget.consume() for _ in range(3)] == [True, True, False]
+    assert budget.used == 2
+    assert budget.remaining == 0
+
+
+def test_shared_budget_is_capped_across_processes():
+    # Arrange
+    controller = RetryBudget(limit=25)
+    path = controller.share()
+
+    # Act - four workers race for 40 retries
+    try:
+        with multiprocessing.get_context("spawn").Pool(4) as pool:
+            taken = pool.starmap(_consume_shared, [(path, 25, 10)] * 4)
+        used = controller.used
+    finally:
+        controller.close()
+
+    # Assert
+    assert sum(taken) == 25
+    assert used == 25
+    assert not os.path.exists(path)
+    assert controller.used == 25  # Kept after the file is removed
+
+
+def test_shared_budget_waits_for_the_file_lock():
+    # Arrange
+    controller = RetryBudget(limit=5)
+    path = Path(controller.share())
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.touch()
+    worker = RetryBudget(limit=5)
+    worker.share(str(path))
+    results = []
+
+    try:
+        # Act
+        consumer = threading.Thread(target=lambda: results.append(worker.consume()))
+        consumer.start()
+        time.sleep(0.2)
+        blocked = consumer.is_alive()
+        lock_path.unlink()
+        consumer.join(timeout=5)
+
+        # Assert
+        assert blocked
+        assert results == [True]
+        assert controller.used == 1
+        assert not lock_path.exists()
+    finally:
+        controller.close()
+
+
+def test_shared_budget_abandons_a_stale_lock():
+    # Arrange - a lock left by a worker that died while holding it
+    budget = RetryBudget(limit=5)
+    path = Path(budget.share())
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.touch()
+    stale = time.time() - 60
+    os.utime(lock_path, (stale, stale))
+
+    try:
+        # Act / Assert
+        assert budget.consume()
+        assert budget.used == 1
+        assert not lock_path.exists()
+    finally:
+        budget.close()
+
+
+class _Page:
+    """Page object stand-in whose checkpoint state is the filter it applied"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.filter = None
+        self.restored = []
+        self.fail_capture = False
+        self.fail_search = 0
+
+    def get_checkpoint_state(self):
+        if self.fail_capture:
+            raise RuntimeError("page state unavailable")
+        return {"filter": self.filter}
+
+    def restore_checkpoint_state(self, state):
+        self.restored.append(state)
+        self.filter = state["filter"]
+
+    @allure_step("Open")
+    def open(self, url):
+        self.driver.get(url)
+
+    @allure_step("Filter")
+    def apply_filter(self, value):
+        self.filter = value
+        self.driver.get(f"{self.driver.current_url}?filter={value}")
+
+    @allure_step("Search")
+    def search(self):
+        if self.fail_search:
+            self.fail_search -= 1
+            raise RuntimeError("results did not load")
+        return self.filter
+
+
+@pytest.fixture
+def page(fake_driver, monkeypatch):
+    urls = []
+    fake_driver.responses.update({
+        "get": lambda params: urls.append(params["url"]),
+        "getCurrentUrl": lambda params: urls[-1],
+        "w3cGetCurrentWindowHandle": "window-1",
+    })
+    monkeypatch.setattr(Config, "STEP_RETRY_ATTEMPTS", 1)
+    monkeypatch.setattr(Config, "STEP_RETRY_DELAY", 0)
+    monkeypatch.setattr(decorators, "retry_budget", RetryBudget(limit=5))
+    page = _Page(fake_driver)
+    page.urls = urls
+    return page
+
+
+def test_failed_step_resumes_from_the_last_checkpoint(page):
+    # Arrange
+    page.open("https://useinsider.com/careers/")
+    page.apply_filter("qa")
+    page.fail_search = 1
+
+    # Act
+    result = page.search()
+
+    # Assert
+    assert result == "qa"
+    assert page.restored == [{"filter": "qa"}]
+    assert page.urls[-1] == "https://useinsider.com/careers/?filter=qa"
+    assert decorators.retry_budget.used == 1
+    assert checkpoints.last(page.driver).step == "Search"
+
+
+def test_failed_capture_resumes_from_the_previous_checkpoint(page):
+    # Arrange - the filter step passes, but its checkpoint cannot be captured
+    page.open("https://useinsider.com/careers/")
+    page.fail_capture = True
+    page.apply_filter("qa")
+    page.fail_capture = False
+    page.filter = "changed since"
+    page.fail_search = 1
+
+    # Act
+    page.search()
+
+    # Assert - resumed from the checkpoint of "Open", not the uncaptured "Filter"
+    assert checkpoints.last(page.driver).step == "Search"
+    assert page.restored == [{"filter": None}]
+    assert page.urls[-1] == "https://useinsider.com/careers/"
+    assert decorators.retry_budget.used == 1
+
+
+def test_exhausted_budget_fails_the_step_without_restoring(page, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(decorators, "retry_budget", RetryBudget(limit=0))
+    page.open("https://useinsider.com/careers/")
+    page.fail_search = 1
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="results did not load"):
+        page.search()
+    assert page.restored == []
@@ -0,0 +1,107 @@
+import io
+import numpy as np
+import pytest
+from PIL import Image
+from utils.visual_regression import PIXEL_TOLERANCE, VisualRegression, perceptual_hash
+
+
+def _page(height=100, width=100):
+    """Synthetic capture: shaded background, dark header bar and a content block"""
+    y, x = np.linspace(0, 1, height)[:, None], np.linspace(0, 1, width)[None, :]
+    shade = 120 + 100 * np.sin(3 * x + 2 * y) * np.cos(2 * y)
+    pixels = np.repeat(shade[:, :, None], 3, axis=2).astype(np.uint8)
+    pixels[:height // 10, :] = (30, 30, 60)
+    pixels[3 * height // 10:7 * height // 10, width // 10:6 * width // 10] = (200, 80, 40)
+    return pixels
+
+
+def _png(pixels):
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def visual(tmp_path):
+    checker = VisualRegression(baseline_dir=str(tmp_path / "baselines"), diff_dir=str(tmp_path / "diffs"),
+                               update=False)
+    checker.compare("page", _png(_page()), threshold=0.01)
+    return checker
+
+
+def test_first_capture_creates_the_baseline(visual, tmp_path):
+    assert visual.results[0].status == "baseline-created"
+    assert (tmp_path / "baselines" / "chrome" / "page.png").exists()
+
+
+def test_noise_within_the_pixel_tolerance_matches(visual):
+    noisy = _page().astype(np.int16) + np.random.default_rng(0).integers(-PIXEL_TOLERANCE, PIXEL_TOLERANCE + 1,
+                                                                         (100, 100, 3))
+    result = visual.compare("page", _png(np.clip(noisy, 0, 255).astype(np.uint8)), threshold=0.01)
+
+    assert result.status == "match"
+    assert result.diff_ratio == 0.0
+
+
+def test_changed_pixels_over_the_threshold_mismatch(visual, tmp_path):
+    changed = _page()
+    changed[80:90, 80:90] = (0, 0, 0)  # 100 of 10000 pixels
+
+    assert visual.compare("page", _png(changed), threshold=0.01).status == "match"
+    result = visual.compare("page", _png(changed), threshold=0.005, test_id="tests/test_a.py::test_x[chrome]")
+
+    assert result.status == "mismatch"
+    assert result.diff_ratio == pytest.approx(0.01)
+    assert result.diff_path == str(tmp_path / "diffs" / "chrome" / "page-tests_test_a.py_test_x_chrome-diff.png")
+
+
+def test_diff_images_of_different_tests_do_not_overwrite_each_other(visual):
+    changed = _page()
+    changed[80:90, 80:90] = (0, 0, 0)
+
+    paths = {visual.compare("page", _png(changed), threshold=0, test_id=test_id).diff_path
+             for test_id in ("test_a[chrome]", "test_b[chrome]")}
+
+    assert len(paths) == 2
+
+
+def test_layout_shift_is_caught_by_the_perceptual_hash(visual):
+    shifted = np.roll(_page(), 25, axis=1)
+
+    result = visual.compare("page", _png(shifted), threshold=1.0)  # any pixel ratio tolerated
+
+    assert result.status == "mismatch"
+    assert result.hash_distance > 10
+
+
+def test_perceptual_hash_ignores_uniform_brightness():
+    pixels = _page()
+
+    assert not np.any(perceptual_hash(pixels) != perceptual_hash(np.clip(pixels.astype(np.int16) + 10, 0, 255)
+                                                                  .astype(np.uint8)))
+
+
+def test_ignore_regions_mask_changes(visual):
+    changed = _page()
+    changed[80:90, 80:90] = (0, 0, 0)
+
+    result = visual.compare("page", _png(changed), threshold=0, ignore_regions=[[75, 75, 20, 20]])
+
+    assert result.status == "match"
+    assert result.diff_ratio == 0.0
+
+
+def test_ignore_regions_are_scaled_to_device_pixels(tmp_path):
+    checker = VisualRegression(baseline_dir=str(tmp_path / "baselines"), diff_dir=str(tmp_path / "diffs"),
+                               update=False)
+    checker.compare("page", _png(_page(200, 200)))
+    changed = _page(200, 200)
+    changed[160:180, 160:180] = (0, 0, 0)  # CSS (80, 80, 10, 10) at a device pixel ratio of 2
+
+    assert checker.compare("page", _png(changed), threshold=0, ignore_regions=[[80, 80, 10, 10]]).status == "mismatch"
+    assert checker.compare("page", _png(changed), threshold=0, ignore_regions=[[80, 80, 10, 10]],
+                           scale=2).status == "match"
+
+
+def test_size_change_is_a_mismatch(visual):
+    assert visual.compare("page", _png(_page(120, 100))).status == "size-mismatch"
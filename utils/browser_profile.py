@@ -0,0 +1,244 @@
+"""Pre-warmed browser profile templates, built once per browser version and copied per driver"""
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from config.config import Config, Browser, BrowserConfig
+
+logger = logging.getLogger(__name__)
+
+# Executables probed for the installed browser version
+BROWSER_BINARIES = {
+    Browser.CHROME: ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"],
+    Browser.FIREFOX: ["firefox"],
+}
+
+# Lock files a running browser leaves in its profile; copying them makes the copy unusable
+PROFILE_LOCK_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket", "lock", ".parentlock", "parent.lock")
+
+# Cache directories worth keeping are warmed by visiting these pages
+WARM_URLS = [Config.BASE_URL, Config.CAREERS_QA_URL]
+
+METADATA_FILE = "template.json"
+
+
+def detect_browser_version(browser: Browser) -> str:
+    """Installed browser version from `<binary> --version`, or 'unknown'"""
+    for binary in BROWSER_BINARIES[browser]:
+        path = shutil.which(binary)
+        if not path:
+            continue
+        try:
+            output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"\d+(\.\d+)+", output)
+        if match:
+            return match.group(0)
+    return "unknown"
+
+
+class ProfileTemplate:
+    """
+    Warmed user-data directory (HTTP cache, consent cookies, first-run done) for one browser config
+    Built with the same config as the drivers that use it; a new browser version, an expired
+    template or a version mismatch reported by a driver triggers a rebuild.
+
+    Each build goes to a fresh Config.PROFILE_TEMPLATE_DIR/<browser>[-headless]-<version>-<build>
+    directory and is published by atomically replacing the <browser>[-headless].json pointer, so
+    workers copying the previous template are never disturbed. A superseded template is deleted
+    (under the builder lock) once it has been superseded for PROFILE_TEMPLATE_GRACE seconds and
+    no copy of it is running - each copy holds a reader marker file beside the template.
+    """
+
+    def __init__(self, browser_config: BrowserConfig, root: str = None):
+        self.browser_config = browser_config
+        self.browser = browser_config.browser
+        self.name = browser_config.name + ("-headless" if browser_config.headless else "")
+        self.root = Path(root or Config.PROFILE_TEMPLATE_DIR)
+        self.version = detect_browser_version(self.browser)
+        self._pointer_path = self.root / f"{self.name}.json"
+        self._lock_path = self.root / f"{self.name}.lock"
+        self._build_pattern = re.compile(rf"{re.escape(self.name)}-[^-]+-\d+")
+
+    def _pointer(self) -> dict:
+        """{"path": current template dir name, "invalid": bool, "superseded": {dir name: since}}"""
+        try:
+            return json.loads(self._pointer_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_pointer(self, pointer: dict):
+        temp_path = self._pointer_path.with_name(f"{self._pointer_path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(pointer))
+        os.replace(temp_path, self._pointer_path)
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Directory of the published template, or None before the first build"""
+        name = self._pointer().get("path")
+        return self.root / name if name else None
+
+    def _metadata(self, template: Path = None) -> Optional[dict]:
+        try:
+            return json.loads(((template or self.path) / METADATA_FILE).read_text())
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def is_valid(self) -> bool:
+        """Template exists, matches the browser version, is not expired and was not invalidated"""
+        metadata = self._metadata()
+        if metadata is None or metadata.get("version") != self.version or self._pointer().get("invalid"):
+            return False
+        return time.time() - metadata.get("built", 0) < Config.PROFILE_TEMPLATE_MAX_AGE
+
+    def _acquire_lock(self, blocking: bool = True) -> Optional[int]:
+        """Take the builder lock (a lock older than 10 minutes is abandoned); None if not blocking and held"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        while True:
+            try:
+                return os.open(self._lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if time.time() - self._lock_path.stat().st_mtime > 600:
+                        self._lock_path.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if not blocking:
+                    return None
+                time.sleep(1)
+
+    def _release_lock(self, lock_fd: int):
+        os.close(lock_fd)
+        self._lock_path.unlink(missing_ok=True)
+
+    def ensure(self) -> Path:
+        """Build the template if needed (one builder across workers) and return its path"""
+        if self.is_valid():
+            if self._pointer().get("superseded"):
+                # Opportunistic: whoever finds the lock free removes templates nobody uses any more
+                lock_fd = self._acquire_lock(blocking=False)
+                if lock_fd is not None:
+                    try:
+                        self._remove_superseded()
+                    finally:
+                        self._release_lock(lock_fd)
+            return self.path
+        lock_fd = self._acquire_lock()
+        try:
+            if not self.is_valid():
+                self._build()
+            self._remove_superseded()
+        finally:
+            self._release_lock(lock_fd)
+        return self.path
+
+    def _build(self):
+        """Warm a fresh profile by visiting the site once, then publish it (caller holds the lock)"""
+        from pages.home_page import HomePage
+        from utils.driver_factory import create_driver
+
+        build_dir = self.root / f"{self.name}-{self.version}-{time.time_ns()}"
+        build_dir.mkdir(parents=True)
+        logger.info(f"Building {self.name} {self.version} profile template at {build_dir}")
+        driver = create_driver(profile_dir=str(build_dir), browser_config=self.browser_config)
+        try:
+            HomePage(driver).load()  # Accepts the cookie consent banner
+            for url in WARM_URLS[1:]:
+                driver.get(url)
+            actual_version = driver.capabilities.get("browserVersion", self.version)
+        finally:
+            driver.quit()
+
+        for lock_file in PROFILE_LOCK_FILES:
+            (build_dir / lock_file).unlink(missing_ok=True)
+        (build_dir / METADATA_FILE).write_text(json.dumps({
+            "browser": self.browser.value,
+            "headless": self.browser_config.headless,
+            "version": self.version,
+            "browser_version": actual_version,
+            "built": time.time(),
+        }))
+
+        # Publish: readers resolving the pointer from now on copy the new template
+        pointer = self._pointer()
+        superseded = pointer.get("superseded", {})
+        if pointer.get("path"):
+            superseded[pointer["path"]] = time.time()
+        self._write_pointer({"path": build_dir.name, "invalid": False, "superseded": superseded})
+
+    def _readers(self, template: Path) -> int:
+        """Copies of the template in progress (markers older than 10 minutes are abandoned)"""
+        count = 0
+        for marker in self.root.glob(f"{template.name}.reader-*"):
+            try:
+                if time.time() - marker.stat().st_mtime > 600:
+                    marker.unlink(missing_ok=True)
+                else:
+                    count += 1
+            except FileNotFoundError:
+                pass
+        return count
+
+    def _remove_superseded(self):
+        """Delete templates superseded long enough ago that no copy is running (caller holds the lock)"""
+        pointer = self._pointer()
+        superseded = dict(pointer.get("superseded", {}))
+        now = time.time()
+        for template in self.root.iterdir():
+            if (not template.is_dir() or template.name == pointer.get("path")
+                    or not self._build_pattern.fullmatch(template.name)):
+                continue
+            # Directories the pointer never named are failed builds: their mtime stands in
+            since = superseded.get(template.name, template.stat().st_mtime)
+            if now - since < Config.PROFILE_TEMPLATE_GRACE or self._readers(template):
+                continue
+            logger.info(f"Removing superseded profile template {template}")
+            shutil.rmtree(template, ignore_errors=True)
+            superseded.pop(template.name, None)
+        if pointer and superseded != pointer.get("superseded", {}):
+            self._write_pointer(dict(pointer, superseded=superseded))
+
+    def copy(self) -> str:
+        """Cheap per-driver copy of the template, marked as a reader so it cannot be deleted meanwhile"""
+        worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        template = self.path
+        marker = self.root / f"{template.name}.reader-{os.getpid()}-{threading.get_ident()}"
+        marker.touch()
+        try:
+            target = tempfile.mkdtemp(prefix=f"profile-{self.name}-{worker}-")
+            shutil.copytree(template, target, dirs_exist_ok=True,
+                            ignore=shutil.ignore_patterns(*PROFILE_LOCK_FILES))
+        finally:
+            marker.unlink(missing_ok=True)
+        return target
+
+    def validate(self, driver):
+        """Invalidate the template if the driver reports a different browser version than it was built with"""
+        template = self.path
+        metadata = self._metadata(template) or {}
+        actual = driver.capabilities.get("browserVersion")
+        if template is not None and actual and metadata.get("browser_version") not in (None, actual):
+            logger.warning(f"Browser is {actual} but template was built with "
+                           f"{metadata.get('browser_version')}; it will be rebuilt")
+            lock_fd = self._acquire_lock()
+            try:
+                # Unless another worker has rebuilt it meanwhile
+                pointer = self._pointer()
+                if pointer.get("path") == template.name:
+                    self._write_pointer(dict(pointer, invalid=True))
+            finally:
+                self._release_lock(lock_fd)
+
+    @staticmethod
+    def release(profile_dir: str):
+        """Remove a per-driver copy"""
+        shutil.rmtree(profile_dir, ignore_errors=True)
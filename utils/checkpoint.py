@@ -0,0 +1,161 @@
+"""Step checkpoints for resuming retried tests from the failing step"""
+import contextlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Checkpoint:
+    """Browser and page state captured after a step succeeded"""
+    step: str
+    url: str
+    window: str
+    cookies: List[Dict] = field(default_factory=list)
+    state: Dict = field(default_factory=dict)
+    page: Optional[weakref.ref] = None
+    created: float = field(default_factory=time.time)
+
+
+class CheckpointStore:
+    """Last good checkpoint per driver (entries vanish with their driver)"""
+
+    def __init__(self):
+        self._checkpoints = weakref.WeakKeyDictionary()
+
+    def capture(self, page, step: str) -> Checkpoint:
+        """Record the state after `step` succeeded on `page`"""
+        driver = page.driver
+        checkpoint = Checkpoint(
+            step=step,
+            url=driver.current_url,
+            window=driver.current_window_handle,
+            cookies=driver.get_cookies(),
+            state=page.get_checkpoint_state(),
+            page=weakref.ref(page),
+        )
+        self._checkpoints[driver] = checkpoint
+        return checkpoint
+
+    def last(self, driver) -> Optional[Checkpoint]:
+        """Get the last good checkpoint for the driver"""
+        return self._checkpoints.get(driver)
+
+    def restore(self, driver, checkpoint: Checkpoint):
+        """Bring the browser back to the checkpoint: window, URL, cookies, then page state"""
+        logger.info(f"Restoring checkpoint after step '{checkpoint.step}': {checkpoint.url}")
+        if checkpoint.window in driver.window_handles:
+            driver.switch_to.window(checkpoint.window)
+        driver.get(checkpoint.url)
+
+        if checkpoint.cookies:
+            driver.delete_all_cookies()
+            for cookie in checkpoint.cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except Exception as e:
+                    # Cookies of another domain cannot be set from this page
+                    logger.debug(f"Skipping cookie {cookie.get('name')}: {e}")
+            driver.refresh()
+
+        page = checkpoint.page() if checkpoint.page else None
+        if page is not None and checkpoint.state:
+            page.restore_checkpoint_state(checkpoint.state)
+
+
+class RetryBudget:
+    """
+    Session-wide cap on step retries, shared by every test in the process
+    Under xdist the controller shares a counter file with its workers (see share), so the
+    cap holds for the whole session rather than once per worker
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._used = 0
+        self._file: Optional[Path] = None
+        self._owned = False
+        self._lock = threading.Lock()
+
+    def share(self, path: str = None) -> str:
+        """Keep the count in a file other processes can use; without a path, create one (once)"""
+        if path is None:
+            if self._file is not None:
+                return str(self._file)
+            path = Path(tempfile.mkdtemp(prefix="step-retry-budget-")) / "used"
+            path.write_text(str(self._used))
+            self._owned = True
+        self._file = Path(path)
+        return str(self._file)
+
+    def close(self):
+        """Remove the counter file created by share()"""
+        if self._file is not None and self._owned:
+            self._used = self.used
+            shutil.rmtree(self._file.parent, ignore_errors=True)
+            self._file, self._owned = None, False
+
+    @property
+    def used(self) -> int:
+        if self._file is None:
+            return self._used
+        try:
+            return int(self._file.read_text() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Exclusive access to the counter file across processes (a lock older than 30s is abandoned)"""
+        if self._file is None:
+            yield
+            return
+        lock_path = self._file.with_name(self._file.name + ".lock")
+        while True:
+            try:
+                lock_fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime > 30:
+                        lock_path.unlink(missing_ok=True)
+                except FileNotFoundError:
+                    pass
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.close(lock_fd)
+            lock_path.unlink(missing_ok=True)
+
+    def consume(self) -> bool:
+        """Take one retry from the budget; False when exhausted"""
+        with self._lock, self._file_lock():
+            used = self.used
+            if used >= self.limit:
+                return False
+            if self._file is None:
+                self._used = used + 1
+            else:
+                temp_path = self._file.with_name(f"{self._file.name}.{os.getpid()}.tmp")
+                temp_path.write_text(str(used + 1))
+                os.replace(temp_path, self._file)
+            return True
+
+    @property
+    def remaining(self) -> int:
+        return max(self.limit - self.used, 0)
+
+
+checkpoints = CheckpointStore()
+retry_budget = RetryBudget(Config.STEP_RETRY_BUDGET)
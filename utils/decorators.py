@@ -1,14 +1,47 @@
 """Utility decorators for test framework"""
 import functools
 import logging
+import random
+import threading
 import time
 import allure
 from datetime import datetime
 from pathlib import Path
 from config.config import Config
+from utils.checkpoint import checkpoints, retry_budget
 
 logger = logging.getLogger(__name__)
 
+# Stack of active allure_step names per thread, and callbacks notified on step start/end
+_step_state = threading.local()
+_step_listeners = []
+
+
+def current_steps() -> list:
+    """Names of the allure_step calls currently executing in this thread, outermost first"""
+    if not hasattr(_step_state, "stack"):
+        _step_state.stack = []
+    return _step_state.stack
+
+
+def add_step_listener(listener):
+    """Register listener(event, name, duration, error) called on step 'start' and 'end'"""
+    _step_listeners.append(listener)
+
+
+def remove_step_listener(listener):
+    """Unregister a step listener"""
+    if listener in _step_listeners:
+        _step_listeners.remove(listener)
+
+
+def _notify_step(event, name, duration=None, error=None):
+    for listener in list(_step_listeners):
+        try:
+            listener(event, name, duration, error)
+        except Exception as e:
+            logger.debug(f"Step listener failed: {e}")
+
 
 def log_action(func):
     """Decorator to log function execution"""
@@ -60,8 +93,14 @@ def screenshot_on_failure(func):
     return wrapper
 
 
-def retry(max_attempts=3, delay=1, exceptions=(Exception,)):
-    """Decorator to retry function on failure"""
+def retry(max_attempts=3, delay=1, exceptions=(Exception,), backoff=1, jitter=0,
+          budget=None, on_retry=None):
+    """
+    Decorator to retry function on failure
+    backoff multiplies the delay per attempt, jitter adds up to that fraction of
+    random extra delay, budget (RetryBudget) caps retries across calls and
+    on_retry(attempt, error) runs before each new attempt
+    """
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
@@ -74,20 +113,90 @@ def retry(max_attempts=3, delay=1, exceptions=(Exception,)):
                     if attempts >= max_attempts:
                         logger.error(f"Max retries ({max_attempts}) reached for {func.__name__}")
                         raise
+                    if budget is not None and not budget.consume():
+                        logger.error(f"Retry budget exhausted, not retrying {func.__name__}")
+                        raise
                     logger.warning(f"Retry {attempts}/{max_attempts} for {func.__name__}: {str(e)}")
-                    time.sleep(delay)
+                    wait = delay * backoff ** (attempts - 1)
+                    time.sleep(wait + random.uniform(0, wait * jitter))
+                    if on_retry is not None:
+                        on_retry(attempts, e)
         
         return wrapper
     return decorator
 
 
+def _run_step(name, func, args, kwargs):
+    """Run func as an Allure step, tracking the step stack and notifying step listeners"""
+    steps = current_steps()
+    steps.append(name)
+    _notify_step("start", name)
+    start = time.perf_counter()
+    error = None
+    try:
+        with allure.step(name):
+            return func(*args, **kwargs)
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        steps.pop()
+        _notify_step("end", name, time.perf_counter() - start, error)
+
+
+def _run_resumable_step(name, page, func, args, kwargs):
+    """
+    Run an outermost page step with checkpoint/resume: on failure the browser is
+    restored to the last good checkpoint and only this step is executed again
+    """
+    pending_restore = []
+    
+    def schedule_restore(attempt, error):
+        checkpoint = checkpoints.last(page.driver)
+        allure.attach(
+            f"Attempt {attempt + 1} of step '{name}' after: {error}\n"
+            f"Resuming from: {checkpoint.step if checkpoint else 'no checkpoint'}",
+            name="step_retry",
+            attachment_type=allure.attachment_type.TEXT
+        )
+        if checkpoint is not None:
+            pending_restore.append(checkpoint)
+    
+    def run_step():
+        # Restoring is part of the attempt, so a failed restore is retried as well.
+        # Steps replayed while restoring are nested, so they neither retry nor checkpoint.
+        if pending_restore:
+            checkpoint = pending_restore.pop()
+            _run_step(f"Restore checkpoint: {checkpoint.step}", checkpoints.restore,
+                      (page.driver, checkpoint), {})
+        return _run_step(name, func, args, kwargs)
+    run_step.__name__ = f"step '{name}'"
+    
+    result = retry(
+        max_attempts=Config.STEP_RETRY_ATTEMPTS + 1,
+        delay=Config.STEP_RETRY_DELAY,
+        backoff=2,
+        jitter=0.5,
+        budget=retry_budget,
+        on_retry=schedule_restore
+    )(run_step)()
+    try:
+        checkpoints.capture(page, name)
+    except Exception as e:
+        # The step passed; without this checkpoint a later retry resumes from an earlier one
+        logger.warning(f"Could not capture checkpoint after step '{name}': {e}")
+    return result
+
+
 def allure_step(step_name=None):
     """Decorator to add Allure steps"""
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             name = step_name or func.__name__.replace('_', ' ').title()
-            with allure.step(name):
-                return func(*args, **kwargs)
+            page = args[0] if args and hasattr(args[0], "get_checkpoint_state") else None
+            if page is not None and Config.STEP_RETRY_ATTEMPTS > 0 and not current_steps():
+                return _run_resumable_step(name, page, func, args, kwargs)
+            return _run_step(name, func, args, kwargs)
         return wrapper
     return decorator
@@ -0,0 +1,195 @@
+"""Local DOM snapshots for read-only assertions without driver round-trips"""
+import logging
+import re
+from functools import lru_cache
+from typing import List, Tuple
+from cssselect import HTMLTranslator
+from lxml import etree, html as lxml_html
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from utils.read_cache import register_read_only_script
+
+logger = logging.getLogger(__name__)
+
+# Elements whose content never contributes to rendered text
+NON_RENDERED_TAGS = {"script", "style", "noscript", "template", "head"}
+
+# Elements rendered as blocks, which WebElement.text separates with line breaks
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+
+# Set by SNAPSHOT_SCRIPT on the outermost elements the browser does not render
+HIDDEN_ATTRIBUTE = "data-snapshot-hidden"
+
+# Serializes the page (or the subtree under arguments[0]) with every outermost element that
+# has no layout box - hidden by a stylesheet class as much as by inline style - marked with
+# HIDDEN_ATTRIBUTE. The marks go on a detached copy walked alongside the live tree, so the
+# page itself (and any MutationObserver on it) sees no change
+SNAPSHOT_SCRIPT = register_read_only_script("""
+var root = arguments[0] || document.documentElement;
+var attribute = arguments[1];
+var copy = root.cloneNode(true);
+(function mark(el, copied) {
+    var child = el.firstElementChild;
+    var copiedChild = copied.firstElementChild;
+    for (; child && copiedChild; child = child.nextElementSibling, copiedChild = copiedChild.nextElementSibling) {
+        if (!child.getClientRects().length && getComputedStyle(child).display !== 'contents') {
+            copiedChild.setAttribute(attribute, '');
+        } else {
+            mark(child, copiedChild);
+        }
+    }
+})(root, copy);
+return copy.outerHTML;
+""")
+
+_css_translator = HTMLTranslator()
+_whitespace = re.compile(r"[ \t\r\f\v]+")
+
+
+@lru_cache(maxsize=512)
+def compile_locator(by: str, value: str, scoped: bool) -> etree.XPath:
+    """Compile a Selenium locator into a reusable XPath expression"""
+    if by == By.XPATH:
+        expression = value
+    elif by == By.CSS_SELECTOR:
+        prefix = "descendant::" if scoped else "descendant-or-self::"
+        expression = _css_translator.css_to_xpath(value, prefix=prefix)
+    elif by == By.ID:
+        expression = f"{'.' if scoped else ''}//*[@id='{value}']"
+    elif by == By.NAME:
+        expression = f"{'.' if scoped else ''}//*[@name='{value}']"
+    elif by == By.CLASS_NAME:
+        return compile_locator(By.CSS_SELECTOR, f".{value}", scoped)
+    elif by == By.TAG_NAME:
+        return compile_locator(By.CSS_SELECTOR, value, scoped)
+    elif by == By.LINK_TEXT:
+        expression = f"{'.' if scoped else ''}//a[normalize-space(.)='{value}']"
+    elif by == By.PARTIAL_LINK_TEXT:
+        expression = f"{'.' if scoped else ''}//a[contains(., '{value}')]"
+    else:
+        raise ValueError(f"Unsupported locator strategy: {by}")
+    return etree.XPath(expression)
+
+
+def _is_hidden(node) -> bool:
+    """Check for markup that hides an element, or the mark of an element not rendered when captured"""
+    if node.get("hidden") is not None or node.get(HIDDEN_ATTRIBUTE) is not None:
+        return True
+    style = (node.get("style") or "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+def _rendered_text(node) -> str:
+    """
+    Approximate WebElement.text: visible text with whitespace collapsed per line
+    Lines break at <br> and block elements only; line breaks in the markup are plain whitespace
+    """
+    parts = []
+
+    def text(value):
+        if value:
+            parts.append(value.replace("\n", " "))
+
+    def walk(current):
+        if not isinstance(current.tag, str):
+            # Comments and processing instructions only contribute their tail
+            text(current.tail)
+            return
+        if current.tag.lower() in NON_RENDERED_TAGS or _is_hidden(current):
+            text(current.tail)
+            return
+        tag = current.tag.lower()
+        if tag == "br" or tag in BLOCK_TAGS:
+            parts.append("\n")
+        text(current.text)
+        for child in current:
+            walk(child)
+        if tag in BLOCK_TAGS:
+            parts.append("\n")
+        if current is not node:
+            text(current.tail)
+
+    walk(node)
+    lines = [_whitespace.sub(" ", line).strip() for line in "".join(parts).split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+class SnapshotElement:
+    """Read-only element from a DOM snapshot, mirroring the WebElement read API"""
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def node(self):
+        """Underlying lxml node"""
+        return self._node
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.tag.lower()
+
+    @property
+    def text(self) -> str:
+        """Rendered text, empty for an element that is not displayed (as WebElement.text)"""
+        return _rendered_text(self._node) if self.is_displayed() else ""
+
+    def get_attribute(self, name: str):
+        """Get attribute value, or None if absent"""
+        return self._node.get(name)
+
+    def is_displayed(self) -> bool:
+        """Rendered when the snapshot was taken (see SNAPSHOT_SCRIPT), else from inline markup only"""
+        return not any(_is_hidden(node) for node in self._node.iterancestors()) and not _is_hidden(self._node)
+
+    def find_elements(self, by: str, value: str) -> List["SnapshotElement"]:
+        """Find descendants matching the locator"""
+        return [SnapshotElement(node) for node in compile_locator(by, value, True)(self._node)
+                if isinstance(node, etree._Element)]
+
+    def find_element(self, by: str, value: str) -> "SnapshotElement":
+        """Find first descendant matching the locator"""
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Not found in snapshot: {(by, value)}")
+        return elements[0]
+
+    def __repr__(self) -> str:
+        return f"<SnapshotElement {self.tag_name}>"
+
+
+class DomSnapshot:
+    """
+    Parsed copy of the page (or a subtree) answering locator queries in-process
+    The snapshot never refreshes itself - callers take a new one after state changes
+    """
+
+    def __init__(self, source: str, url: str = None):
+        self.url = url
+        self._root = lxml_html.fromstring(source or "<html></html>")
+
+    @classmethod
+    def from_driver(cls, driver, element=None) -> "DomSnapshot":
+        """Capture the full page, or a single element, with non-rendered elements marked"""
+        source = driver.execute_script(SNAPSHOT_SCRIPT, element, HIDDEN_ATTRIBUTE)
+        return cls(source, url=driver.current_url)
+
+    def find_elements(self, by: str, value: str) -> List[SnapshotElement]:
+        """Find all elements matching the locator"""
+        return [SnapshotElement(node) for node in compile_locator(by, value, False)(self._root)
+                if isinstance(node, etree._Element)]
+
+    def find_element(self, by: str, value: str) -> SnapshotElement:
+        """Find first element matching the locator"""
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Not found in snapshot: {(by, value)}")
+        return elements[0]
+
+    def count(self, locator: Tuple) -> int:
+        """Count elements matching the locator"""
+        return len(self.find_elements(*locator))
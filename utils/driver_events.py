@@ -0,0 +1,142 @@
+"""Command-level instrumentation of WebDriver instances"""
+import functools
+import logging
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class CommandListener:
+    """Receives every WebDriver command after it completes"""
+
+    def on_command(self, command: str, params: dict, duration: float, response, error: Exception):
+        """Called with the command name, its parameters, duration in seconds and response or error"""
+        pass
+
+
+class CommandStats(CommandListener):
+    """Counts driver commands and their round-trip times to expose commands per second"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.by_command: Dict[str, List] = {}
+        self._first = None
+        self._last = None
+
+    def on_command(self, command: str, params: dict, duration: float, response, error: Exception):
+        now = time.perf_counter()
+        if self._first is None:
+            self._first = now - duration
+        self._last = now
+        self.wall_seconds = self._last - self._first
+        self.count += 1
+        self.busy_seconds += duration
+        if error is not None:
+            self.errors += 1
+        totals = self.by_command.setdefault(command, [0, 0.0])
+        totals[0] += 1
+        totals[1] += duration
+
+    def merge(self, other: "CommandStats"):
+        """Add another driver's totals (wall time is summed, as drivers are measured separately)"""
+        self.count += other.count
+        self.errors += other.errors
+        self.busy_seconds += other.busy_seconds
+        self.wall_seconds += other.wall_seconds
+        for command, (count, seconds) in other.by_command.items():
+            totals = self.by_command.setdefault(command, [0, 0.0])
+            totals[0] += count
+            totals[1] += seconds
+
+    def as_dict(self) -> dict:
+        """Totals as plain data (sent from xdist workers to the controller)"""
+        return {"count": self.count, "errors": self.errors, "busy_seconds": self.busy_seconds,
+                "wall_seconds": self.wall_seconds, "by_command": self.by_command}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CommandStats":
+        stats = cls()
+        stats.count = data["count"]
+        stats.errors = data["errors"]
+        stats.busy_seconds = data["busy_seconds"]
+        stats.wall_seconds = data["wall_seconds"]
+        stats.by_command = {command: list(totals) for command, totals in data["by_command"].items()}
+        return stats
+
+    @property
+    def commands_per_second(self) -> float:
+        return self.count / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def mean_round_trip_ms(self) -> float:
+        return self.busy_seconds / self.count * 1000 if self.count else 0.0
+
+    def summary(self, top: int = 5) -> str:
+        """Human-readable totals with the most expensive commands"""
+        lines = [
+            f"{self.count} commands ({self.errors} failed) in {self.wall_seconds:.1f}s: "
+            f"{self.commands_per_second:.1f} cmd/s, mean round-trip {self.mean_round_trip_ms:.1f} ms, "
+            f"{self.busy_seconds:.1f}s waiting on the driver"
+        ]
+        slowest = sorted(self.by_command.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        for command, (count, seconds) in slowest:
+            lines.append(f"  {command}: {count}x, {seconds:.2f}s total, {seconds / count * 1000:.1f} ms mean")
+        return "\n".join(lines)
+
+
+def instrument(driver) -> List[CommandListener]:
+    """
+    Route all driver commands (including WebElement ones) through registered listeners
+    Idempotent - returns the listener list of an already instrumented driver
+    """
+    execute = driver.execute
+    listeners = getattr(execute, "listeners", None)
+    if listeners is not None:
+        return listeners
+
+    listeners = []
+
+    @functools.wraps(execute)
+    def instrumented_execute(driver_command, params=None):
+        start = time.perf_counter()
+        response, error = None, None
+        try:
+            response = execute(driver_command, params)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            for listener in listeners:
+                try:
+                    listener.on_command(driver_command, params, duration, response, error)
+                except Exception as listener_error:
+                    logger.debug(f"Command listener {listener} failed: {listener_error}")
+
+    instrumented_execute.listeners = listeners
+    driver.execute = instrumented_execute
+    return listeners
+
+
+def add_listener(driver, listener: CommandListener) -> CommandListener:
+    """Attach a listener to the driver, instrumenting it if needed"""
+    instrument(driver).append(listener)
+    return listener
+
+
+def remove_listener(driver, listener: CommandListener):
+    """Detach a listener from the driver"""
+    listeners = instrument(driver)
+    if listener in listeners:
+        listeners.remove(listener)
+
+
+def get_listener(driver, listener_type: type):
+    """Get the first attached listener of the given type, or None"""
+    listeners = getattr(driver.execute, "listeners", None) or []
+    return next((listener for listener in listeners if isinstance(listener, listener_type)), None)
@@ -0,0 +1,70 @@
+"""
+WebDriver creation shared by the pytest fixtures and standalone tools
+Selenium and webdriver-manager (which pulls in requests) are imported on first driver
+creation, keeping them out of pytest collection and single-test startup
+"""
+import logging
+from config.config import Config, Browser, BrowserConfig
+
+logger = logging.getLogger(__name__)
+
+
+def build_client_config(remote_url: str):
+    """HTTP client settings (a selenium ClientConfig) for a remote endpoint: keep-alive, pool size and command timeout"""
+    from selenium.webdriver.remote.client_config import ClientConfig
+    
+    return ClientConfig(
+        remote_server_addr=remote_url,
+        keep_alive=Config.HTTP_KEEP_ALIVE,
+        timeout=Config.HTTP_TIMEOUT,
+        # Selenium reads pool manager arguments from this nested key
+        init_args_for_pool_manager={
+            "init_args_for_pool_manager": {
+                "maxsize": Config.HTTP_POOL_SIZE,
+                "block": False,
+            }
+        },
+    )
+
+
+def create_driver(profile_dir: str = None, browser_config: BrowserConfig = None):
+    """
+    Start a browser for browser_config (default: Config.BROWSER/Config.HEADLESS), optionally
+    from a profile directory. The config is kept on the driver as driver.browser_config.
+    """
+    from selenium import webdriver
+    
+    browser_config = browser_config or BrowserConfig()
+    options = Config.get_browser_options(profile_dir=profile_dir, browser_config=browser_config)
+    if Config.REMOTE_URL:
+        logger.info(f"Connecting to remote WebDriver at {Config.REMOTE_URL} "
+                    f"(keep_alive={Config.HTTP_KEEP_ALIVE}, pool_size={Config.HTTP_POOL_SIZE})")
+        driver = webdriver.Remote(
+            command_executor=Config.REMOTE_URL,
+            options=options,
+            client_config=build_client_config(Config.REMOTE_URL)
+        )
+    elif browser_config.browser == Browser.CHROME:
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        from webdriver_manager.chrome import ChromeDriverManager
+        service = ChromeService(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=service, options=options)
+    elif browser_config.browser == Browser.FIREFOX:
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        from webdriver_manager.firefox import GeckoDriverManager
+        service = FirefoxService(GeckoDriverManager().install())
+        driver = webdriver.Firefox(service=service, options=options)
+    else:
+        raise ValueError(f"Unsupported browser: {browser_config.browser}")
+    driver.browser_config = browser_config
+    
+    # Set window size (works in all environments)
+    driver.set_window_size(1920, 1080)
+    
+    # Set page load timeout
+    driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+    
+    if Config.NETWORK_MODE != "live":
+        from utils.network_replay import network
+        network.install(driver)
+    return driver
@@ -0,0 +1,111 @@
+"""Speculative background launch of the next test's WebDriver session"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPrefetcher:
+    """
+    Launches the next browser on a background thread while the current test runs
+    launch(*args) returns an opaque session object; close(session) disposes of one that is never used.
+    A prefetched session is only handed over to an acquire() with the same launch arguments, and
+    only if alive(session) still holds - a remote session can expire while it waits.
+    """
+
+    def __init__(self, launch: Callable[..., Any], close: Callable[[Any], None],
+                 alive: Optional[Callable[[Any], bool]] = None):
+        self._launch = launch
+        self._close = close
+        self._alive = alive
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="driver-prefetch")
+        self._pending = None  # (launch arguments, future)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.startup_seconds = 0.0
+        self.hidden_seconds = 0.0
+
+    def _timed_launch(self, *args):
+        start = time.perf_counter()
+        session = self._launch(*args)
+        return session, time.perf_counter() - start
+
+    def prefetch(self, *args):
+        """Start launching a session in the background unless one is already pending"""
+        with self._lock:
+            if self._closed or self._pending is not None:
+                return
+            self._pending = (args, self._executor.submit(self._timed_launch, *args))
+
+    def _discard(self, pending):
+        """Close the session of a pending launch that will not be used"""
+        if not pending.cancel():
+            try:
+                session, _ = pending.result()
+                self._close(session)
+            except Exception as e:
+                logger.debug(f"Discarding prefetched driver: {e}")
+
+    def _is_alive(self, session) -> bool:
+        """Check a prefetched session before handing it over, closing it if it is gone"""
+        if self._alive is None or self._alive(session):
+            return True
+        logger.warning("Prefetched driver session is gone, launching synchronously")
+        try:
+            self._close(session)
+        except Exception as e:
+            logger.debug(f"Closing expired prefetched driver: {e}")
+        return False
+
+    def acquire(self, *args):
+        """
+        Hand over the prefetched session, or launch one now if none was prefetched for
+        these arguments (e.g. the next test runs on another browser) or it failed
+        """
+        with self._lock:
+            pending, self._pending = self._pending, None
+
+        if pending is not None and pending[0] != args:
+            self._discard(pending[1])
+        elif pending is not None:
+            wait_start = time.perf_counter()
+            session = None
+            try:
+                session, startup = pending[1].result()
+            except Exception as e:
+                logger.warning(f"Prefetched driver failed to start, launching synchronously: {e}")
+            else:
+                if not self._is_alive(session):
+                    session = None
+            if session is not None:
+                waited = time.perf_counter() - wait_start
+                self.hits += 1
+                self.startup_seconds += startup
+                self.hidden_seconds += max(startup - waited, 0.0)
+                logger.info(f"Using prefetched driver (startup {startup:.1f}s, waited {waited:.1f}s)")
+                return session
+
+        self.misses += 1
+        session, startup = self._timed_launch(*args)
+        self.startup_seconds += startup
+        return session
+
+    def shutdown(self):
+        """Stop prefetching and dispose of a launched-but-unused session"""
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, None
+
+        if pending is not None:
+            self._discard(pending[1])
+        self._executor.shutdown(wait=False)
+
+    def summary(self) -> str:
+        """Human-readable account of the startup latency hidden by prefetching"""
+        return (f"{self.hits} prefetched, {self.misses} launched on demand; "
+                f"hid {self.hidden_seconds:.1f}s of {self.startup_seconds:.1f}s browser startup")
@@ -0,0 +1,60 @@
+"""Per-driver cache of WebElement handles, dropped when the browser navigates or switches context"""
+import logging
+from typing import Dict, Optional, Tuple
+from utils.driver_events import CommandListener, add_listener, get_listener
+
+logger = logging.getLogger(__name__)
+
+# Commands after which no previously found element handle can be reused
+NAVIGATION_COMMANDS = {
+    "get", "refresh", "goBack", "goForward", "switchToWindow", "newWindow", "close",
+    "switchToFrame", "switchToParentFrame", "quit",
+}
+
+
+class ElementCache(CommandListener):
+    """
+    Element handles keyed by page name and (By strategy, value) of the requested locator
+    One instance per driver (see element_cache_for), shared by every page object built on it.
+    Handles are not validated on lookup: callers use them directly and treat a
+    StaleElementReferenceException as a miss (see BasePage), so a hit costs no round-trip
+    """
+
+    def __init__(self):
+        self._elements: Dict[Tuple[str, str, str], object] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def on_command(self, command: str, params: dict, duration: float, response, error: Exception):
+        if command in NAVIGATION_COMMANDS and self._elements:
+            self.clear()
+
+    @staticmethod
+    def _key(page: str, locator: Tuple) -> Tuple[str, str, str]:
+        return page, locator[0], locator[1]
+
+    def get(self, page: str, locator: Tuple) -> Optional[object]:
+        """Cached handle for the page's locator, or None"""
+        return self._elements.get(self._key(page, locator))
+
+    def put(self, page: str, locator: Tuple, element):
+        """Remember the handle found for the page's locator"""
+        self._elements[self._key(page, locator)] = element
+
+    def discard(self, page: str, locator: Tuple):
+        """Forget a handle that turned out to be stale"""
+        self._elements.pop(self._key(page, locator), None)
+        self.stale += 1
+
+    def clear(self):
+        """Forget all handles (after navigation or a window/frame switch)"""
+        self._elements.clear()
+
+    def summary(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses ({self.stale} stale)"
+
+
+def element_cache_for(driver) -> ElementCache:
+    """The driver's element cache, attached on first use"""
+    return get_listener(driver, ElementCache) or add_listener(driver, ElementCache())
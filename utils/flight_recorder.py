@@ -0,0 +1,84 @@
+"""Bounded in-memory recorder of recent driver commands, dumped only when a test fails"""
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+from utils.decorators import current_steps
+from utils.driver_events import CommandListener
+
+# Commands whose (small) response value is useful context in a trace
+VALUE_COMMANDS = {
+    "getCurrentUrl", "getTitle", "getElementText", "getElementAttribute",
+    "getElementProperty", "getElementTagName", "isElementEnabled", "isElementSelected",
+}
+# Commands whose payloads are large binaries and are never copied into the ring
+BINARY_COMMANDS = {"screenshot", "elementScreenshot", "getPageSource", "printPage"}
+MAX_VALUE_LENGTH = 200
+
+
+def _truncate(value):
+    """Keep trace entries small: cut long strings, summarise large containers"""
+    if isinstance(value, str):
+        return value if len(value) <= MAX_VALUE_LENGTH else value[:MAX_VALUE_LENGTH] + "..."
+    if isinstance(value, dict):
+        return {key: _truncate(val) for key, val in list(value.items())[:20]}
+    if isinstance(value, (list, tuple)):
+        if len(value) > 10:
+            return f"<{len(value)} items>"
+        return [_truncate(item) for item in value]
+    return value
+
+
+class FlightRecorder(CommandListener):
+    """
+    Keeps the last `capacity` driver commands with arguments, timings, URL and step context
+    Recording is a deque append of already-available data - no extra driver calls are made
+    """
+
+    def __init__(self, capacity: int = 500):
+        self._ring = deque(maxlen=capacity)
+        self._start = time.perf_counter()
+        self._url = None
+
+    def on_command(self, command: str, params: dict, duration: float, response, error: Exception):
+        value = response.get("value") if isinstance(response, dict) else None
+        if command == "get" and params:
+            self._url = params.get("url")
+        elif command == "getCurrentUrl" and value:
+            self._url = value
+
+        entry = {
+            "t": round((time.perf_counter() - self._start - duration) * 1000, 1),
+            "cmd": command,
+            "ms": round(duration * 1000, 1),
+            "url": self._url,
+            "step": " > ".join(current_steps()) or None,
+        }
+        if params and command not in BINARY_COMMANDS:
+            entry["params"] = _truncate({key: val for key, val in params.items() if key != "sessionId"})
+        if command in VALUE_COMMANDS and value is not None:
+            entry["value"] = _truncate(value)
+        elif isinstance(value, list) and command in ("findElements", "findChildElements"):
+            entry["found"] = len(value)
+        if error is not None:
+            entry["error"] = _truncate(f"{type(error).__name__}: {error}")
+        self._ring.append(entry)
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def clear(self):
+        """Discard recorded commands"""
+        self._ring.clear()
+
+    def dump(self, path: Path, context: Optional[dict] = None) -> Path:
+        """Write the ring as JSONL (optional context dict as the first line)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            if context:
+                f.write(json.dumps({"context": context}, default=str) + "\n")
+            for entry in self._ring:
+                f.write(json.dumps(entry, default=str) + "\n")
+        return path
@@ -0,0 +1,95 @@
+"""Indexed in-memory catalog of job listings, answering filter combinations without the UI"""
+import json
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def normalize(value: str) -> str:
+    """Index key of a filter value: whitespace-collapsed, case-insensitive"""
+    return " ".join((value or "").split()).lower()
+
+
+@dataclass(frozen=True)
+class Job:
+    """One job card as rendered on the open positions list"""
+    position: str
+    department: str
+    location: str
+    data_location: str = ""
+    data_team: str = ""
+
+    def key(self) -> Tuple[str, str, str]:
+        """Comparable identity of the listing (normalized position, department, location)"""
+        return normalize(self.position), normalize(self.department), normalize(self.location)
+
+
+class JobCatalog:
+    """
+    Complete job list indexed by location and department
+    Filter values match either the displayed text ('Istanbul, Turkiye') or the card's
+    data attribute ('istanbul-turkiye'), mirroring what the page's filters select on
+    """
+
+    def __init__(self, jobs: Iterable[Job]):
+        self.jobs: List[Job] = list(jobs)
+        self._by_location: Dict[str, Set[int]] = defaultdict(set)
+        self._by_department: Dict[str, Set[int]] = defaultdict(set)
+        for index, job in enumerate(self.jobs):
+            for key in (normalize(job.location), normalize(job.data_location)):
+                if key:
+                    self._by_location[key].add(index)
+            for key in (normalize(job.department), normalize(job.data_team)):
+                if key:
+                    self._by_department[key].add(index)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, str]]) -> "JobCatalog":
+        """Build from extracted dicts, ignoring keys that are not Job fields"""
+        fields = Job.__dataclass_fields__
+        return cls(Job(**{key: " ".join((value or "").split()) for key, value in record.items() if key in fields})
+                   for record in records)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def query(self, location: Optional[str] = None, department: Optional[str] = None) -> List[Job]:
+        """Jobs matching every given filter, in page order; no filter returns the whole list"""
+        matches = None
+        for index, value in ((self._by_location, location), (self._by_department, department)):
+            if value is None:
+                continue
+            found = index.get(normalize(value), set())
+            matches = found if matches is None else matches & found
+        if matches is None:
+            return list(self.jobs)
+        return [self.jobs[i] for i in sorted(matches)]
+
+    def locations(self) -> List[str]:
+        """Distinct displayed locations"""
+        return sorted({job.location for job in self.jobs})
+
+    def departments(self) -> List[str]:
+        """Distinct displayed departments"""
+        return sorted({job.department for job in self.jobs})
+
+    def combinations(self) -> Counter:
+        """Job count per (location, department) pair that has at least one job"""
+        return Counter((job.location, job.department) for job in self.jobs)
+
+    def sample_combinations(self, size: int) -> List[Tuple[str, str]]:
+        """
+        Deterministic sample of `size` non-empty filter combinations, spread evenly
+        from the most to the least populated so both large and single-job lists are covered
+        """
+        ranked = [pair for pair, _ in sorted(self.combinations().items(), key=lambda item: (-item[1], item[0]))]
+        if size >= len(ranked):
+            return ranked
+        if size <= 1:
+            return ranked[:size]
+        step = (len(ranked) - 1) / (size - 1)
+        return [ranked[round(i * step)] for i in range(size)]
+
+    def to_json(self) -> str:
+        """Serialized job list (for report attachments)"""
+        return json.dumps([asdict(job) for job in self.jobs], indent=2, ensure_ascii=False)
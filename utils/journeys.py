@@ -0,0 +1,46 @@
+"""Candidate user journeys composed from the page objects, run by the load runner and the monitor"""
+from typing import Callable, Dict
+from pages.home_page import HomePage
+from pages.qa_careers_page import QACareersPage
+from pages.lever_page import LeverPage
+
+# Default filter values of the QA job search
+QA_LOCATION = "Istanbul, Turkiye"
+QA_DEPARTMENT = "Quality Assurance"
+QA_DATA_LOCATION = "istanbul-turkiye"
+QA_DATA_TEAM = "qualityassurance"
+
+
+def browse_careers(driver):
+    """Home page -> Company menu -> Careers page with its blocks"""
+    home_page = HomePage(driver)
+    home_page.get()
+    careers_page = home_page.navigate_to_careers()
+    careers_page.is_loaded()
+
+
+def search_qa_jobs(driver):
+    """QA careers page -> all QA jobs -> location and department filters -> listings"""
+    qa_page = QACareersPage(driver)
+    qa_page.get()
+    qa_page.click_see_all_jobs()
+    qa_page.filter_by_location(QA_LOCATION)
+    qa_page.filter_by_department(QA_DEPARTMENT)
+    jobs = qa_page.get_job_listings(from_snapshot=True)
+    assert len(jobs) > 0, "No jobs found after applying filters"
+    return qa_page
+
+
+def apply_for_qa_job(driver):
+    """Full candidate flow: careers browse, QA job search, then the Lever application form"""
+    browse_careers(driver)
+    qa_page = search_qa_jobs(driver)
+    qa_page.click_view_role_of_specific_job(QA_DATA_LOCATION, QA_DATA_TEAM)
+    LeverPage(driver).is_loaded()
+
+
+JOURNEYS: Dict[str, Callable] = {
+    "browse": browse_careers,
+    "search": search_qa_jobs,
+    "apply": apply_for_qa_job,
+}
@@ -0,0 +1,210 @@
+"""
+Synthetic-user load generation over the page-object journeys
+
+Runs N virtual users, each driving its own headless browser through a journey in a
+loop. Users start on a linear ramp-up schedule; every allure_step a journey executes
+is timed through the step listeners, giving per-step latency percentiles and throughput.
+Point BASE_URL at a local stand-in of the site to load-test it instead of production.
+
+Usage:
+    python -m utils.load_runner [--users 5] [--ramp-up 30] [--duration 300 | --iterations 1]
+                                [--journey apply] [--browser chrome] [--think-time 0] [--json out.json]
+"""
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from config.config import Config, Browser, BrowserConfig
+from utils.decorators import add_step_listener, remove_step_listener
+from utils.driver_factory import create_driver
+from utils.results_aggregator import DurationStats
+
+logger = logging.getLogger(__name__)
+
+
+class LoadStats:
+    """Thread-safe latency and outcome totals of a load run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps: Dict[str, DurationStats] = {}
+        self.journeys = DurationStats()
+        self.errors: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def on_step(self, event: str, name: str, duration: float, error: Exception):
+        """Step listener: record every finished step"""
+        if event != "end":
+            return
+        with self._lock:
+            self.steps.setdefault(name, DurationStats()).add(duration, error is not None)
+
+    def record_journey(self, duration: float, error: Optional[Exception]):
+        with self._lock:
+            self.journeys.add(duration, error is not None)
+            if error is not None:
+                key = f"{type(error).__name__}: {str(error).splitlines()[0][:120] if str(error) else ''}"
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def to_dict(self) -> Dict:
+        return {
+            "elapsed": self.elapsed,
+            "journeys": self.journeys.count,
+            "failed": self.journeys.failed,
+            "throughput_per_minute": self.journeys.count / self.elapsed * 60 if self.elapsed else 0.0,
+            "journey_seconds": self.journeys.percentiles(),
+            "steps": {name: {"count": stats.count, "failed": stats.failed, "max": stats.max,
+                             "seconds": stats.percentiles()}
+                      for name, stats in self.steps.items()},
+            "errors": self.errors,
+        }
+
+    def report(self) -> str:
+        """Plain-text summary: throughput, journey and per-step latency percentiles, errors"""
+        data = self.to_dict()
+        journey = data["journey_seconds"]
+        lines = [
+            f"{data['journeys']} journeys ({data['failed']} failed) in {data['elapsed']:.0f}s: "
+            f"{data['throughput_per_minute']:.1f} journeys/min",
+            f"Journey latency: p50 {journey[50]:.1f}s, p90 {journey[90]:.1f}s, p95 {journey[95]:.1f}s",
+            "",
+            f"{'Step':<60} {'Runs':>5} {'Fail':>5} {'p50':>7} {'p90':>7} {'p95':>7} {'Max':>7}",
+        ]
+        for name, step in sorted(data["steps"].items(), key=lambda item: item[1]["seconds"][95], reverse=True):
+            seconds = step["seconds"]
+            lines.append(f"{name[:60]:<60} {step['count']:>5} {step['failed']:>5} "
+                         f"{seconds[50]:>7.2f} {seconds[90]:>7.2f} {seconds[95]:>7.2f} {step['max']:>7.2f}")
+        if data["errors"]:
+            lines += ["", "Errors:"]
+            lines += [f"  {count}x {error}" for error, count in sorted(data["errors"].items(), key=lambda item: -item[1])]
+        return "\n".join(lines)
+
+
+class LoadRunner:
+    """Virtual users on their own threads, each with one headless browser reused across iterations"""
+
+    def __init__(self, journey, users: int, ramp_up: float = 0, duration: float = 0,
+                 iterations: int = 1, think_time: float = 0, browser_config: BrowserConfig = None):
+        self.journey = journey
+        self.browser_config = browser_config or BrowserConfig(headless=True)
+        self.users = users
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.iterations = iterations
+        self.think_time = think_time
+        self.stats = LoadStats()
+        self._stop = threading.Event()
+        self._launch_lock = threading.Lock()  # Driver binaries are resolved/downloaded one at a time
+
+    def start_offset(self, user: int) -> float:
+        """Seconds after the run start at which a user begins (linear ramp-up)"""
+        return self.ramp_up * user / self.users if self.users > 1 else 0.0
+
+    def _launch(self):
+        with self._launch_lock:
+            return create_driver(browser_config=self.browser_config)
+
+    def _user(self, user: int):
+        if self._stop.wait(self.start_offset(user)):
+            return
+        driver = None
+        iteration = 0
+        try:
+            while not self._stop.is_set():
+                if not self.duration and iteration >= self.iterations:
+                    break
+                iteration += 1
+                if driver is None:
+                    driver = self._launch()
+                start = time.perf_counter()
+                error = None
+                try:
+                    self.journey(driver)
+                except Exception as e:
+                    error = e
+                    logger.warning(f"User {user} iteration {iteration} failed: {e}")
+                    # Start the next iteration from a fresh browser
+                    self._quit(driver)
+                    driver = None
+                self.stats.record_journey(time.perf_counter() - start, error)
+                if self.think_time:
+                    self._stop.wait(self.think_time)
+        except Exception as e:
+            logger.error(f"User {user} stopped: {e}")
+            self.stats.record_journey(0.0, e)
+        finally:
+            if driver is not None:
+                self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Closing browser: {e}")
+
+    def run(self) -> LoadStats:
+        """Run all users to completion (or until the duration elapses) and return the stats"""
+        add_step_listener(self.stats.on_step)
+        threads = [threading.Thread(target=self._user, args=(user,), name=f"user-{user}", daemon=True)
+                   for user in range(self.users)]
+        self.stats.started = time.perf_counter()
+        try:
+            for thread in threads:
+                thread.start()
+            deadline = self.stats.started + self.duration if self.duration else None
+            for thread in threads:
+                while thread.is_alive():
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        self._stop.set()  # Users finish their current journey, then exit
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            logger.warning("Interrupted, waiting for users to finish their current journey")
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            self.stats.finished = time.perf_counter()
+            remove_step_listener(self.stats.on_step)
+        return self.stats
+
+
+def main(argv=None) -> int:
+    from utils.journeys import JOURNEYS
+
+    parser = argparse.ArgumentParser(description="Run concurrent synthetic users through page-object journeys")
+    parser.add_argument("--users", type=int, default=5, help="Concurrent virtual users (one browser each)")
+    parser.add_argument("--ramp-up", type=float, default=30, help="Seconds over which users are started")
+    parser.add_argument("--duration", type=float, default=0, help="Keep looping journeys for this many seconds")
+    parser.add_argument("--iterations", type=int, default=1, help="Journeys per user when no duration is set")
+    parser.add_argument("--journey", choices=sorted(JOURNEYS), default="apply", help="Journey to run")
+    parser.add_argument("--browser", choices=[browser.value for browser in Browser], default="chrome")
+    parser.add_argument("--think-time", type=float, default=0, help="Pause between a user's journeys")
+    parser.add_argument("--json", dest="json_path", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s')
+    Config.SCREENSHOT_ON_FAILURE = False  # Concurrent users would flood the screenshot directory
+
+    print(f"{args.users} users on {Config.BASE_URL} ({args.journey} journey, ramp-up {args.ramp_up:.0f}s)")
+    stats = LoadRunner(JOURNEYS[args.journey], args.users, ramp_up=args.ramp_up, duration=args.duration,
+                       iterations=args.iterations, think_time=args.think_time,
+                       browser_config=BrowserConfig(Browser(args.browser), headless=True)).run()
+    print(stats.report())
+    if args.json_path:
+        Path(args.json_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json_path).write_text(json.dumps(stats.to_dict(), indent=2))
+    return 1 if stats.journeys.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Synthetic monitoring daemon for the careers journeys
+
+Runs the selected journeys from utils/journeys.py on a schedule in one persistent
+headless browser, replacing the browser when it crashes or stops responding. After
+every run it rewrites a Prometheus text-format metrics file (for the node_exporter
+textfile collector) and appends a record to a size-rotated JSONL log. The locator
+repository is loaded once for the life of the process; each run builds fresh page
+objects on the current browser.
+
+Usage:
+    python -m utils.monitor [--journeys browse,apply] [--interval 300] [--metrics FILE]
+                            [--jsonl FILE] [--runs N] [--browser chrome]
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Deque, Dict, List
+from config.config import Config, Browser, BrowserConfig
+from utils.decorators import add_step_listener, remove_step_listener, current_steps
+from utils.driver_factory import create_driver
+from utils.results_aggregator import percentile
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "careers_monitor"
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class JourneyMetrics:
+    """Rolling window of one journey's outcomes and step latencies"""
+
+    def __init__(self, window: int):
+        self.runs: Deque[bool] = deque(maxlen=window)
+        self.durations: Deque[float] = deque(maxlen=window)
+        self.steps: Dict[str, Deque[float]] = {}
+        self.window = window
+        self.total = {"success": 0, "failure": 0}
+        self.last_duration = 0.0
+        self.last_run = 0.0
+        self.last_success = 0.0
+
+    def record(self, ok: bool, duration: float, steps: List[Dict]):
+        self.runs.append(ok)
+        self.durations.append(duration)
+        self.total["success" if ok else "failure"] += 1
+        self.last_duration = duration
+        self.last_run = time.time()
+        if ok:
+            self.last_success = self.last_run
+        for step in steps:
+            self.steps.setdefault(step["name"], deque(maxlen=self.window)).append(step["duration"])
+
+    @property
+    def success_ratio(self) -> float:
+        return sum(self.runs) / len(self.runs) if self.runs else 0.0
+
+
+def _label(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Monitor:
+    """Scheduler, persistent browser and metrics writers"""
+
+    def __init__(self, journeys: Dict[str, Callable], interval: float, metrics_file: str = None,
+                 jsonl_file: str = None, window: int = None, launch: Callable = create_driver):
+        self.journeys = journeys
+        self.interval = interval
+        self.metrics_file = Path(metrics_file or Config.MONITOR_METRICS_FILE)
+        self.jsonl_file = Path(jsonl_file or Config.MONITOR_JSONL_FILE)
+        self.metrics = {name: JourneyMetrics(window or Config.MONITOR_WINDOW) for name in journeys}
+        self.browser_restarts = 0
+        self._launch = launch
+        self._driver = None
+        self._steps: List[Dict] = []
+        self._stop = threading.Event()
+
+    # Browser ----------------------------------------------------------------
+
+    def _browser(self):
+        """The persistent browser, (re)started if it is missing or no longer responds"""
+        if self._driver is not None:
+            try:
+                handles = self._driver.window_handles
+                # Journeys may leave extra tabs (View Role opens Lever); keep only the first
+                for handle in handles[1:]:
+                    self._driver.switch_to.window(handle)
+                    self._driver.close()
+                self._driver.switch_to.window(handles[0])
+                return self._driver
+            except Exception as e:
+                logger.warning(f"Browser not responding, restarting it: {e}")
+                self._quit()
+                self.browser_restarts += 1
+        self._driver = self._launch()
+        return self._driver
+
+    def _quit(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                logger.debug(f"Closing browser: {e}")
+            self._driver = None
+
+    # Runs -------------------------------------------------------------------
+
+    def _on_step(self, event: str, name: str, duration: float, error: Exception):
+        if event == "end":
+            self._steps.append({"name": name, "duration": round(duration, 3), "ok": error is None,
+                                "depth": len(current_steps())})
+
+    def run_journey(self, name: str) -> Dict:
+        """Run one journey and record its outcome"""
+        self._steps = []
+        start = time.perf_counter()
+        error = None
+        try:
+            self.journeys[name](self._browser())
+        except Exception as e:
+            error = e
+            logger.warning(f"Journey {name} failed: {e}")
+        duration = time.perf_counter() - start
+
+        self.metrics[name].record(error is None, duration, self._steps)
+        record = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "journey": name,
+            "status": "success" if error is None else "failure",
+            "duration": round(duration, 3),
+            "error": f"{type(error).__name__}: {error}"[:500] if error else None,
+            "steps": self._steps,
+            "browser_restarts": self.browser_restarts,
+        }
+        self._append_jsonl(record)
+        self.write_metrics()
+        return record
+
+    def run(self, max_runs: int = 0):
+        """Run every journey each interval until stopped (or max_runs rounds have run)"""
+        add_step_listener(self._on_step)
+        rounds = 0
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                for name in self.journeys:
+                    if self._stop.is_set():
+                        break
+                    record = self.run_journey(name)
+                    logger.info(f"{name}: {record['status']} in {record['duration']:.1f}s")
+                rounds += 1
+                if max_runs and rounds >= max_runs:
+                    break
+                self._stop.wait(max(self.interval - (time.monotonic() - started), 0))
+        finally:
+            remove_step_listener(self._on_step)
+            self._quit()
+
+    def stop(self, *_):
+        """Finish the current journey, then exit (also used as a signal handler)"""
+        logger.info("Stopping monitor after the current journey")
+        self._stop.set()
+
+    # Output -----------------------------------------------------------------
+
+    def _append_jsonl(self, record: Dict):
+        """Append a run record, rotating the file to <name>.1 once it exceeds the size limit"""
+        self.jsonl_file.parent.mkdir(parents=True, exist_ok=True)
+        if self.jsonl_file.exists() and self.jsonl_file.stat().st_size > Config.MONITOR_JSONL_MAX_BYTES:
+            os.replace(self.jsonl_file, self.jsonl_file.with_name(self.jsonl_file.name + ".1"))
+        with open(self.jsonl_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def render_metrics(self) -> str:
+        """Current metrics in Prometheus text exposition format"""
+        p = METRIC_PREFIX
+        lines = [
+            f"# HELP {p}_journey_runs_total Journey runs by outcome",
+            f"# TYPE {p}_journey_runs_total counter",
+        ]
+        for name, metrics in self.metrics.items():
+            for status, count in metrics.total.items():
+                lines.append(f'{p}_journey_runs_total{{journey="{_label(name)}",status="{status}"}} {count}')
+
+        gauges = [
+            ("journey_success_ratio", "Success ratio over the rolling window of runs",
+             lambda m: m.success_ratio),
+            ("journey_duration_seconds", "Duration of the last run", lambda m: m.last_duration),
+            ("journey_last_run_timestamp_seconds", "Unix time of the last run", lambda m: m.last_run),
+            ("journey_last_success_timestamp_seconds", "Unix time of the last successful run",
+             lambda m: m.last_success),
+        ]
+        for metric, help_text, value in gauges:
+            lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} gauge"]
+            for name, metrics in self.metrics.items():
+                if metrics.runs:
+                    lines.append(f'{p}_{metric}{{journey="{_label(name)}"}} {value(metrics):.6g}')
+
+        lines += [f"# HELP {p}_step_duration_seconds Step latency quantiles over the rolling window",
+                  f"# TYPE {p}_step_duration_seconds summary"]
+        for name, metrics in self.metrics.items():
+            for step, durations in metrics.steps.items():
+                labels = f'journey="{_label(name)}",step="{_label(step)}"'
+                ordered = sorted(durations)
+                for quantile in QUANTILES:
+                    lines.append(f'{p}_step_duration_seconds{{{labels},quantile="{quantile}"}} '
+                                 f'{percentile(ordered, quantile * 100):.6g}')
+                lines.append(f"{p}_step_duration_seconds_sum{{{labels}}} {sum(ordered):.6g}")
+                lines.append(f"{p}_step_duration_seconds_count{{{labels}}} {len(ordered)}")
+
+        lines += [f"# HELP {p}_browser_restarts_total Browsers replaced after a crash",
+                  f"# TYPE {p}_browser_restarts_total counter",
+                  f"{p}_browser_restarts_total {self.browser_restarts}"]
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self):
+        """Rewrite the metrics file atomically so a collector never reads a partial file"""
+        self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.metrics_file.with_name(self.metrics_file.name + ".tmp")
+        temp_path.write_text(self.render_metrics(), encoding="utf-8")
+        os.replace(temp_path, self.metrics_file)
+
+
+def main(argv=None) -> int:
+    from utils.journeys import JOURNEYS
+
+    parser = argparse.ArgumentParser(description="Run careers journeys continuously as synthetic monitors")
+    parser.add_argument("--journeys", default="browse,apply",
+                        help=f"Comma-separated journeys to run ({', '.join(sorted(JOURNEYS))})")
+    parser.add_argument("--interval", type=float, default=Config.MONITOR_INTERVAL, help="Seconds between rounds")
+    parser.add_argument("--metrics", default=Config.MONITOR_METRICS_FILE, help="Prometheus text file to write")
+    parser.add_argument("--jsonl", default=Config.MONITOR_JSONL_FILE, help="JSONL run log to append to")
+    parser.add_argument("--runs", type=int, default=0, help="Stop after this many rounds (0 runs forever)")
+    parser.add_argument("--browser", choices=[browser.value for browser in Browser], default="chrome")
+    args = parser.parse_args(argv)
+
+    journeys = {}
+    for name in filter(None, (name.strip() for name in args.journeys.split(","))):
+        if name not in JOURNEYS:
+            parser.error(f"Unknown journey: {name}")
+        journeys[name] = JOURNEYS[name]
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    Config.SCREENSHOT_ON_FAILURE = False  # Failures are reported through the metrics and run log
+
+    launch = functools.partial(create_driver, browser_config=BrowserConfig(Browser(args.browser), headless=True))
+    monitor = Monitor(journeys, args.interval, metrics_file=args.metrics, jsonl_file=args.jsonl, launch=launch)
+    signal.signal(signal.SIGTERM, monitor.stop)
+    signal.signal(signal.SIGINT, monitor.stop)
+    monitor.run(max_runs=args.runs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+"""
+Record and replay of the careers pages' AJAX responses
+
+A shim injected before any page script (Chrome DevTools Page.addScriptToEvaluateOnNewDocument)
+wraps XMLHttpRequest and fetch for URLs matching Config.NETWORK_URL_PATTERNS. A request is
+identified by its method and URL without cache-buster parameters (Config.NETWORK_VOLATILE_PARAMS)
+plus, for non-GET requests, a hash of the normalized body - the WordPress AJAX calls all POST to
+admin-ajax.php and differ only in their form fields:
+- record: responses are kept in the tab's sessionStorage (surviving same-origin navigation)
+  and collected into a JSON fixture file when the test ends (under xdist, into one file per
+  worker, merged into the fixture file when the session finishes)
+- replay: matching requests are answered from the fixture file after Config.NETWORK_REPLAY_DELAY
+  milliseconds, without touching the network; unrecorded URLs still go to the live site
+Chromium browsers only; other browsers run live with a warning.
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List
+from selenium.webdriver.support.ui import WebDriverWait
+from config.config import Config, BrowserConfig
+from utils.read_cache import register_read_only_script
+
+logger = logging.getLogger(__name__)
+
+NETWORK_MODES = ("live", "record", "replay")
+
+# Runs in every document before page scripts; __networkConfig is prepended by NetworkInterceptor
+SHIM_SCRIPT = """
+(function () {
+    var config = __networkConfig;
+    var patterns = config.patterns.map(function (p) { return new RegExp(p); });
+    var volatile = config.volatile_params;
+    var STORE = '__networkRecording';
+    var MISSES = '__networkReplayMisses';
+
+    function matches(url) {
+        return patterns.some(function (p) { return p.test(url); });
+    }
+    function absolute(url) {
+        try { return new URL(url, location.href).href; } catch (e) { return String(url); }
+    }
+    // Parameters in a stable order, without cache busters
+    function stableParams(params) {
+        volatile.forEach(function (name) { params.delete(name); });
+        params.sort();
+        return params.toString();
+    }
+    function normalizeUrl(url) {
+        try {
+            var parsed = new URL(url);
+            var query = stableParams(parsed.searchParams);
+            return parsed.origin + parsed.pathname + (query ? '?' + query : '');
+        } catch (e) { return url.split('#')[0]; }
+    }
+    function normalizeBody(body) {
+        if (body === undefined || body === null) { return ''; }
+        if (typeof URLSearchParams !== 'undefined' && body instanceof URLSearchParams) {
+            return stableParams(new URLSearchParams(body.toString()));
+        }
+        if (typeof FormData !== 'undefined' && body instanceof FormData) {
+            var fields = new URLSearchParams();
+            body.forEach(function (value, name) {
+                if (typeof value === 'string') { fields.append(name, value); }
+            });
+            return stableParams(fields);
+        }
+        if (typeof body !== 'string') { return ''; }
+        try { return JSON.stringify(sortKeys(JSON.parse(body))); } catch (e) { /* not JSON */ }
+        return body.indexOf('=') >= 0 ? stableParams(new URLSearchParams(body)) : body;
+    }
+    function sortKeys(value) {
+        if (Array.isArray(value)) { return value.map(sortKeys); }
+        if (value && typeof value === 'object') {
+            var sorted = {};
+            Object.keys(value).sort().forEach(function (key) { sorted[key] = sortKeys(value[key]); });
+            return sorted;
+        }
+        return value;
+    }
+    function hash(text) {
+        // FNV-1a, 32 bits
+        var h = 0x811c9dc5;
+        for (var i = 0; i < text.length; i++) {
+            h ^= text.charCodeAt(i);
+            h = Math.imul(h, 0x01000193) >>> 0;
+        }
+        return ('0000000' + h.toString(16)).slice(-8);
+    }
+    function requestKey(method, url, body) {
+        var key = method + ' ' + normalizeUrl(url);
+        return method === 'GET' || method === 'HEAD' ? key : key + ' body:' + hash(normalizeBody(body));
+    }
+    function lookup(key) {
+        return config.responses[key] || null;
+    }
+    function append(key, entry) {
+        try {
+            var items = JSON.parse(sessionStorage.getItem(key) || '[]');
+            items.push(entry);
+            sessionStorage.setItem(key, JSON.stringify(items));
+        } catch (e) { /* storage full or unavailable */ }
+    }
+    function record(key, status, contentType, body) {
+        append(STORE, {key: key, status: status, content_type: contentType, body: body});
+    }
+    // Counts matching requests in flight in replay mode; returns the function ending one
+    function track() {
+        window.__networkPending = (window.__networkPending || 0) + 1;
+        var done = false;
+        return function () {
+            if (!done) {
+                done = true;
+                window.__networkPending--;
+            }
+        };
+    }
+
+    var open = XMLHttpRequest.prototype.open;
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__request = {method: String(method).toUpperCase(), url: absolute(url)};
+        return open.apply(this, arguments);
+    };
+    XMLHttpRequest.prototype.send = function (requestBody) {
+        var xhr = this;
+        var request = xhr.__request;
+        if (!request || !matches(request.url)) {
+            return send.apply(xhr, arguments);
+        }
+        var key = requestKey(request.method, request.url, requestBody);
+        if (config.mode === 'record') {
+            xhr.addEventListener('loadend', function () {
+                var body = (xhr.responseType === '' || xhr.responseType === 'text')
+                    ? xhr.responseText : JSON.stringify(xhr.response);
+                record(key, xhr.status, xhr.getResponseHeader('content-type') || '', body);
+            });
+            return send.apply(xhr, arguments);
+        }
+        var stored = lookup(key);
+        var finished = track();
+        if (!stored) {
+            append(MISSES, key);
+            xhr.addEventListener('loadend', finished);
+            return send.apply(xhr, arguments);
+        }
+        var response = stored.body;
+        if (xhr.responseType === 'json') {
+            try { response = JSON.parse(stored.body); } catch (e) { response = null; }
+        }
+        setTimeout(function () {
+            var define = function (name, value) {
+                Object.defineProperty(xhr, name, {configurable: true, value: value});
+            };
+            define('readyState', 4);
+            define('status', stored.status);
+            define('statusText', 'OK');
+            define('responseURL', request.url);
+            define('responseText', stored.body);
+            define('response', response);
+            define('getResponseHeader', function (name) {
+                return name.toLowerCase() === 'content-type' ? stored.content_type : null;
+            });
+            define('getAllResponseHeaders', function () {
+                return 'content-type: ' + stored.content_type + '\\r\\n';
+            });
+            try {
+                ['readystatechange', 'load', 'loadend'].forEach(function (type) {
+                    xhr.dispatchEvent(new Event(type));
+                });
+            } finally {
+                finished();
+            }
+        }, config.delay);
+    };
+
+    var nativeFetch = window.fetch;
+    if (nativeFetch) {
+        window.fetch = function (input, init) {
+            var url = absolute(typeof input === 'string' ? input : input.url);
+            var method = String((init && init.method) || (input && input.method) || 'GET').toUpperCase();
+            if (!matches(url)) {
+                return nativeFetch.apply(this, arguments);
+            }
+            var key = requestKey(method, url, init && init.body);
+            if (config.mode === 'record') {
+                return nativeFetch.apply(this, arguments).then(function (response) {
+                    response.clone().text().then(function (body) {
+                        record(key, response.status, response.headers.get('content-type') || '', body);
+                    });
+                    return response;
+                });
+            }
+            var stored = lookup(key);
+            var finished = track();
+            if (!stored) {
+                append(MISSES, key);
+                return nativeFetch.apply(this, arguments).then(function (response) {
+                    finished();
+                    return response;
+                }, function (error) {
+                    finished();
+                    throw error;
+                });
+            }
+            return new Promise(function (resolve) {
+                setTimeout(function () {
+                    resolve(new Response(stored.body, {
+                        status: stored.status, headers: {'content-type': stored.content_type}
+                    }));
+                    // Handlers chained on the response run as microtasks, before the count is read again
+                    finished();
+                }, config.delay);
+            });
+        };
+    }
+})();
+"""
+
+# Returns and clears what the shim stored in this tab
+COLLECT_SCRIPT = register_read_only_script("""
+var result = {
+    recorded: JSON.parse(sessionStorage.getItem('__networkRecording') || '[]'),
+    misses: JSON.parse(sessionStorage.getItem('__networkReplayMisses') || '[]')
+};
+sessionStorage.removeItem('__networkRecording');
+sessionStorage.removeItem('__networkReplayMisses');
+return result;
+""")
+
+# Number of intercepted requests of the current document still in flight (replay mode)
+PENDING_SCRIPT = register_read_only_script("return window.__networkPending || 0;")
+
+
+class NetworkInterceptor:
+    """Installs the shim into drivers and maintains the fixture file (responses keyed by 'METHOD url [body:hash]')"""
+
+    def __init__(self, mode: str = None, fixture_file: str = None, patterns: List[str] = None, delay: int = None):
+        self.mode = mode or Config.NETWORK_MODE
+        if self.mode not in NETWORK_MODES:
+            raise ValueError(f"Unsupported network mode: {self.mode} (expected one of {NETWORK_MODES})")
+        self.fixture_file = Path(fixture_file or Config.NETWORK_FIXTURE_FILE)
+        self.patterns = patterns if patterns is not None else Config.NETWORK_URL_PATTERNS
+        self.delay = Config.NETWORK_REPLAY_DELAY if delay is None else delay
+        self.recorded = 0
+        self.misses: Dict[str, int] = {}
+        self.worker = os.getenv("PYTEST_XDIST_WORKER")
+        self._lock = threading.Lock()
+        self._responses: Dict[str, Dict] = None
+        self._recorded: Dict[str, Dict] = {}  # Responses recorded by this process
+
+    @property
+    def responses(self) -> Dict[str, Dict]:
+        """Recorded responses from the fixture file, read once"""
+        if self._responses is None:
+            self._responses = {}
+            if self.fixture_file.exists():
+                self._responses = json.loads(self.fixture_file.read_text(encoding="utf-8"))
+            elif self.mode == "replay":
+                logger.warning(f"No network fixtures at {self.fixture_file}; requests will go to the live site")
+        return self._responses
+
+    def _shim(self) -> str:
+        config = {
+            "mode": self.mode,
+            "patterns": self.patterns,
+            "volatile_params": Config.NETWORK_VOLATILE_PARAMS,
+            "delay": self.delay,
+            "responses": self.responses if self.mode == "replay" else {},
+        }
+        return f"var __networkConfig = {json.dumps(config)};\n{SHIM_SCRIPT}"
+
+    def install(self, driver) -> bool:
+        """Inject the shim into every document the driver opens from now on"""
+        if self.mode == "live":
+            return False
+        if not hasattr(driver, "execute_cdp_cmd"):
+            logger.warning(f"Network {self.mode} needs a Chromium browser; {BrowserConfig.of(driver).name} runs live")
+            return False
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": self._shim()})
+        logger.info(f"Network {self.mode} enabled for {len(self.patterns)} URL patterns")
+        return True
+
+    def collect(self, driver):
+        """
+        Gather recordings and replay misses from every open tab; in record mode, save them
+        A crashed browser or closed window loses what its tabs held but never raises.
+        """
+        if self.mode == "live" or not hasattr(driver, "execute_cdp_cmd"):
+            return
+        recorded, misses = [], []
+        try:
+            current = driver.current_window_handle
+            handles = driver.window_handles
+        except Exception as e:
+            logger.warning(f"Network data not collected, the browser session is gone: {e}")
+            return
+        for handle in handles:
+            try:
+                if handle != current:
+                    driver.switch_to.window(handle)
+                result = driver.execute_script(COLLECT_SCRIPT) or {}
+                recorded += result.get("recorded", [])
+                misses += result.get("misses", [])
+            except Exception as e:
+                logger.debug(f"Collecting network data from window {handle}: {e}")
+        try:
+            driver.switch_to.window(current)
+        except Exception as e:
+            logger.debug(f"Switching back to window {current}: {e}")
+
+        with self._lock:
+            for miss in misses:
+                self.misses[miss] = self.misses.get(miss, 0) + 1
+            if recorded:
+                self._save(recorded)
+
+    def wait_until_idle(self, driver, timeout: float = None):
+        """
+        Wait until no intercepted request of the current page is in flight - in replay mode,
+        until the replayed responses have been delivered. Call right after the action that
+        sends the requests; raises TimeoutException.
+        """
+        WebDriverWait(driver, timeout or Config.DEFAULT_TIMEOUT, poll_frequency=0.05).until(
+            lambda d: d.execute_script(PENDING_SCRIPT) == 0
+        )
+
+    def _worker_file(self, worker: str) -> Path:
+        return self.fixture_file.with_name(f"{self.fixture_file.stem}.{worker}{self.fixture_file.suffix}")
+
+    @staticmethod
+    def _write(path: Path, responses: Dict[str, Dict]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_text(json.dumps(responses, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(temp_path, path)
+
+    def _save(self, recorded: List[Dict]):
+        """
+        Merge responses into the fixture file (the latest recording of a request wins)
+        An xdist worker writes only its own recordings to a file of its own instead, as
+        workers rewriting the shared file would drop each other's responses.
+        """
+        for entry in recorded:
+            self._recorded[entry["key"]] = {
+                "status": entry["status"],
+                "content_type": entry["content_type"],
+                "body": entry["body"],
+            }
+        self.responses.update(self._recorded)
+        self.recorded += len(recorded)
+        path = self._worker_file(self.worker) if self.worker else self.fixture_file
+        self._write(path, self._recorded if self.worker else self.responses)
+        logger.info(f"Recorded {len(recorded)} network responses into {path}")
+
+    def merge_worker_files(self) -> int:
+        """Fold the xdist workers' recordings into the fixture file; returns the responses merged"""
+        worker_files = sorted(self.fixture_file.parent.glob(self._worker_file("gw*").name),
+                              key=lambda path: path.stat().st_mtime)
+        if not worker_files:
+            return 0
+        self._responses = None  # Re-read: the file may have changed since this process loaded it
+        responses = self.responses
+        merged = 0
+        for worker_file in worker_files:
+            recorded = json.loads(worker_file.read_text(encoding="utf-8"))
+            responses.update(recorded)
+            merged += len(recorded)
+        self._write(self.fixture_file, responses)
+        for worker_file in worker_files:
+            worker_file.unlink()
+        self.recorded += merged
+        logger.info(f"Merged {merged} network responses from {len(worker_files)} workers into {self.fixture_file}")
+        return merged
+
+    def summary(self) -> str:
+        """Human-readable totals for the run"""
+        if self.mode == "record":
+            return f"{self.recorded} responses recorded, {len(self.responses)} in {self.fixture_file}"
+        lines = [f"{len(self.responses)} recorded responses from {self.fixture_file}, "
+                 f"{sum(self.misses.values())} requests not in the fixtures (sent live)"]
+        lines += [f"  {count}x {miss}" for miss, count in sorted(self.misses.items(), key=lambda item: -item[1])]
+        return "\n".join(lines)
+
+
+network = NetworkInterceptor()
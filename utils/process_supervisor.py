@@ -0,0 +1,217 @@
+"""
+Supervision of the driver and browser processes each WebDriver session spawns
+
+Every local driver's process tree (chromedriver/geckodriver and the browser processes under
+it) is sampled in the background for CPU time and peak RSS, and recorded in a pid registry on
+disk. Processes still alive after quit are killed; at session start and end, trees registered
+by a pytest process that no longer exists (a crashed run or a killed xdist worker) are reaped.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import psutil
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+# (pid, create_time) identifies a process across pid reuse
+ProcessKey = Tuple[int, float]
+
+
+def _process(key: ProcessKey) -> Optional[psutil.Process]:
+    """The process with this pid if it is still the one that was recorded, else None"""
+    try:
+        process = psutil.Process(key[0])
+        return process if abs(process.create_time() - key[1]) < 0.01 else None
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+def _kill(keys) -> int:
+    """Terminate (then kill) the recorded processes that are still alive; returns how many were running"""
+    processes = [process for process in map(_process, keys) if process is not None]
+    for process in processes:
+        try:
+            process.terminate()
+        except psutil.NoSuchProcess:
+            pass
+    _, alive = psutil.wait_procs(processes, timeout=3)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+    return len(processes)
+
+
+class ProcessTree:
+    """Resource usage and registry entry of one driver's process tree"""
+
+    def __init__(self, root: psutil.Process, label: str, registry_file: Path):
+        self.root = root
+        self.label = label
+        self.registry_file = registry_file
+        self.seen: Dict[ProcessKey, float] = {}  # Last CPU seconds of every process seen in the tree
+        self.peak_rss = 0
+        self.closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def cpu_seconds(self) -> float:
+        return sum(self.seen.values())
+
+    def sample(self):
+        """Add the current CPU times and total RSS of the tree"""
+        try:
+            processes = [self.root] + self.root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return
+        rss = 0
+        new_process = False
+        with self._lock:
+            if self.closed:
+                return
+            for process in processes:
+                try:
+                    with process.oneshot():
+                        key = (process.pid, process.create_time())
+                        cpu = process.cpu_times()
+                        rss += process.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+                new_process = new_process or key not in self.seen
+                self.seen[key] = max(self.seen.get(key, 0.0), cpu.user + cpu.system)
+            self.peak_rss = max(self.peak_rss, rss)
+            if new_process:
+                self._write_registry()
+
+    def _write_registry(self):
+        """Record the tree with its owner, so another run can reap it if this process dies"""
+        owner = psutil.Process()
+        entry = {
+            "owner": [owner.pid, owner.create_time()],
+            "label": self.label,
+            "processes": [list(key) for key in self.seen],
+        }
+        temp_path = self.registry_file.with_name(self.registry_file.name + ".tmp")
+        temp_path.write_text(json.dumps(entry))
+        os.replace(temp_path, self.registry_file)
+
+    def usage(self) -> Dict:
+        return {
+            "cpu_seconds": round(self.cpu_seconds, 2),
+            "peak_rss_mb": round(self.peak_rss / 2 ** 20, 1),
+            "processes": len(self.seen),
+        }
+
+    def reap(self) -> int:
+        """Kill any process of the tree that outlived the driver and drop the registry entry"""
+        with self._lock:
+            self.closed = True
+        survivors = _kill(self.seen)
+        if survivors:
+            logger.warning(f"Killed {survivors} driver/browser processes left by {self.label}")
+        self.registry_file.unlink(missing_ok=True)
+        return survivors
+
+
+class ProcessSupervisor:
+    """Tracks the process trees of local drivers, one sampling thread for all of them"""
+
+    def __init__(self, registry_dir: str = None, interval: float = None):
+        self.registry_dir = Path(registry_dir or Config.PROCESS_REGISTRY_DIR)
+        self.interval = Config.PROCESS_SAMPLE_INTERVAL if interval is None else interval
+        self._trees: Dict[int, ProcessTree] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.totals = {"drivers": 0, "cpu_seconds": 0.0, "peak_rss_mb": 0.0, "killed": 0, "orphans_reaped": 0}
+
+    def track(self, driver, label: str) -> Optional[ProcessTree]:
+        """Start supervising a driver's process tree (remote drivers have none and return None)"""
+        service_process = getattr(getattr(driver, "service", None), "process", None)
+        if service_process is None:
+            return None
+        self.registry_dir.mkdir(parents=True, exist_ok=True)
+        tree = ProcessTree(psutil.Process(service_process.pid), label,
+                           self.registry_dir / f"{os.getpid()}-{service_process.pid}.json")
+        tree.sample()
+        with self._lock:
+            self._trees[id(driver)] = tree
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, name="process-supervisor", daemon=True)
+                self._thread.start()
+        return tree
+
+    def _sample_loop(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                trees = list(self._trees.values())
+            for tree in trees:
+                tree.sample()
+
+    def stop(self, driver) -> Optional[Dict]:
+        """Take a final sample before the driver quits and return the tree's usage"""
+        with self._lock:
+            tree = self._trees.get(id(driver))
+        if tree is None:
+            return None
+        tree.sample()
+        return tree.usage()
+
+    def release(self, driver) -> Optional[Dict]:
+        """After quit: kill leftover processes, unregister the tree and add it to the totals"""
+        with self._lock:
+            tree = self._trees.pop(id(driver), None)
+        if tree is None:
+            return None
+        killed = tree.reap()
+        usage = tree.usage()
+        with self._lock:
+            self.totals["drivers"] += 1
+            self.totals["cpu_seconds"] += usage["cpu_seconds"]
+            self.totals["peak_rss_mb"] = max(self.totals["peak_rss_mb"], usage["peak_rss_mb"])
+            self.totals["killed"] += killed
+        return usage
+
+    def release_all(self) -> int:
+        """Reap the trees of drivers that were never closed (e.g. a hung test); returns how many"""
+        with self._lock:
+            leftovers = list(self._trees.values())
+            self._trees.clear()
+        for tree in leftovers:
+            self.totals["killed"] += tree.reap()
+        return len(leftovers)
+
+    def reap_orphans(self) -> int:
+        """Kill trees registered by pytest processes that no longer exist; returns processes killed"""
+        if not self.registry_dir.exists():
+            return 0
+        killed = 0
+        for registry_file in self.registry_dir.glob("*.json"):
+            try:
+                entry = json.loads(registry_file.read_text())
+            except (OSError, ValueError):
+                continue
+            if _process(tuple(entry["owner"])) is not None:
+                continue  # Owner still running (this run, or a concurrent one)
+            count = _kill(tuple(key) for key in entry["processes"])
+            if count:
+                logger.warning(f"Reaped {count} orphaned processes of {entry['label']}")
+            killed += count
+            registry_file.unlink(missing_ok=True)
+        self.totals["orphans_reaped"] += killed
+        return killed
+
+    def summary(self) -> str:
+        totals = self.totals
+        return (f"{totals['drivers']} drivers: {totals['cpu_seconds']:.1f}s CPU, "
+                f"largest peak RSS {totals['peak_rss_mb']:.0f} MB, {totals['killed']} leftover processes killed, "
+                f"{totals['orphans_reaped']} orphaned processes reaped")
+
+
+supervisor = ProcessSupervisor()
@@ -0,0 +1,119 @@
+"""Memoization of idempotent page-object reads, invalidated by any command that can change page state"""
+import functools
+import logging
+import time
+from typing import Dict, Tuple
+from config.config import Config
+from utils.driver_events import CommandListener, add_listener, get_listener
+
+logger = logging.getLogger(__name__)
+
+# Commands that can change what the page shows: input, navigation, window/frame switches, cookies, resizes
+MUTATING_COMMANDS = {
+    "clickElement", "sendKeysToElement", "clearElement", "uploadFile", "actions", "clearActionState",
+    "get", "refresh", "goBack", "goForward", "switchToWindow", "newWindow", "close",
+    "switchToFrame", "switchToParentFrame", "addCookie", "deleteCookie", "deleteAllCookies",
+    "setWindowRect", "w3cMaximizeWindow", "fullscreenWindow", "minimizeWindow",
+    "w3cAcceptAlert", "w3cDismissAlert", "w3cSetAlertValue", "executeCdpCommand", "quit",
+}
+
+SCRIPT_COMMANDS = {"w3cExecuteScript", "w3cExecuteScriptAsync"}
+
+# Scripts Selenium itself runs for WebElement reads (get_attribute, is_displayed, get_dom_property)
+_READ_ONLY_SCRIPT_PREFIXES = ("/* getAttribute */", "/* isDisplayed */", "return arguments[0][arguments[1]]")
+_read_only_scripts = set()
+
+
+def _copy(value):
+    """Copy lists and dicts of a memoized value; leaves (strings, WebElements) are shared"""
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    return value
+
+
+def register_read_only_script(script: str) -> str:
+    """Declare an in-page script that only reads state, so running it keeps memoized reads valid"""
+    _read_only_scripts.add(script)
+    return script
+
+
+class ReadCache(CommandListener):
+    """
+    Per-driver store of memoized reads, tagged with a page-state epoch
+    Every mutating command - and every script not registered as read-only - bumps the
+    epoch, which invalidates all entries at once. Entries also expire after
+    Config.READ_CACHE_MAX_AGE seconds, as the page can update itself (AJAX) between commands.
+    """
+
+    def __init__(self):
+        self.epoch = 0
+        self._reads: Dict[Tuple, Tuple[int, float, object]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def on_command(self, command: str, params: dict, duration: float, response, error: Exception):
+        if command in SCRIPT_COMMANDS:
+            script = (params or {}).get("script", "")
+            if script in _read_only_scripts or script.startswith(_READ_ONLY_SCRIPT_PREFIXES):
+                return
+        elif command not in MUTATING_COMMANDS:
+            return
+        # Also on error: a failed click or navigation may still have changed the page
+        self.bump()
+
+    def bump(self):
+        """Start a new page-state epoch, dropping all memoized reads"""
+        self.epoch += 1
+        self._reads.clear()
+
+    def get(self, key: Tuple):
+        """(True, value) for a valid memoized read, else (False, None)"""
+        entry = self._reads.get(key)
+        if entry is not None:
+            epoch, stored_at, value = entry
+            if epoch == self.epoch and time.monotonic() - stored_at <= Config.READ_CACHE_MAX_AGE:
+                self.hits += 1
+                return True, value
+            del self._reads[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, key: Tuple, value):
+        self._reads[key] = (self.epoch, time.monotonic(), value)
+
+    def summary(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {self.epoch} page-state changes"
+
+
+def read_cache_for(driver) -> ReadCache:
+    """The driver's read cache, attached on first use"""
+    return get_listener(driver, ReadCache) or add_listener(driver, ReadCache())
+
+
+def memoized_read(func):
+    """
+    Memoize a read-only page method per driver until the page state changes
+    Keyed by the page object, the method's qualified name and its arguments, which must be
+    hashable: page objects on the same driver can hold different state (applied filters), so
+    they never share a read. Callers get a copy of stored lists/dicts, so mutating a result
+    cannot corrupt later reads.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not Config.READ_CACHE:
+            return func(self, *args, **kwargs)
+        cache = read_cache_for(self.driver)
+        key = (self, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        # A mutating command issued by the read itself must not be missed, so note the epoch first
+        epoch = cache.epoch
+        found, value = cache.get(key)
+        if found:
+            logger.debug(f"Memoized {func.__name__}{args}")
+            return _copy(value)
+        value = func(self, *args, **kwargs)
+        if cache.epoch == epoch:
+            cache.put(key, value)
+        return _copy(value)
+    return wrapper
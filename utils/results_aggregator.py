@@ -0,0 +1,339 @@
+"""
+Streaming aggregator of JUnit XML and Allure results from many workers or shards
+
+Inputs are read one file (and one <testcase>) at a time and folded into running
+per-test and per-step duration statistics, so memory stays bounded however many
+result files there are. The aggregate state can be saved and merged again later,
+letting shards be combined in stages.
+
+Usage:
+    python -m utils.results_aggregator PATH [PATH ...] [--state agg.json] [--output summary.md] [--top 15] [--strict]
+"""
+import argparse
+import heapq
+import json
+import math
+import os
+import random
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Samples kept per test/step name for percentiles; exact until a name exceeds it
+RESERVOIR_SIZE = 1024
+PERCENTILES = (50, 90, 95)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class DurationStats:
+    """Running count/total/max of durations with a fixed-size reservoir sample for percentiles"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.failed = 0
+        self.samples: List[float] = []
+        self._random = random.Random(0)
+
+    def add(self, seconds: float, failed: bool = False):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.failed += int(failed)
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(seconds)
+        else:
+            slot = self._random.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = seconds
+
+    def merge(self, other: "DurationStats"):
+        """Fold another aggregate in, keeping the reservoir proportional to both counts"""
+        if not other.count:
+            return
+        combined = self.samples + other.samples
+        if len(combined) > RESERVOIR_SIZE:
+            own = min(round(RESERVOIR_SIZE * self.count / (self.count + other.count)), len(self.samples))
+            own = max(own, RESERVOIR_SIZE - len(other.samples))
+            combined = (self._random.sample(self.samples, own)
+                        + self._random.sample(other.samples, RESERVOIR_SIZE - own))
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.failed += other.failed
+        self.samples = combined
+
+    def percentiles(self) -> Dict[int, float]:
+        ordered = sorted(self.samples)
+        return {pct: percentile(ordered, pct) for pct in PERCENTILES}
+
+    def to_dict(self) -> Dict:
+        return {"count": self.count, "total": self.total, "max": self.max,
+                "failed": self.failed, "samples": self.samples}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DurationStats":
+        stats = cls()
+        stats.count, stats.total, stats.max = data["count"], data["total"], data["max"]
+        stats.failed, stats.samples = data.get("failed", 0), list(data["samples"])
+        return stats
+
+
+class ResultsAggregator:
+    """
+    Incremental merge of test outcomes and durations
+    JUnit files provide the test outcomes; Allure results provide step timings (and test
+    outcomes too when no JUnit file was given), so a test reported by both is not counted twice
+    """
+
+    def __init__(self, top: int = 15):
+        self.top = top
+        self.outcomes = {"junit": {}, "allure": {}}
+        self.browsers = {"junit": {}, "allure": {}}  # Outcome counts per browser (matrix runs)
+        self.tests = {"junit": {}, "allure": {}}
+        self.steps: Dict[str, DurationStats] = {}
+        self.slowest: List[Tuple[float, str, str]] = []  # min-heap of (seconds, step, test)
+        self.files = 0
+
+    # Input ------------------------------------------------------------------
+
+    def add_paths(self, paths: Iterable[str]):
+        """Aggregate every JUnit XML and Allure *-result.json file under the given paths"""
+        for path in _iter_files(paths):
+            if path.name.endswith("-result.json"):
+                self.add_allure_result(path)
+            elif path.suffix == ".xml":
+                self.add_junit(path)
+
+    def add_junit(self, path: Path):
+        """Stream <testcase> elements, releasing each one once counted"""
+        try:
+            for _, elem in ET.iterparse(path, events=("end",)):
+                if elem.tag != "testcase":
+                    continue
+                name = f"{elem.get('classname', '')}::{elem.get('name', '')}".lstrip(":")
+                status = "passed"
+                for child in elem:
+                    if child.tag in ("failure", "error", "skipped"):
+                        status = "failed" if child.tag == "failure" else child.tag
+                        break
+                browser = next((prop.get("value") for prop in elem.iter("property")
+                                if prop.get("name") == "browser"), None)
+                self._add_test("junit", name, status, float(elem.get("time") or 0), browser)
+                elem.clear()
+        except ET.ParseError as e:
+            print(f"Skipping unreadable JUnit file {path}: {e}", file=sys.stderr)
+            return
+        self.files += 1
+
+    def add_allure_result(self, path: Path):
+        """Add one Allure test result and its (nested) steps"""
+        try:
+            result = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"Skipping unreadable Allure result {path}: {e}", file=sys.stderr)
+            return
+        name = result.get("fullName") or result.get("name", path.stem)
+        status = {"broken": "error"}.get(result.get("status"), result.get("status", "unknown"))
+        browser = next((label.get("value") for label in result.get("labels", [])
+                        if label.get("name") == "browser"), None)
+        self._add_test("allure", name, status, _allure_seconds(result), browser)
+        for step in _iter_steps(result.get("steps", [])):
+            self._add_step(step.get("name", "?"), _allure_seconds(step), step.get("status") != "passed", name)
+        self.files += 1
+
+    def _add_test(self, source: str, name: str, status: str, seconds: float, browser: str = None):
+        outcomes = self.outcomes[source]
+        outcomes[status] = outcomes.get(status, 0) + 1
+        if browser:
+            browser_outcomes = self.browsers[source].setdefault(browser, {})
+            browser_outcomes[status] = browser_outcomes.get(status, 0) + 1
+        self.tests[source].setdefault(name, DurationStats()).add(seconds, status in ("failed", "error"))
+
+    def _add_step(self, name: str, seconds: float, failed: bool, test: str):
+        self.steps.setdefault(name, DurationStats()).add(seconds, failed)
+        entry = (seconds, name, test)
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    # Merging and persistence -----------------------------------------------
+
+    def merge(self, other: "ResultsAggregator"):
+        """Fold in the aggregate of another shard"""
+        for source in self.outcomes:
+            for status, count in other.outcomes[source].items():
+                self.outcomes[source][status] = self.outcomes[source].get(status, 0) + count
+            for browser, outcomes in other.browsers[source].items():
+                browser_outcomes = self.browsers[source].setdefault(browser, {})
+                for status, count in outcomes.items():
+                    browser_outcomes[status] = browser_outcomes.get(status, 0) + count
+            for name, stats in other.tests[source].items():
+                self.tests[source].setdefault(name, DurationStats()).merge(stats)
+        for name, stats in other.steps.items():
+            self.steps.setdefault(name, DurationStats()).merge(stats)
+        for entry in other.slowest:
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, entry)
+            elif entry > self.slowest[0]:
+                heapq.heapreplace(self.slowest, entry)
+        self.files += other.files
+
+    def save(self, path: Path):
+        state = {
+            "files": self.files,
+            "outcomes": self.outcomes,
+            "browsers": self.browsers,
+            "tests": {source: {name: stats.to_dict() for name, stats in tests.items()}
+                      for source, tests in self.tests.items()},
+            "steps": {name: stats.to_dict() for name, stats in self.steps.items()},
+            "slowest": self.slowest,
+        }
+        Path(path).write_text(json.dumps(state))
+
+    @classmethod
+    def load(cls, path: Path, top: int = 15) -> "ResultsAggregator":
+        state = json.loads(Path(path).read_text())
+        aggregator = cls(top=top)
+        aggregator.files = state["files"]
+        aggregator.outcomes = state["outcomes"]
+        aggregator.browsers = state.get("browsers", {"junit": {}, "allure": {}})
+        aggregator.tests = {source: {name: DurationStats.from_dict(data) for name, data in tests.items()}
+                            for source, tests in state["tests"].items()}
+        aggregator.steps = {name: DurationStats.from_dict(data) for name, data in state["steps"].items()}
+        aggregator.slowest = [tuple(entry) for entry in state["slowest"]][-top:]
+        heapq.heapify(aggregator.slowest)
+        return aggregator
+
+    # Output -----------------------------------------------------------------
+
+    @property
+    def source(self) -> str:
+        """Where test outcomes are taken from: JUnit when available"""
+        return "junit" if self.outcomes["junit"] else "allure"
+
+    def summary(self) -> Dict:
+        outcomes = self.outcomes[self.source]
+        return {
+            "total": sum(outcomes.values()),
+            "passed": outcomes.get("passed", 0),
+            "failed": outcomes.get("failed", 0),
+            "error": outcomes.get("error", 0),
+            "skipped": outcomes.get("skipped", 0),
+            "files": self.files,
+        }
+
+    def to_markdown(self) -> str:
+        summary = self.summary()
+        lines = [
+            "# Aggregated Test Results",
+            "",
+            f"**{summary['total']} tests**: {summary['passed']} passed, {summary['failed']} failed, "
+            f"{summary['error']} errors, {summary['skipped']} skipped "
+            f"({summary['files']} result files, outcomes from {self.source})",
+        ]
+        browsers = self.browsers[self.source]
+        if len(browsers) > 1:
+            lines += ["", "## Per browser", "",
+                      "| Browser | Passed | Failed | Errors | Skipped |", "|---|---:|---:|---:|---:|"]
+            for browser, outcomes in sorted(browsers.items()):
+                lines.append(f"| {_cell(browser)} | {outcomes.get('passed', 0)} | {outcomes.get('failed', 0)} | "
+                             f"{outcomes.get('error', 0)} | {outcomes.get('skipped', 0)} |")
+        lines += _duration_table("Test durations", "Test", self.tests[self.source], self.top)
+        lines += _duration_table("Step durations", "Step", self.steps, self.top)
+        if self.slowest:
+            lines += ["", "## Slowest steps", "", "| Step | Test | Duration (s) |", "|---|---|---:|"]
+            for seconds, step, test in sorted(self.slowest, reverse=True):
+                lines.append(f"| {_cell(step)} | {_cell(test)} | {seconds:.2f} |")
+        return "\n".join(lines) + "\n"
+
+
+def _duration_table(title: str, label: str, stats: Dict[str, DurationStats], top: int) -> List[str]:
+    """Markdown table of the `top` names with the highest p95"""
+    if not stats:
+        return []
+    ranked = sorted(stats.items(), key=lambda item: item[1].percentiles()[95], reverse=True)[:top]
+    header = " | ".join(f"p{pct} (s)" for pct in PERCENTILES)
+    lines = ["", f"## {title}", "", f"| {label} | Runs | Failed | {header} | Max (s) |",
+             "|---|---:|---:|" + "---:|" * len(PERCENTILES) + "---:|"]
+    for name, item in ranked:
+        values = " | ".join(f"{value:.2f}" for value in item.percentiles().values())
+        lines.append(f"| {_cell(name)} | {item.count} | {item.failed} | {values} | {item.max:.2f} |")
+    return lines
+
+
+def _cell(text: str) -> str:
+    return text.replace("|", "\\|").replace("\n", " ")
+
+
+def _allure_seconds(item: Dict) -> float:
+    """Duration of an Allure result or step (start/stop are epoch milliseconds)"""
+    start, stop = item.get("start"), item.get("stop")
+    return max((stop - start) / 1000, 0.0) if start and stop else 0.0
+
+
+def _iter_steps(steps: List[Dict]) -> Iterator[Dict]:
+    """Depth-first walk over nested Allure steps"""
+    for step in steps:
+        yield step
+        yield from _iter_steps(step.get("steps", []))
+
+
+def _iter_files(paths: Iterable[str]) -> Iterator[Path]:
+    """Result files under the given files/directories, walked lazily"""
+    for path in paths:
+        path = Path(path)
+        if path.is_file():
+            yield path
+            continue
+        for root, _, names in os.walk(path):
+            for name in names:
+                if name.endswith(".xml") or name.endswith("-result.json"):
+                    yield Path(root) / name
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Merge JUnit XML and Allure results into one summary")
+    parser.add_argument("paths", nargs="*", help="Result files or directories to scan recursively")
+    parser.add_argument("--state", help="Aggregate state file: merged into if it exists, then updated")
+    parser.add_argument("--merge", nargs="*", default=[], help="Other shards' state files to merge")
+    parser.add_argument("--output", help="Write the markdown summary to this file")
+    parser.add_argument("--json", dest="json_path", help="Also write the counts as JSON")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table and slowest steps kept")
+    parser.add_argument("--strict", action="store_true", help="Exit non-zero when any test failed")
+    args = parser.parse_args(argv)
+
+    if args.state and Path(args.state).exists():
+        aggregator = ResultsAggregator.load(args.state, top=args.top)
+    else:
+        aggregator = ResultsAggregator(top=args.top)
+    for state in args.merge:
+        aggregator.merge(ResultsAggregator.load(state, top=args.top))
+    aggregator.add_paths(args.paths)
+
+    if args.state:
+        aggregator.save(args.state)
+    markdown = aggregator.to_markdown()
+    print(markdown)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(markdown, encoding="utf-8")
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(aggregator.summary(), indent=2))
+
+    summary = aggregator.summary()
+    return 1 if args.strict and (summary["failed"] or summary["error"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Startup-time benchmark for the test suite
+
+Measures, in fresh interpreters, the import time of conftest and the test modules
+(broken down by top-level package) and the wall time of `pytest --collect-only`,
+and checks the median collection time against Config.STARTUP_BUDGET.
+
+Usage:
+    python -m utils.startup_benchmark [--runs 5] [--top 10] [--budget SECONDS] [--json out.json]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+from config.config import Config
+
+# Modules pytest imports while collecting the suite
+SUITE_MODULES = ["conftest", "tests.test_insider_careers"]
+
+
+def import_profile(modules: List[str] = SUITE_MODULES) -> Tuple[float, Dict[str, float]]:
+    """Total import seconds of the modules and self time per top-level package (python -X importtime)"""
+    statement = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, check=True)
+    per_package = defaultdict(float)
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # Header line
+        package = name.strip().split(".")[0]
+        per_package[package] += int(self_us) / 1e6
+        if name.strip() in modules:
+            total += int(cumulative_us) / 1e6
+    return total, dict(per_package)
+
+
+def collection_times(runs: int) -> List[float]:
+    """Wall seconds of `pytest --collect-only` per run; report writers from addopts are disabled"""
+    command = [sys.executable, "-m", "pytest", "--collect-only", "-q", "-o", "addopts=", "-p", "no:cacheprovider"]
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure suite import and collection time against a budget")
+    parser.add_argument("--runs", type=int, default=5, help="Collection runs (the median is compared)")
+    parser.add_argument("--top", type=int, default=10, help="Packages listed in the import breakdown")
+    parser.add_argument("--budget", type=float, default=Config.STARTUP_BUDGET, help="Collection budget in seconds")
+    parser.add_argument("--json", dest="json_path", help="Also write the measurements as JSON")
+    args = parser.parse_args(argv)
+
+    import_seconds, per_package = import_profile()
+    times = collection_times(args.runs)
+    median = statistics.median(times)
+
+    print(f"Suite imports: {import_seconds * 1000:.0f} ms")
+    for package, seconds in sorted(per_package.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {package:<24} {seconds * 1000:7.1f} ms")
+    print(f"Collection: median {median:.2f}s, min {min(times):.2f}s over {len(times)} runs "
+          f"(budget {args.budget:.2f}s)")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps({
+            "import_seconds": import_seconds,
+            "packages": per_package,
+            "collection_seconds": times,
+            "budget": args.budget,
+        }, indent=2))
+
+    if median > args.budget:
+        print(f"Collection exceeds the startup budget by {median - args.budget:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Visual regression of load-state screenshots against stored baselines
+
+Captures are decoded once into NumPy arrays and compared with a vectorized per-pixel
+difference (ignore regions masked out) plus a DCT perceptual hash that catches layout
+shifts independent of small rendering noise. Diff images are written only on mismatch.
+"""
+import io
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from PIL import Image
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+# A channel difference up to this is antialiasing/compression noise, not a changed pixel
+PIXEL_TOLERANCE = 16
+
+# Perceptual hash: DCT of a HASH_INPUT x HASH_INPUT grayscale image, low HASH_SIZE x HASH_SIZE frequencies
+HASH_INPUT = 32
+HASH_SIZE = 8
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so dct2(x) = D @ x @ D.T"""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT = _dct_matrix(HASH_INPUT)
+
+
+def perceptual_hash(pixels: np.ndarray) -> np.ndarray:
+    """64-bit DCT perceptual hash of an RGB array, as a boolean vector"""
+    gray = Image.fromarray(pixels).convert("L").resize((HASH_INPUT, HASH_INPUT), Image.Resampling.BILINEAR)
+    coefficients = _DCT @ np.asarray(gray, dtype=np.float64) @ _DCT.T
+    low = coefficients[:HASH_SIZE, :HASH_SIZE].flatten()[1:]  # DC term only reflects brightness
+    return low > np.median(low)
+
+
+def decode_png(png: bytes) -> np.ndarray:
+    """PNG bytes to an HxWx3 uint8 array"""
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+
+@dataclass
+class VisualResult:
+    """Outcome of one comparison"""
+    name: str
+    status: str  # "match", "mismatch", "size-mismatch" or "baseline-created"
+    diff_ratio: float = 0.0
+    hash_distance: int = 0
+    threshold: float = 0.0
+    diff_path: Optional[str] = None
+    millis: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return self.status in ("match", "baseline-created")
+
+    def describe(self) -> str:
+        if self.status == "baseline-created":
+            return f"{self.name}: baseline created"
+        if self.status == "size-mismatch":
+            return f"{self.name}: capture size differs from baseline"
+        return (f"{self.name}: {self.diff_ratio:.2%} pixels changed (threshold {self.threshold:.2%}), "
+                f"hash distance {self.hash_distance}")
+
+
+class VisualRegression:
+    """
+    Baselines live in <baseline_dir>/<browser>/<name>.png; a missing baseline is created
+    from the first capture (or every capture when updating baselines)
+    """
+
+    def __init__(self, baseline_dir: str = None, diff_dir: str = None, update: bool = None):
+        self.baseline_dir = Path(baseline_dir or Config.VISUAL_BASELINE_DIR)
+        self.diff_dir = Path(diff_dir or Config.VISUAL_DIFF_DIR)
+        self.update = Config.VISUAL_UPDATE_BASELINES if update is None else update
+        self._baselines: Dict[Path, np.ndarray] = {}  # Decoded (and hashed) once per run
+        self._hashes: Dict[Path, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self.results: List[VisualResult] = []
+
+    def _baseline(self, path: Path) -> Optional[np.ndarray]:
+        if path not in self._baselines:
+            if not path.exists():
+                return None
+            self._baselines[path] = np.asarray(Image.open(path).convert("RGB"))
+        return self._baselines[path]
+
+    def _baseline_hash(self, path: Path, baseline: np.ndarray) -> np.ndarray:
+        if path not in self._hashes:
+            self._hashes[path] = perceptual_hash(baseline)
+        return self._hashes[path]
+
+    @staticmethod
+    def _clip_regions(shape: Sequence[int], regions: Iterable[Sequence[float]],
+                      scale: float = 1.0) -> List[Tuple[slice, slice]]:
+        """
+        (x, y, width, height) regions in CSS pixels as row/column slices of the image, clipped to it
+        scale is the device pixel ratio of the capture (image pixels per CSS pixel)
+        """
+        height, width = shape[:2]
+        slices = []
+        for region in regions:
+            x, y, region_width, region_height = (value * scale for value in region)
+            x0, y0 = min(max(int(x), 0), width), min(max(int(y), 0), height)
+            x1, y1 = min(max(int(x + region_width), x0), width), min(max(int(y + region_height), y0), height)
+            if x1 > x0 and y1 > y0:
+                slices.append((slice(y0, y1), slice(x0, x1)))
+        return slices
+
+    @staticmethod
+    def _ignored_pixels(shape: Sequence[int], regions: List[Tuple[slice, slice]]) -> int:
+        """Number of distinct pixels covered by (possibly overlapping) regions"""
+        if not regions:
+            return 0
+        if len(regions) == 1:
+            rows, columns = regions[0]
+            return (rows.stop - rows.start) * (columns.stop - columns.start)
+        ignored = np.zeros(shape[:2], dtype=bool)
+        for rows, columns in regions:
+            ignored[rows, columns] = True
+        return int(np.count_nonzero(ignored))
+
+    def compare(self, name: str, png: bytes, browser: str = "chrome",
+                ignore_regions: Iterable[Sequence[float]] = (), threshold: float = None,
+                scale: float = 1.0, test_id: str = None) -> VisualResult:
+        """
+        Compare a capture with its baseline; threshold is the tolerated fraction of changed pixels
+        ignore_regions are in CSS pixels and scaled by the capture's device pixel ratio (scale).
+        test_id (default: the running pytest test) keeps diff images of different tests and
+        workers apart.
+        """
+        start = time.perf_counter()
+        threshold = Config.VISUAL_THRESHOLDS.get(name, Config.VISUAL_THRESHOLDS["default"]) \
+            if threshold is None else threshold
+        path = self.baseline_dir / browser / f"{name}.png"
+        current = decode_png(png)
+
+        with self._lock:
+            baseline = None if self.update else self._baseline(path)
+            if baseline is None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(png)
+                self._baselines[path] = current
+                self._hashes.pop(path, None)
+        if baseline is None:
+            return self._record(VisualResult(name, "baseline-created", threshold=threshold), start)
+
+        if baseline.shape != current.shape:
+            return self._record(VisualResult(name, "size-mismatch", diff_ratio=1.0, threshold=threshold), start)
+
+        regions = self._clip_regions(current.shape, ignore_regions, scale)
+        # uint8-safe absolute difference without widening to a larger dtype; per-channel
+        # comparisons OR-ed together are much faster than reducing over the channel axis
+        difference = np.maximum(current, baseline)
+        difference -= np.minimum(current, baseline)
+        over = difference > PIXEL_TOLERANCE
+        changed = over[:, :, 0] | over[:, :, 1] | over[:, :, 2]
+        compared = changed.size
+        for rows, columns in regions:
+            changed[rows, columns] = False
+        compared -= self._ignored_pixels(changed.shape, regions)
+        diff_ratio = float(np.count_nonzero(changed)) / max(compared, 1)
+
+        # Hash the capture with ignored regions taken from the baseline, so they cannot shift it
+        masked = current
+        if regions:
+            masked = current.copy()
+            for rows, columns in regions:
+                masked[rows, columns] = baseline[rows, columns]
+        hash_distance = int(np.count_nonzero(perceptual_hash(masked) != self._baseline_hash(path, baseline)))
+
+        status = "match" if diff_ratio <= threshold and hash_distance <= Config.VISUAL_HASH_DISTANCE else "mismatch"
+        result = VisualResult(name, status, diff_ratio, hash_distance, threshold)
+        if status == "mismatch":
+            result.diff_path = str(self._write_diff(name, browser, current, changed, test_id))
+        return self._record(result, start)
+
+    def _write_diff(self, name: str, browser: str, current: np.ndarray, changed: np.ndarray,
+                    test_id: str = None) -> Path:
+        """Dimmed capture with changed pixels in red, named after the capture and the test"""
+        diff = (current * 0.35).astype(np.uint8)
+        diff[changed] = (255, 0, 0)
+        test_id = test_id or os.getenv("PYTEST_CURRENT_TEST", "").split(" ")[0] \
+            or os.getenv("PYTEST_XDIST_WORKER", f"pid{os.getpid()}")
+        slug = re.sub(r"[^\w.-]+", "_", test_id).strip("_")
+        path = self.diff_dir / browser / f"{name}-{slug}-diff.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(diff).save(path)
+        return path
+
+    def _record(self, result: VisualResult, start: float) -> VisualResult:
+        result.millis = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.results.append(result)
+        logger.info(f"Visual check {result.describe()} ({result.millis:.0f} ms)")
+        return result
+
+    def summary(self) -> str:
+        """Human-readable totals for the run"""
+        if not self.results:
+            return "no captures compared"
+        failed = [result for result in self.results if not result.passed]
+        created = sum(result.status == "baseline-created" for result in self.results)
+        mean_ms = sum(result.millis for result in self.results) / len(self.results)
+        lines = [f"{len(self.results)} captures, {len(failed)} mismatched, {created} baselines created, "
+                 f"{mean_ms:.0f} ms mean per capture"]
+        lines += [f"  {result.describe()} -> {result.diff_path}" for result in failed]
+        return "\n".join(lines)
+
+
+visual_regression = VisualRegression()